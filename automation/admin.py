@@ -1,19 +1,168 @@
+from collections import defaultdict
+from datetime import timedelta
+
 from django.contrib import admin
-from automation.models import TestResult, Listing
+from django.db.models import Count, Max, Min, Q, Sum
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from automation.models import Run, TestResult, Listing, PriceObservation, SelectorHint, Sighting, StepTiming, Checkpoint
+from automation.utils.search import full_text_q
+from automation.utils.stats import percentile
+
+# Days the duration table covers when the change list has no created_at range
+STATS_DEFAULT_DAYS = 7
+
+
+class DurationStatsMixin:
+    """Adds a p50/p95/max duration table, grouped by `stats_group_field`, above the
+    change list. It covers whatever the list currently shows, so the created_at
+    filter / date hierarchy (or ?created_at__gte=...&created_at__lt=...) sets the range;
+    without one it covers the last STATS_DEFAULT_DAYS days, so a page view never
+    reads the whole table."""
+
+    stats_group_field = None
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        context = getattr(response, 'context_data', None)
+        if context and 'cl' in context:
+            queryset = context['cl'].queryset
+            if not any(key.startswith('created_at__') for key in request.GET):
+                since = timezone.now() - timedelta(days=STATS_DEFAULT_DAYS)
+                queryset = queryset.filter(created_at__gte=since)
+                context['stats_window'] = STATS_DEFAULT_DAYS
+            context['duration_stats'] = self.duration_stats(queryset)
+        return response
+
+    def duration_stats(self, queryset):
+        queryset = queryset.order_by().filter(duration_ms__isnull=False)
+        totals = (queryset.values(self.stats_group_field)
+                  .annotate(count=Count('id'), min=Min('duration_ms'), max=Max('duration_ms'),
+                            total=Sum('duration_ms')))
+        # Percentiles still need the values; the range above keeps them bounded
+        durations = defaultdict(list)
+        waits = defaultdict(list)
+        rows = queryset.values_list(self.stats_group_field, 'duration_ms', 'wait_ms')
+        for group, duration, wait in rows.iterator(chunk_size=2000):
+            durations[group].append(duration)
+            waits[group].append(wait)
+        stats = [
+            {
+                'group': row[self.stats_group_field],
+                'count': row['count'],
+                'p50': percentile(durations[row[self.stats_group_field]], 50),
+                'p95': percentile(durations[row[self.stats_group_field]], 95),
+                'min': row['min'],
+                'max': row['max'],
+                'wait_p50': percentile(waits[row[self.stats_group_field]], 50),
+                'total_s': row['total'] / 1000,
+            }
+            for row in totals
+        ]
+        return sorted(stats, key=lambda row: row['total_s'], reverse=True)
+
+
+class FullTextSearchMixin:
+    """Answers the search box from the model's FTS5 index (prefix match on every
+    word) instead of LIKE '%term%' over search_fields. Fields listed with '='
+    in search_fields still match exactly. Falls back to the stock search when
+    the database has no FTS table (non-SQLite)."""
+
+    def get_search_results(self, request, queryset, search_term):
+        q = full_text_q(queryset.model, search_term)
+        if q is None:
+            return super().get_search_results(request, queryset, search_term)
+        for field in self.search_fields:
+            if field.startswith('='):
+                q |= Q(**{field[1:]: search_term.strip()})
+        return queryset.filter(q), False
+
+
+@admin.register(Run)
+class RunAdmin(admin.ModelAdmin):
+    """The runs dashboard: every column is stored on the run, no child rows are read."""
+    list_display = ('id', 'city', 'location', 'status', 'started_at', 'duration_ms', 'results_total',
+                    'results_failed', 'listings_found', 'listings_saved', 'results_link', 'listings_link')
+    list_filter = ('status', 'step', 'started_at')
+    date_hierarchy = 'started_at'
+    search_fields = ('city', 'location')
+    readonly_fields = ('city', 'location', 'seed', 'step', 'options', 'status', 'started_at', 'finished_at',
+                       'duration_ms', 'results_total', 'results_failed', 'listings_found', 'listings_saved')
+    ordering = ('-started_at',)
+
+    @admin.display(description='Results')
+    def results_link(self, run):
+        url = reverse('admin:automation_testresult_changelist') + f'?run__id__exact={run.pk}'
+        return format_html('<a href="{}">{} results</a>', url, run.results_total)
+
+    @admin.display(description='Listings')
+    def listings_link(self, run):
+        url = reverse('admin:automation_listing_changelist') + f'?sightings__run__id__exact={run.pk}'
+        return format_html('<a href="{}">{} listings</a>', url, run.listings_saved)
 
 
 @admin.register(TestResult)
-class TestResultAdmin(admin.ModelAdmin):
-    list_display = ('testCase', 'passed', 'url', 'comment','created_at')
-    list_filter = ('passed',)
+class TestResultAdmin(FullTextSearchMixin, DurationStatsMixin, admin.ModelAdmin):
+    list_display = ('testCase', 'passed', 'duration_ms', 'wait_ms', 'url', 'comment','created_at', 'run')
+    list_filter = ('passed', 'created_at')
+    date_hierarchy = 'created_at'
     search_fields = ('testCase', 'comment')
-    readonly_fields = ('testCase', 'url', 'passed', 'comment', 'created_at')
+    readonly_fields = ('run', 'testCase', 'url', 'passed', 'comment', 'started_at', 'finished_at',
+                       'duration_ms', 'wait_ms', 'created_at')
     ordering = ('-created_at',)
+    stats_group_field = 'testCase'
+
+class PriceObservationInline(admin.TabularInline):
+    model = PriceObservation
+    fields = ('price', 'observed_at')
+    readonly_fields = ('price', 'observed_at')
+    extra = 0
+    can_delete = False
+
+class SightingInline(admin.TabularInline):
+    model = Sighting
+    fields = ('run', 'price', 'seen_at')
+    readonly_fields = ('run', 'price', 'seen_at')
+    extra = 0
+    can_delete = False
 
 @admin.register(Listing)
-class ListingAdmin(admin.ModelAdmin):
-    list_display = ('title', 'price', 'search_url', 'img_url','location','checkin', 'checkout', 'guests','created_at')
-    list_filter = ('location',)
-    search_fields = ('title', 'location')
-    readonly_fields = ('price', 'search_url', 'img_url', 'title', 'created_at')
-    ordering = ('-created_at',)
\ No newline at end of file
+class ListingAdmin(FullTextSearchMixin, admin.ModelAdmin):
+    list_display = ('title', 'price', 'price_amount', 'price_currency', 'price_period', 'listing_id', 'listing_url', 'search_url', 'img_url','location','checkin', 'checkout', 'guests','created_at', 'last_seen_at')
+    list_filter = ('location', 'price_currency', 'price_period')
+    search_fields = ('title', 'location', '=listing_id')
+    readonly_fields = ('run', 'listing_id', 'price', 'price_amount', 'price_currency', 'price_period', 'listing_url', 'search_url', 'img_url', 'title', 'created_at', 'last_seen_at')
+    ordering = ('-created_at',)
+    inlines = [PriceObservationInline, SightingInline]
+
+    def lookup_allowed(self, lookup, value, request):
+        # The runs page links to the listings a run saw
+        return lookup == 'sightings__run__id__exact' or super().lookup_allowed(lookup, value, request)
+
+@admin.register(SelectorHint)
+class SelectorHintAdmin(admin.ModelAdmin):
+    list_display = ('key', 'selector', 'updated_at')
+    search_fields = ('key', 'selector')
+    ordering = ('key',)
+
+@admin.register(StepTiming)
+class StepTimingAdmin(DurationStatsMixin, admin.ModelAdmin):
+    list_display = ('step', 'location', 'passed', 'duration_ms', 'wait_ms', 'started_at')
+    list_filter = ('step', 'passed', 'created_at')
+    date_hierarchy = 'created_at'
+    search_fields = ('location',)
+    readonly_fields = ('run', 'step', 'location', 'passed', 'started_at', 'finished_at',
+                       'duration_ms', 'wait_ms', 'created_at')
+    ordering = ('-created_at',)
+    stats_group_field = 'step'
+
+@admin.register(Checkpoint)
+class CheckpointAdmin(admin.ModelAdmin):
+    list_display = ('run', 'step', 'city', 'chosen_text', 'url', 'created_at')
+    list_filter = ('step', 'created_at')
+    date_hierarchy = 'created_at'
+    search_fields = ('city', 'chosen_text', '=run__id')
+    readonly_fields = ('run', 'step', 'city', 'chosen_text', 'date_info', 'guest_info', 'url',
+                       'storage_state', 'created_at')
+    ordering = ('-created_at',)
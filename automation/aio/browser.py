@@ -0,0 +1,109 @@
+from playwright.async_api import async_playwright, Browser, Page
+
+from automation.utils.browser import LAUNCH_ARGS, SessionState
+
+
+class AsyncSharedBrowser:
+    """Async counterpart of SharedBrowser: one Chromium, one isolated context per flow."""
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self._playwright = None
+        self.browser: Browser = None
+
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        try:
+            self.browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        except Exception:
+            await self.stop()
+            raise
+        return self
+
+    def is_connected(self) -> bool:
+        return bool(self.browser and self.browser.is_connected())
+
+    def session(self, **options) -> 'AsyncBrowserSession':
+        return AsyncBrowserSession(headless=self.headless, browser=self.browser, **options)
+
+    async def stop(self):
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+
+class AsyncBrowserSession(SessionState):
+    """Async counterpart of BrowserSession for the asyncio engine."""
+
+    def __init__(self, headless: bool = True, browser: Browser = None, **options):
+        super().__init__(**options)
+        self.headless = headless
+        self._playwright = None
+        self._browser: Browser = browser
+        self._owns_browser = browser is None
+        self._context = None
+        self.page: Page = None
+
+    async def start(self):
+        if self._owns_browser:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        self._context = await self._browser.new_context(**self._context_options())
+        if not self.warm:
+            await self._context.clear_cookies()
+        if self.replay_har:
+            await self._context.route_from_har(self.replay_har, not_found='abort')
+        if self.policy:
+            await self._context.route('**/*', self._route)
+        self.page = await self._context.new_page()
+        self._attach_listeners()
+        return self
+
+    async def save_storage_state(self):
+        if self.storage_state and not self.warm:
+            self._write_storage_state(await self._context.storage_state())
+
+    async def snapshot(self) -> dict:
+        return await self._context.storage_state()
+
+    async def restore(self, storage_state: dict, url: str):
+        if storage_state.get('cookies'):
+            await self._context.add_cookies(storage_state['cookies'])
+        script = self._restore_script(storage_state)
+        if script:
+            await self._context.add_init_script(script=script)
+        await self.page.goto(url, wait_until="domcontentloaded", timeout=60_000)
+
+    async def _route(self, route):
+        if self._block_reason(route):
+            await route.abort('blockedbyclient')
+        else:
+            await route.fallback()
+
+    async def stop(self):
+        if self._context:
+            try:
+                await self._context.close()
+            except Exception:
+                pass  # browser already gone
+            self._context = None
+        if self._owns_browser:
+            if self._browser:
+                await self._browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        await self.stop()
@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from automation.aio.browser import AsyncBrowserSession, AsyncSharedBrowser
+from automation.utils.pool import PooledBrowser, PoolState, child_pids, driver_pid
+
+
+class AsyncBrowserPool(PoolState):
+    """Async counterpart of BrowserPool: a lease waits for room instead of failing when
+    every browser is busy."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._changed = asyncio.Condition()
+        self._starting = 0
+
+    async def start(self):
+        return self
+
+    async def _launch(self):
+        children = child_pids()
+        browser = await AsyncSharedBrowser(headless=self.headless).start()
+        return PooledBrowser(browser, driver_pid(browser, children))
+
+    async def fill(self):
+        """Launch browsers until the pool holds `size` of them, so the first flows don't
+        wait on a cold start. One at a time: each launch's driver process must be told
+        apart from the others. Returns how many are running; a failed launch is left to
+        the lease that needs it."""
+        while len(self.slots) + self._starting < self.size:
+            try:
+                slot = await self._launch()
+            except Exception as e:
+                print(f"  ⚠ Browser pre-launch failed: {type(e).__name__}: {e}")
+                break
+            async with self._changed:
+                self.slots.append(slot)
+                self._changed.notify_all()
+        return len(self.slots)
+
+    async def _close(self, slot):
+        self._retired(slot)
+        try:
+            await slot.browser.stop()
+        except Exception:
+            pass  # a crashed driver may fail to shut down; its processes exit with it
+
+    async def _lease(self):
+        async with self._changed:
+            while True:
+                for slot in self._check():
+                    await self._close(slot)
+                slot = self._pick()
+                if slot is not None:
+                    slot.leased += 1
+                    return slot
+                if len(self.slots) + self._starting < self.size:
+                    break
+                await self._changed.wait()
+            self._starting += 1  # counts toward `size` while it launches
+        slot = None
+        try:
+            slot = await self._launch()
+            slot.leased += 1
+        finally:
+            async with self._changed:
+                self._starting -= 1
+                if slot is not None:
+                    self.slots.append(slot)
+                self._changed.notify_all()
+        return slot
+
+    async def _release(self, slot):
+        async with self._changed:
+            slot.leased -= 1
+            slot.flows += 1
+            self.served += 1
+            if slot in self._check():
+                await self._close(slot)
+            self._changed.notify_all()
+
+    @asynccontextmanager
+    async def session(self, **options):
+        """A started AsyncBrowserSession in its own context on a healthy pooled browser."""
+        slot = await self._lease()
+        session = AsyncBrowserSession(headless=self.headless, browser=slot.browser.browser, **options)
+        try:
+            yield await session.start()
+        finally:
+            await session.stop()
+            await self._release(slot)
+
+    async def stop(self):
+        while self.slots:
+            slot = self.slots.pop()
+            try:
+                await slot.browser.stop()
+            except Exception:
+                pass
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
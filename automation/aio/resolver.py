@@ -0,0 +1,39 @@
+from asgiref.sync import sync_to_async
+from playwright.async_api import TimeoutError as PWTimeout
+
+from automation.models import SelectorHint
+from automation.utils.timing import counts_as_wait
+from automation.utils import resolver as _sync
+
+# Async counterpart of automation.utils.resolver; shares its per-process winner cache.
+
+
+async def remember(key, selector):
+    await sync_to_async(_sync._known)()
+    if _sync._changed(key, selector):
+        await SelectorHint.objects.aupdate_or_create(key=key, defaults={'selector': selector})
+
+
+@counts_as_wait
+async def resolve(page, key, candidates, timeout=2000, record=True):
+    await sync_to_async(_sync._known)()
+    order = _sync.ordered(key, candidates)
+    found = _sync._combined(page, order)
+    try:
+        await found.wait_for(state='visible', timeout=timeout)
+    except PWTimeout:
+        return None, None
+    try:
+        matches = await found.evaluate(_sync._WINNER_JS, order)
+    except Exception:
+        matches = [None] * len(order)
+    sel, untested = _sync._confirmed(order, matches)
+    for candidate in untested if sel is None else ():
+        if await found.and_(page.locator(candidate)).count():
+            sel = candidate
+            break
+    if sel is None:
+        return None, None
+    if record:
+        await remember(key, sel)
+    return page.locator(sel).filter(visible=True).first, sel
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+
+from automation.aio import step01_landing, step03_datepicker, step04_guests, step05_results
+from automation.aio.pool import AsyncBrowserPool
+from automation.models import Checkpoint
+from automation.utils.options import for_city
+from automation.utils.runner import (
+    checkpoint_fields, direct_flow, find_checkpoint, finish_fields, resume_flow, resume_url, run_fields,
+    seed_flow, step_output, timed_step,
+)
+from automation.utils.writer import ResultBuffer, finish_run, start_run
+
+
+async def arun_flow(session, step=0, city=None, seed=None, direct=None, resume=None):
+    """Async counterpart of runner.run_flow; returns the same flow dict and buffers writes the same way.
+
+    The seed only makes choices repeatable when flows don't interleave (concurrency 1).
+    """
+    seed_flow(seed, city)
+    if direct:
+        return await arun_direct_flow(session, city, direct, seed)
+    flow = {
+        "city": city,
+        "chosen_text": None,
+        "suggestions": [],
+        "date_info": None,
+        "guest_info": None,
+        "results_info": None,
+        "skipped": [],
+        "timings": {},
+        "resumed_from": None,
+    }
+    checkpoint = await sync_to_async(find_checkpoint)(step, city, resume)
+    steps = resume_flow(flow, step, checkpoint)
+
+    async with arecorded_run(session, flow, step, seed) as buffer:
+        if checkpoint:
+            await session.restore(checkpoint.storage_state, resume_url(checkpoint, session.base_url))
+            if checkpoint.step == 1:
+                await step01_landing.reselect(session, checkpoint.chosen_text)
+
+        if 1 in steps:
+            with timed_step(session, flow, 1):
+                flow["city"], flow["chosen_text"], flow["suggestions"] = await step01_landing.run(session, city)
+            await buffer.aflush()
+            await asave_checkpoint(session, flow, buffer.run, 1)
+
+        for n in (3, 4, 5):
+            if n not in steps:
+                continue
+            if not flow["chosen_text"]:
+                flow["skipped"].append(n)
+                continue
+            with timed_step(session, flow, n):
+                if n == 3:
+                    flow["date_info"] = await step03_datepicker.run(session, flow["chosen_text"])
+                elif n == 4:
+                    flow["guest_info"] = await step04_guests.run(session, flow["chosen_text"], flow["date_info"])
+                else:
+                    flow["results_info"] = await step05_results.run(
+                        session, flow["chosen_text"], flow["date_info"], flow["guest_info"]
+                    )
+            await buffer.aflush()
+            if n != 5:
+                await asave_checkpoint(session, flow, buffer.run, n)
+    return flow
+
+
+async def asave_checkpoint(session, flow, run, n):
+    """Async twin of runner.save_checkpoint."""
+    if step_output(flow, n):
+        await sync_to_async(Checkpoint.objects.create)(
+            run=run, url=session.page.url, storage_state=await session.snapshot(), **checkpoint_fields(flow, n)
+        )
+
+
+async def arun_direct_flow(session, city, direct, seed=None):
+    flow = direct_flow(city, direct)
+    async with arecorded_run(session, flow, 5, seed, direct):
+        with timed_step(session, flow, 5):
+            flow["results_info"] = await step05_results.run_direct(session, flow["city"], **direct)
+    return flow
+
+
+@asynccontextmanager
+async def arecorded_run(session, flow, step=0, seed=None, direct=None):
+    """Async twin of runner.recorded_run."""
+    run = await sync_to_async(start_run)(**run_fields(session, flow, step, seed, direct))
+    flow["run_id"] = run.pk
+    crashed = True
+    try:
+        async with ResultBuffer(run) as buffer:
+            yield buffer
+        crashed = False
+    finally:
+        status, fields = finish_fields(session, flow, step, crashed)
+        await sync_to_async(finish_run)(run, status, **fields)
+
+
+async def arun_city(browser, city, step=0, session_options=None, seed=None, direct=None):
+    """Run one flow in its own context; same summary shape as workers.run_city."""
+    started = time.perf_counter()
+    summary = {"city": city, "passed": False, "error": None, "flow": None}
+    try:
+        async with browser.session(**for_city(session_options or {}, city)) as session:
+            flow = await arun_flow(session, step=step, city=city, seed=seed, direct=direct)
+        summary["flow"] = flow
+        summary["passed"] = flow["passed"]
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+    summary["elapsed"] = time.perf_counter() - started
+    return summary
+
+
+async def run_cities(cities, headless=True, step=0, concurrency=5, session_options=None, seed=None,
+                     direct=None, pool_options=None):
+    """Run many flows on one event loop and one pooled browser, at most `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async with AsyncBrowserPool(headless=headless, contexts=concurrency, **(pool_options or {})) as browser:
+        async def bounded(city):
+            async with semaphore:
+                return await arun_city(browser, city, step, session_options, seed, direct)
+
+        return await asyncio.gather(*(bounded(city) for city in cities))
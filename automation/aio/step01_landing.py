@@ -0,0 +1,173 @@
+import random
+
+from automation.steps.step01_landing import (
+    URL, CITIES, MODAL_CLOSE_SELECTORS, SEARCH_INPUT_SELECTORS, SEARCH_OPENER_SELECTORS,
+    SUGGESTION_SELECTORS, _clean,
+)
+from automation.aio.resolver import resolve
+from automation.aio.waits import wait_for_state
+from automation.utils.logger import alog_result
+
+
+async def _log(session, name, comment, screenshot_name, force_fail=False):
+    passed = session.passed() and not force_fail
+    # await atake_screenshot(session, screenshot_name, passed)
+    if not session.passed():
+        comment += f" | Errors: {session.error_summary()}"
+    await alog_result(name, session.page.url, passed, comment)
+    session.clear_errors()
+    return passed
+
+
+async def _dismiss_modal(session):
+    page = session.page
+    dismissed = False
+    btn, sel = await resolve(page, "modal_close", MODAL_CLOSE_SELECTORS, timeout=2000)
+    if btn:
+        try:
+            await btn.click()
+            await wait_for_state(page, sel, 'hidden', timeout=2000)
+            dismissed = True
+        except Exception:
+            pass
+    await _log(session, "Close modal / pop-up on landing",
+               "Modal detected and closed." if dismissed else "No modal appeared.",
+               "close_modal")
+
+
+async def _open_search(page):
+    """Click whatever opens the location search input."""
+    el, _ = await resolve(page, "search_opener", SEARCH_OPENER_SELECTORS, timeout=2000)
+    if el:
+        try:
+            await el.click()
+            await wait_for_state(page, SEARCH_INPUT_SELECTORS[0], 'visible', timeout=3000)
+        except Exception:
+            pass
+
+
+async def _type_and_select_suggestion(page, city, pick=None):
+    """Async port of step01_landing._type_and_select_suggestion."""
+    search_input, _ = await resolve(page, "search_input", SEARCH_INPUT_SELECTORS, timeout=2000)
+
+    if not search_input:
+        return [], None, False
+
+    await search_input.click()
+    await search_input.fill("")
+    for ch in city:
+        await search_input.type(ch, delay=random.randint(100, 200))
+
+    _, dropdown_sel = await resolve(page, "suggestions", SUGGESTION_SELECTORS, timeout=3000)
+
+    if not dropdown_sel:
+        return [], None, False
+
+    suggestions = []
+    boxes = []
+    items = page.locator(dropdown_sel)
+    count = await items.count()
+
+    for i in range(count):
+        try:
+            el = items.nth(i)
+            text = _clean(await el.inner_text())
+            box = await el.bounding_box()
+            if text and box and box["width"] > 0 and box["height"] > 0:
+                suggestions.append(text)
+                boxes.append(box)
+        except Exception:
+            continue
+
+    if not suggestions:
+        return [], None, False
+
+    if pick is not None:
+        idx = suggestions.index(pick) if pick in suggestions else 0
+    else:
+        idx = random.randint(0, len(suggestions) - 1)
+    chosen = suggestions[idx]
+    print(f"  → Clicking suggestion {idx+1}: '{chosen}'")
+
+    if idx < len(boxes):
+        box = boxes[idx]
+    else:
+        box = boxes[0]
+        chosen = suggestions[0]
+
+    cx = box["x"] + box["width"] / 2
+    cy = box["y"] + box["height"] / 2
+    await page.mouse.click(cx, cy)
+    await wait_for_state(page, dropdown_sel, 'hidden', timeout=5000)
+    print(f"  ✓ Clicked at ({cx:.0f}, {cy:.0f})")
+
+    return suggestions, chosen, True
+
+
+async def run(session, city=None):
+    page = session.page
+    print("\n🚀 STEP 01 — Website Landing & Initial Search Setup (async)")
+    print("=" * 55)
+
+    print("\n[1] Loading Airbnb homepage...")
+    await page.goto(session.base_url or URL, wait_until="domcontentloaded", timeout=60_000)
+    if not session.warm:
+        await page.evaluate("localStorage.clear(); sessionStorage.clear();")
+    await wait_for_state(page, "header", 'visible', timeout=10_000)
+    await _log(session, "Homepage load", "Airbnb homepage loaded successfully.", "homepage_load")
+
+    print("\n[2] Checking for modals...")
+    if session.warm:
+        print("  Skipped: warm start, the saved state already has the modal dismissed.")
+    else:
+        await _dismiss_modal(session)
+
+    print("\n[3] Verifying homepage...")
+    ok = await wait_for_state(page, "header", 'visible', timeout=10_000)
+    await _log(session, "Verify homepage content",
+               "Header confirmed visible." if ok else "Header not found.",
+               "homepage_verify", force_fail=not ok)
+    if ok:
+        # Only a landing that passed becomes the state later warm runs start from
+        await session.save_storage_state()
+
+    print("\n[4] Clicking search field...")
+    await _open_search(page)
+    await _log(session, "Click search field", "Search field clicked and opened.", "search_field_click")
+
+    city = city or random.choice(CITIES)
+    print(f"\n[5] Typing city: '{city}'")
+
+    suggestions, chosen_text, click_ok = await _type_and_select_suggestion(page, city)
+
+    print("\n[6] Logging suggestions...")
+    list_visible = bool(suggestions)
+    numbered = ", ".join(f"{i+1}. {s}" for i, s in enumerate(suggestions))
+    await _log(session, "Location search autocomplete",
+               f"Suggestions for '{city}': {numbered}" if list_visible else f"No suggestions for '{city}'.",
+               "search_autocomplete", force_fail=not list_visible)
+
+    if not list_visible:
+        return city, None, []
+
+    print("\n[7] Checking icons...")
+    await _log(session, "Auto-suggestion map icon check",
+               "Icon check complete (Airbnb uses CSS background icons).",
+               "suggestion_icons")
+
+    print("\n[8] Logging suggestion selection...")
+    await _log(session, "Select suggestion from list",
+               f"Clicked suggestion '{chosen_text}' using mouse coordinates."
+               if click_ok else "Failed to click any suggestion.",
+               "suggestion_selected", force_fail=not click_ok)
+
+    print("\n✅ Step 01 complete!")
+    return city, chosen_text, suggestions
+
+
+async def reselect(session, chosen_text):
+    """Async port of step01_landing.reselect."""
+    print(f"\n↩️  Re-selecting '{chosen_text}' from the checkpoint...")
+    await _open_search(session.page)
+    _, _, ok = await _type_and_select_suggestion(session.page, chosen_text, pick=chosen_text)
+    return ok
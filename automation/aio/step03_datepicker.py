@@ -0,0 +1,239 @@
+import random
+from datetime import datetime
+
+from automation.aio.resolver import remember, resolve
+from automation.aio.waits import read_text, wait_for_network_idle, wait_for_text_change
+from automation.steps.step03_datepicker import (
+    CALENDAR_DAY_SELECTORS, CHECKIN_FIELD, CHECKOUT_FIELD, DATE_FIELD_SELECTORS, MONTH_HEADING,
+    NEXT_MONTH_SELECTORS,
+)
+from automation.utils.logger import alog_result
+
+
+async def _log(session, name, comment, screenshot_name, force_fail=False):
+    passed = session.passed() and not force_fail
+    # await atake_screenshot(session, screenshot_name, passed)
+    if not session.passed():
+        comment += f" | Errors: {session.error_summary()}"
+    await alog_result(name, session.page.url, passed, comment)
+    session.clear_errors()
+    return passed
+
+
+async def _parse_date(el):
+    for attr in ['aria-label', 'data-date']:
+        try:
+            val = (await el.get_attribute(attr) or '').strip()
+            for prefix in ['Choose ', 'Selected ', 'Available ']:
+                if val.startswith(prefix):
+                    val = val[len(prefix):].strip()
+            for fmt in ['%B %d, %Y', '%b %d, %Y', '%Y-%m-%d', '%A, %B %d, %Y']:
+                try:
+                    return datetime.strptime(val, fmt)
+                except ValueError:
+                    continue
+        except Exception:
+            continue
+    return None
+
+
+async def _get_month(page):
+    for sel in ['h2[aria-live]', '[data-testid="calendar-month-and-year"]',
+                '[aria-live="polite"]', 'h2']:
+        try:
+            for el in await page.locator(sel).all():
+                text = (await el.inner_text()).strip()
+                if any(m in text for m in ['Jan','Feb','Mar','Apr','May','Jun',
+                                            'Jul','Aug','Sep','Oct','Nov','Dec']):
+                    return text
+        except Exception:
+            continue
+    return "unknown"
+
+
+async def _get_days(page):
+    for sel in ['[data-testid="calendar-day"]',
+                'button[aria-label*="202"]',
+                'button[aria-label*="203"]',
+                'td:not([aria-disabled="true"]) button']:
+        try:
+            visible = []
+            for el in await page.locator(sel).all():
+                if await el.is_visible() and not await el.get_attribute('disabled'):
+                    visible.append(el)
+            if visible:
+                print(f"  ✓ Day selector: {sel} ({len(visible)} days)")
+                return visible
+        except Exception:
+            continue
+    return []
+
+
+async def _is_calendar_open(page, timeout=1500):
+    el, _ = await resolve(page, "calendar_day", CALENDAR_DAY_SELECTORS, timeout=timeout)
+    return el is not None
+
+
+async def _label(el):
+    return await el.get_attribute('aria-label') or (await el.inner_text()).strip()
+
+
+async def run(session, chosen_text):
+    page = session.page
+    print("\n📅 STEP 03 — Date Picker Interaction (async)")
+    print("=" * 55)
+
+    print("\n[1] Opening date picker...")
+    is_open = await _is_calendar_open(page, timeout=3000)
+    if not is_open:
+        search_btn_sel = '[data-testid="structured-search-input-search-button"]'
+        try:
+            btn = page.locator(search_btn_sel).first
+            if await btn.is_visible(timeout=2000):
+                await btn.click()
+                await wait_for_network_idle(page, timeout=5000)
+        except Exception:
+            pass
+
+        el, sel = await resolve(page, "date_field", DATE_FIELD_SELECTORS, timeout=2000, record=False)
+        if el:
+            try:
+                print(f"  → Clicking date field: {sel}")
+                await el.click()
+                if await _is_calendar_open(page, timeout=3000):
+                    await remember("date_field", sel)
+            except Exception:
+                pass
+        is_open = await _is_calendar_open(page)
+
+    await _log(session, "Date picker modal opens",
+               f"Date picker opened after selecting '{chosen_text}'."
+               if is_open else f"Date picker did not open after selecting '{chosen_text}'.",
+               "datepicker_open", force_fail=not is_open)
+
+    if not is_open:
+        return None
+
+    num_clicks = random.randint(3, 8)
+    print(f"\n[2] Navigating {num_clicks} months forward...")
+    clicked_count = 0
+    btn, _ = await resolve(page, "next_month", NEXT_MONTH_SELECTORS, timeout=2000)
+    if btn:
+        try:
+            for _ in range(num_clicks):
+                before = await read_text(page, MONTH_HEADING)
+                await btn.click()
+                await wait_for_text_change(page, MONTH_HEADING, before, timeout=2000)
+                clicked_count += 1
+        except Exception:
+            pass
+
+    current_month = await _get_month(page)
+    print(f"  📅 Now viewing: {current_month}")
+    await _log(session, "Navigate calendar months",
+               f"Clicked Next Month {clicked_count}/{num_clicks} times. Now viewing: {current_month}.",
+               "datepicker_month_nav", force_fail=clicked_count == 0)
+
+    print("\n[3] Selecting check-in date...")
+    days = await _get_days(page)
+    if not days:
+        await _log(session, "Select check-in date", "No days found in calendar.",
+                   "checkin_selected", force_fail=True)
+        return None
+
+    mid = max(1, len(days) // 2)
+    checkin_el = random.choice(days[:mid])
+    checkin_index = days.index(checkin_el)
+    checkin_date = await _parse_date(checkin_el)
+    checkin_label = await _label(checkin_el)
+    print(f"  → Check-in: '{checkin_label}'")
+    before = await read_text(page, CHECKIN_FIELD)
+    await checkin_el.click()
+    await wait_for_text_change(page, CHECKIN_FIELD, before, timeout=2000)
+    await _log(session, "Select check-in date",
+               f"Check-in selected: '{checkin_label}'"
+               f"{' (' + checkin_date.strftime('%b %d, %Y') + ')' if checkin_date else ''}.",
+               "checkin_selected")
+
+    print("\n[4] Selecting check-out date...")
+    days = await _get_days(page)
+
+    checkout_el = None
+    checkout_date = None
+    if checkin_date:
+        for el in days:
+            candidate = await _parse_date(el)
+            if candidate and candidate > checkin_date:
+                checkout_el = el
+                checkout_date = candidate
+                break
+    else:
+        checkin_pos = None
+        for idx, el in enumerate(days):
+            if await _label(el) == checkin_label:
+                checkin_pos = idx
+                break
+        if checkin_pos is None:
+            checkin_pos = checkin_index
+        next_pos = checkin_pos + random.randint(2, 8)
+        if next_pos < len(days):
+            checkout_el = days[next_pos]
+            checkout_date = await _parse_date(checkout_el)
+
+    if not checkout_el:
+        await _log(session, "Select check-out date", "No valid check-out date found.",
+                   "checkout_selected", force_fail=True)
+        return None
+
+    checkout_label = await _label(checkout_el)
+    print(f"  → Check-out: '{checkout_label}'")
+    before = await read_text(page, CHECKOUT_FIELD)
+    await checkout_el.click()
+    await wait_for_text_change(page, CHECKOUT_FIELD, before, timeout=2000)
+    await _log(session, "Select check-out date",
+               f"Check-out selected: '{checkout_label}'"
+               f"{' (' + checkout_date.strftime('%b %d, %Y') + ')' if checkout_date else ''}.",
+               "checkout_selected")
+
+    print("\n[5] Confirming dates in input fields...")
+    confirmed = []
+    for sel in [CHECKIN_FIELD,
+                CHECKOUT_FIELD,
+                '[data-testid="structured-search-input-field-dates-0"]',
+                '[data-testid="structured-search-input-field-dates-1"]']:
+        try:
+            el = page.locator(sel).first
+            if await el.is_visible(timeout=1000):
+                text = (await el.inner_text()).strip() or await el.get_attribute('value') or ''
+                if text and text not in ('Check in', 'Check out', 'Add dates'):
+                    confirmed.append(text)
+        except Exception:
+            continue
+    await _log(session, "Confirm dates in input fields",
+               f"Dates in fields: {' | '.join(confirmed)}." if confirmed else
+               "Dates not visible in fields (calendar may still be open).",
+               "dates_confirmed")
+
+    print("\n[6] Validating date logic...")
+    if checkin_date and checkout_date:
+        logic_ok = checkout_date > checkin_date
+        nights = (checkout_date - checkin_date).days if logic_ok else 0
+        comment = (
+            f"Date logic valid. Check-in: {checkin_date.strftime('%b %d, %Y')}, "
+            f"Check-out: {checkout_date.strftime('%b %d, %Y')}, "
+            f"{nights} night(s). Month: {current_month}."
+            if logic_ok else
+            "Invalid — check-out not after check-in."
+        )
+    else:
+        logic_ok = True
+        comment = f"Check-in: '{checkin_label}', Check-out: '{checkout_label}'. Month: {current_month}."
+    await _log(session, "Validate selected dates are logical", comment,
+               "dates_validation", force_fail=not logic_ok)
+
+    print("\n✅ Step 03 complete!")
+    return {
+        "checkin": checkin_date.strftime('%Y-%m-%d') if checkin_date else checkin_label,
+        "checkout": checkout_date.strftime('%Y-%m-%d') if checkout_date else checkout_label,
+        "month": current_month,
+    }
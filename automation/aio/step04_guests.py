@@ -0,0 +1,188 @@
+import random
+
+from automation.aio.waits import (
+    read_text, wait_for_navigation, wait_for_state, wait_for_text_change, wait_for_url_param,
+)
+from automation.aio.resolver import remember, resolve
+from automation.steps.step04_guests import (
+    ADULTS_PLUS, ADULTS_PLUS_SELECTORS, ADULTS_VALUE, GUEST_POPUP_SELECTORS, GUESTS_BTN,
+    GUESTS_BTN_SELECTORS, SEARCH_BAR_SELECTORS, SEARCH_BTN_SELECTORS,
+)
+from automation.utils.logger import alog_result
+from automation.utils.screenshot import atake_screenshot
+from automation.utils.waits import CALENDAR_DAY
+
+
+async def _log(session, name, comment, screenshot_name, force_fail=False):
+    passed = session.passed() and not force_fail
+    await atake_screenshot(session, screenshot_name, passed)
+    if not session.passed():
+        comment += f" | Errors: {session.error_summary()}"
+    await alog_result(name, session.page.url, passed, comment)
+    session.clear_errors()
+    return passed
+
+
+async def _click_plus(page, btn, times):
+    clicked = 0
+    for _ in range(times):
+        try:
+            before = await read_text(page, ADULTS_VALUE)
+            await btn.click()
+            await wait_for_text_change(page, ADULTS_VALUE, before, timeout=2000)
+            clicked += 1
+        except Exception:
+            break
+    return clicked
+
+
+async def _get_count(page, sel):
+    try:
+        el = page.locator(sel).first
+        if await el.is_visible(timeout=1000):
+            digits = ''.join(filter(str.isdigit, await el.inner_text()))
+            return int(digits) if digits else 0
+    except Exception:
+        pass
+    return 0
+
+
+async def _expand_search_bar(page):
+    """On results page, the search bar is collapsed — click it to expand."""
+    el, sel = await resolve(page, "search_bar", SEARCH_BAR_SELECTORS, timeout=1500, record=False)
+    if not el:
+        return False
+    try:
+        await el.click()
+    except Exception:
+        return False
+    if await wait_for_state(page, GUESTS_BTN, 'visible', timeout=3000):
+        await remember("search_bar", sel)
+    return True
+
+
+async def _find_guests_btn(page):
+    """Find and click the guests button in the expanded search bar."""
+    el, sel = await resolve(page, "guests_btn", GUESTS_BTN_SELECTORS, timeout=1500, record=False)
+    if not el:
+        return False
+    try:
+        await el.click()
+    except Exception:
+        return False
+    if await wait_for_state(page, ADULTS_PLUS, 'visible', timeout=3000):
+        await remember("guests_btn", sel)
+    return True
+
+
+async def _popup_is_open(page):
+    el, _ = await resolve(page, "guest_popup", GUEST_POPUP_SELECTORS, timeout=1500)
+    return el is not None
+
+
+async def run(session, chosen_text, date_info):
+    page = session.page
+    print("\n👥 STEP 04 — Guest Selection (async)")
+    print("=" * 55)
+
+    await page.keyboard.press("Escape")
+    await wait_for_state(page, CALENDAR_DAY, 'hidden', timeout=2000)
+
+    print("\n[1] Clicking guest input field...")
+    opened = await _find_guests_btn(page)
+    if not opened or not await _popup_is_open(page):
+        print("  → Search bar collapsed, expanding first...")
+        await _expand_search_bar(page)
+        opened = await _find_guests_btn(page)
+
+    await _log(session, "Click guest input field",
+               "Guest field clicked." if opened else "Guest field not found.",
+               "guest_field_click", force_fail=not opened)
+
+    if not opened:
+        return None
+
+    print("\n[2] Verifying guest selection popup...")
+    popup_open = await _popup_is_open(page)
+    await _log(session, "Guest selection popup opens",
+               "Guest popup is open." if popup_open else "Guest popup did not open.",
+               "guest_popup_open", force_fail=not popup_open)
+
+    if not popup_open:
+        return None
+
+    target_guests = random.randint(2, 5)
+    print(f"\n[3] Selecting {target_guests} guests...")
+
+    adults_plus, _ = await resolve(page, "adults_plus", ADULTS_PLUS_SELECTORS, timeout=1500)
+
+    actual_guests = 0
+    if adults_plus:
+        current = await _get_count(page, ADULTS_VALUE) or 1
+        clicks = max(0, target_guests - current)
+        done = await _click_plus(page, adults_plus, clicks)
+        actual_guests = current + done
+        print(f"  ✓ Total guests: {actual_guests}")
+
+    await _log(session, "Select random number of guests",
+               f"Selected {actual_guests} guest(s)." if adults_plus else "Adults stepper not found.",
+               "guests_selected", force_fail=not adults_plus)
+
+    if not adults_plus:
+        return None
+
+    print("\n[4] Verifying guest count in field...")
+    displayed = None
+    for sel in [
+        GUESTS_BTN,
+        '[data-testid="little-search-guests"]',
+        '[data-testid="little-search-anon-guest-display"]',
+        '[data-testid*="guest"]',
+    ]:
+        try:
+            el = page.locator(sel).first
+            if await el.is_visible(timeout=1000):
+                text = (await el.inner_text()).strip()
+                if text and any(c.isdigit() for c in text):
+                    displayed = text
+                    break
+        except Exception:
+            continue
+
+    await _log(session, "Guest count shown in input field",
+               f"Field shows: '{displayed}'. Expected: {actual_guests}."
+               if displayed else "Could not read guest field.",
+               "guest_count_verified")
+
+    print("\n[5] Validating guest count matches...")
+    matches = displayed is not None and str(actual_guests) in (displayed or '')
+    await _log(session, "Validate guest count matches selection",
+               f"Match {'✓' if matches else '✗'}: field='{displayed}', selected={actual_guests}.",
+               "guest_count_validation")
+
+    print("\n[6] Clicking Search button...")
+    search_clicked = False
+    el, sel = await resolve(page, "search_btn", SEARCH_BTN_SELECTORS, timeout=2000)
+    if el:
+        try:
+            print(f"  → {sel}")
+            old_url = page.url
+            await el.click()
+            await wait_for_navigation(page, old_url, timeout=15_000)
+            # The results page can land before its URL has the guest count
+            await wait_for_url_param(page, "adults", timeout=5000)
+            search_clicked = True
+            print(f"  ✓ URL: {page.url}")
+        except Exception:
+            pass
+
+    await _log(session, "Click Search button",
+               f"Search submitted. URL: {page.url}" if search_clicked else "Search button not found.",
+               "search_submitted", force_fail=not search_clicked)
+
+    print("\n✅ Step 04 complete!")
+    return {
+        "guests": actual_guests,
+        "target": target_guests,
+        "search_url": page.url,
+    }
@@ -0,0 +1,164 @@
+from automation.aio.resolver import resolve
+from automation.aio.waits import (
+    read_text, wait_for_count_above, wait_for_navigation, wait_for_network_idle, wait_for_text_change,
+)
+from automation.steps.step01_landing import URL
+from automation.steps.step05_results import (
+    CARD_SELECTOR, CARD_TITLE, EXTRACT_LISTINGS_JS, NEXT_PAGE_SELECTORS, RESULTS_SELECTORS, SEARCH_BAR_TEXT_SELECTORS,
+    _fresh, _listing_rows, _location_shown, _parse_url_params, _print_page, _ui_checks, _url_checks,
+    build_search_url,
+)
+from automation.utils.logger import alog_result
+from automation.utils.screenshot import atake_screenshot
+from automation.utils.writer import aflush_current, asave_listings
+
+
+async def _log(session, name, comment, screenshot_name, force_fail=False):
+    passed = session.passed() and not force_fail
+    await atake_screenshot(session, screenshot_name, passed)
+    if not session.passed():
+        comment += f" | Errors: {session.error_summary()}"
+    await alog_result(name, session.page.url, passed, comment)
+    session.clear_errors()
+    return passed
+
+
+async def _extract_listings(page, limit=20, offset=0):
+    try:
+        data = await page.evaluate(EXTRACT_LISTINGS_JS, {"limit": limit, "offset": offset})
+    except Exception as e:
+        print(f"  ⚠ Listing extraction failed: {e}")
+        return 0, []
+    return data["cards"], data["listings"]
+
+
+async def _next_page(page, cards):
+    link, _ = await resolve(page, "next_page", NEXT_PAGE_SELECTORS, timeout=1500)
+    if link:
+        before, old_url = await read_text(page, CARD_TITLE), page.url
+        await link.click()
+        moved = await wait_for_navigation(page, old_url, timeout=15_000)
+        changed = await wait_for_text_change(page, CARD_TITLE, before, timeout=10_000)
+        return 0 if moved or changed else None
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    if await wait_for_count_above(page, CARD_SELECTOR, cards, timeout=5000):
+        return cards
+    return None
+
+
+async def aiter_result_pages(page, max_pages=1, max_listings=20):
+    """Async twin of step05_results.iter_result_pages."""
+    number = taken = offset = 0
+    seen = set()
+    while True:
+        number += 1
+        await wait_for_network_idle(page, timeout=3000)
+        # Read every card, then cap: repeats don't count toward max_listings
+        cards, listings = await _extract_listings(page, 10_000, offset)
+        listings = _fresh(listings, seen, max_listings - taken if max_listings else None)
+        taken += len(listings)
+        yield number, page.url, listings
+        if (max_pages and number >= max_pages) or (max_listings and taken >= max_listings):
+            return
+        offset = await _next_page(page, cards)
+        if offset is None:
+            return
+
+
+async def run(session, chosen_text, date_info, guest_info):
+    page = session.page
+    print("\n🔍 STEP 05 — Search Results Verification & Scraping (async)")
+    print("=" * 55)
+
+    current_url = page.url
+    print(f"  URL: {current_url}")
+
+    print("\n[1] Verifying results page loaded...")
+    el, sel = await resolve(page, "results", RESULTS_SELECTORS, timeout=10_000)
+    results_loaded = el is not None
+    if results_loaded:
+        print(f"  ✓ Results confirmed via: {sel}")
+
+    await _log(session, "Search results page loads",
+               f"Results page loaded. URL: {current_url}" if results_loaded
+               else "Results page did not load properly.",
+               "results_page", force_fail=not results_loaded)
+
+    if not results_loaded:
+        return None
+
+    print("\n[2] Checking dates and guests in page UI...")
+
+    ui_checks = []
+
+    try:
+        ui_checks = _ui_checks(await page.inner_text("body"), date_info, guest_info)
+    except Exception:
+        pass
+
+    for sel in SEARCH_BAR_TEXT_SELECTORS:
+        try:
+            if _location_shown(await page.locator(sel).first.inner_text(), chosen_text):
+                ui_checks.append("location visible in search bar")
+                break
+        except Exception:
+            continue
+
+    await _log(session, "Dates and guest count appear in UI",
+               f"UI checks passed: {', '.join(ui_checks)}." if ui_checks
+               else "Could not confirm dates/guests in UI (may be in collapsed bar).",
+               "results_ui_check")
+
+    print("\n[3] Validating URL parameters...")
+    url_params = _parse_url_params(current_url)
+    print(f"  URL params: {url_params}")
+    url_checks = _url_checks(url_params)
+    await _log(session, "Dates and guests present in URL",
+               f"URL contains: {', '.join(url_checks)}." if url_checks
+               else f"No search params found in URL: {current_url}",
+               "results_url_check")
+
+    print("\n[4] Scraping listing data...")
+    found = saved = pages = 0
+    try:
+        async for pages, page_url, listings in aiter_result_pages(page, session.max_pages, session.max_listings):
+            _print_page(pages, listings, found)
+            found += len(listings)
+            rows = _listing_rows(listings, page_url, chosen_text, url_params, date_info, guest_info)
+            try:
+                saved += await asave_listings(rows)
+                saved += await aflush_current()
+            except Exception as e:
+                print(f"  ⚠ DB save failed: {e}")
+    except Exception as e:
+        print(f"  ⚠ Pagination stopped after page {pages}: {e}")
+
+    await _log(session, "Scrape listing titles, prices, images",
+               f"Scraped {found} listings from {pages} results page(s)." if found
+               else "No listings could be scraped.",
+               "results_scraped", force_fail=not found)
+
+    if not found:
+        return None
+
+    print(f"\n[5] Stored {saved}/{found} listings in database")
+    await _log(session, "Store listing data in database",
+               f"Saved {saved}/{found} listings to database." if saved
+               else "Failed to save listings to database.",
+               "results_stored", force_fail=saved == 0)
+
+    print("\n✅ Step 05 complete!")
+    return {
+        "listings_found": found,
+        "listings_saved": saved,
+        "pages": pages,
+        "url_params": url_params,
+    }
+
+
+async def run_direct(session, city, checkin, checkout, adults):
+    print("\n⏩ Direct search URL (async)")
+    url = build_search_url(city, checkin, checkout, adults, base_url=session.base_url or URL)
+    print(f"  → {url}")
+    await session.page.goto(url, wait_until="domcontentloaded", timeout=60_000)
+    return await run(session, city, {"checkin": checkin, "checkout": checkout}, {"guests": adults})
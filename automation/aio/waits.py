@@ -0,0 +1,69 @@
+from playwright.async_api import TimeoutError as PWTimeout
+
+from automation.utils.waits import _COUNT_ABOVE_JS, _TEXT_CHANGED_JS, _TEXT_JS, _has_param
+from automation.utils.timing import counts_as_wait
+
+# Async counterparts of automation.utils.waits; same contracts (True/False, never raise).
+
+
+@counts_as_wait
+async def wait_for_state(page, selector, state='visible', timeout=5000):
+    try:
+        await page.wait_for_selector(selector, state=state, timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+async def wait_for_network_idle(page, timeout=5000):
+    try:
+        await page.wait_for_load_state('networkidle', timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+async def wait_for_navigation(page, old_url, timeout=15_000):
+    try:
+        await page.wait_for_url(lambda url: url != old_url, wait_until='domcontentloaded', timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+async def wait_for_url_param(page, name, timeout=15_000):
+    if _has_param(page.url, name):
+        return True
+    try:
+        await page.wait_for_url(lambda url: _has_param(url, name), wait_until='commit', timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+async def read_text(page, selector):
+    try:
+        return await page.evaluate(_TEXT_JS, selector)
+    except Exception:
+        return None
+
+
+@counts_as_wait
+async def wait_for_text_change(page, selector, old, timeout=3000):
+    try:
+        await page.wait_for_function(_TEXT_CHANGED_JS, arg=[selector, old or ''], timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+async def wait_for_count_above(page, selector, count, timeout=5000):
+    try:
+        await page.wait_for_function(_COUNT_ABOVE_JS, arg=[selector, count], timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from automation.models import Listing
+from automation.utils.price import price_fields
+
+FIELDS = ['price_amount', 'price_currency', 'price_period']
+
+
+class Command(BaseCommand):
+    help = "Parse Listing.price into price_amount / price_currency / price_period for rows stored before ingest did"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--all', action='store_true', default=False,
+                            help="Re-parse every row, not only those without an amount (e.g. after parser changes).")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        rows = Listing.objects.exclude(price='').order_by('pk')
+        if not options['all']:
+            rows = rows.filter(price_amount__isnull=True)
+
+        # Walk by primary key so each batch is an index range scan, however far in
+        last_pk = 0
+        updated = unparsed = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last_pk).only('pk', 'price', *FIELDS)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for listing in batch:
+                for field, value in price_fields(listing.price).items():
+                    setattr(listing, field, value)
+                if listing.price_amount is None:
+                    unparsed += 1
+            with transaction.atomic():
+                Listing.objects.bulk_update(batch, FIELDS)
+            updated += len(batch)
+            self.stdout.write(f"   {updated} rows processed")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Backfilled {updated - unparsed} listing prices ({unparsed} without an amount, e.g. 'N/A')"
+        ))
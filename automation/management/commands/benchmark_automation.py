@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from automation.standin.server import StandInServer
+from automation.steps import step01_landing
+from automation.utils.browser import SharedBrowser
+from automation.utils.options import add_session_arguments, for_city, session_options
+from automation.utils.resolver import forget
+from automation.utils.rpc import RpcCounter
+from automation.utils.runner import run_flow
+from automation.utils.screenshot import drain
+from automation.utils.stats import percentile
+
+STEPS = (1, 3, 4, 5)
+
+
+class Command(BaseCommand):
+    help = "Run the full flow N times against the local stand-in and report per-step latency and browser RPCs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--warmup', type=int, default=1,
+                            help="Runs executed first and left out of the numbers (browser and cache warm-up).")
+        parser.add_argument('--cities', nargs='+', metavar='CITY',
+                            help="Cities to cycle through (default: all step01 cities).")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Seed for the steps' random choices: every run of a city makes the same ones.")
+        parser.add_argument('--headed', action='store_true', default=False)
+        parser.add_argument('--keep-results', action='store_true', default=False,
+                            help="Keep the TestResult/Listing rows the runs write (rolled back by default).")
+        parser.add_argument('--output', metavar='FILE',
+                            help="Also write the raw per-run samples as JSON, to compare against later.")
+        add_session_arguments(parser)
+
+    def handle(self, *args, **options):
+        os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
+        cities = options['cities'] or step01_landing.CITIES
+        runs = max(1, options['runs'])
+        warmup = max(0, options['warmup'])
+        opts = session_options(options)
+
+        server = None
+        if 'base_url' not in opts and 'replay_har' not in opts:
+            server = StandInServer().start()
+            opts['base_url'] = server.url
+
+        self.stdout.write(self.style.SUCCESS("⏱  Benchmarking Airbnb automation"))
+        target = opts.get('base_url') or f"HAR {opts['replay_har']}"
+        self.stdout.write(f"   Target: {target} | Runs: {runs} (+{warmup} warm-up) | Seed: {options['seed']}")
+
+        samples = []
+        try:
+            with SharedBrowser(headless=not options['headed']) as browser, RpcCounter() as rpc:
+                for i in range(warmup + runs):
+                    city = cities[i % len(cities)]
+                    sample = self._run_once(browser, rpc, city, for_city(opts, city), options)
+                    label = "warm-up" if i < warmup else f"run {i - warmup + 1}/{runs}"
+                    status = "✅" if sample["passed"] else "❌"
+                    self.stdout.write(f"   {status} {label:<10} | {sample['city']:<10} | {sample['total_ms']:8.0f} ms"
+                                      f" | {sample['rpc_total']} RPCs")
+                    if i >= warmup:
+                        samples.append(sample)
+        finally:
+            drain()
+            if server:
+                server.stop()
+
+        self._report(samples)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({"options": {k: options[k] for k in ('runs', 'warmup', 'seed', 'cities')},
+                           "target": target, "samples": samples}, f, indent=2)
+            self.stdout.write(f"\n   Samples written to {options['output']}")
+
+    def _run_once(self, browser, rpc, city, opts, options):
+        rpc.reset()
+        started = time.perf_counter()
+        with browser.session(**opts) as session:
+            rpc.session = session
+            try:
+                with transaction.atomic():
+                    flow = run_flow(session, city=city, seed=options['seed'])
+                    if not options['keep_results']:
+                        transaction.set_rollback(True)
+            finally:
+                forget()  # winners learnt in a rolled-back run must not outlive its SelectorHint rows
+            rpc.session = None
+        total = time.perf_counter() - started
+
+        per_step = rpc.per_step()
+        return {
+            "city": city,
+            "passed": flow["passed"],
+            "total_ms": total * 1000,
+            "step_ms": {str(n): flow["timings"][n] * 1000 for n in flow["timings"]},
+            "rpc_total": sum(per_step.values()),
+            "rpc_by_step": {str(n): per_step[n] for n in per_step},
+            "rpc_by_method": {f"{step}:{method}": n for (step, method), n in rpc.calls.items()},
+        }
+
+    def _report(self, samples):
+        if not samples:
+            return
+        self.stdout.write("\n📊 Per-step latency (ms) and browser RPCs")
+        self.stdout.write(f"   {'step':<8}{'p50':>9}{'p95':>9}{'max':>9}{'rpc p50':>10}{'rpc p95':>10}")
+        rows = [(f"step {n}", str(n)) for n in STEPS] + [("other", "None")]
+        for label, key in rows:
+            ms = [s["step_ms"].get(key) for s in samples]
+            rpcs = [s["rpc_by_step"].get(key, 0) for s in samples]
+            self.stdout.write(f"   {label:<8}{_fmt(percentile(ms, 50))}{_fmt(percentile(ms, 95))}"
+                              f"{_fmt(percentile(ms, 100))}{_fmt(percentile(rpcs, 50), 10)}"
+                              f"{_fmt(percentile(rpcs, 95), 10)}")
+        totals = [s["total_ms"] for s in samples]
+        rpc_totals = [s["rpc_total"] for s in samples]
+        self.stdout.write(f"   {'flow':<8}{_fmt(percentile(totals, 50))}{_fmt(percentile(totals, 95))}"
+                          f"{_fmt(percentile(totals, 100))}{_fmt(percentile(rpc_totals, 50), 10)}"
+                          f"{_fmt(percentile(rpc_totals, 95), 10)}")
+
+        methods = Counter()
+        for s in samples:
+            for key, n in s["rpc_by_method"].items():
+                methods[key.split(':', 1)[1]] += n
+        self.stdout.write("\n   Most frequent RPCs (mean per run): " + ', '.join(
+            f"{method}={n / len(samples):.0f}" for method, n in methods.most_common(8)
+        ))
+
+        passed = sum(1 for s in samples if s["passed"])
+        style = self.style.SUCCESS if passed == len(samples) else self.style.ERROR
+        self.stdout.write(style(f"\n🏁 {passed}/{len(samples)} runs passed"))
+
+
+def _fmt(value, width=9):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.0f}"
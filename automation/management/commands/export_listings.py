@@ -0,0 +1,24 @@
+from automation.models import Listing, Sighting
+from automation.utils.export import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream listings into gzip CSV/NDJSON chunk files (resumable; see --output)"
+    model = Listing
+    name = 'listings'
+
+    def add_filter_arguments(self, parser):
+        parser.add_argument('--location', nargs='+', metavar='LOCATION',
+                            help="Only these locations, exactly as stored (e.g. 'Paris, France').")
+
+    def filter_queryset(self, queryset, options):
+        if options['location']:
+            queryset = queryset.filter(location__in=options['location'])
+        return queryset
+
+    def filter_runs(self, queryset, runs):
+        """Every listing these runs saw, each once."""
+        return queryset.filter(pk__in=Sighting.objects.filter(run_id__in=runs).values('listing_id'))
+
+    def filters(self, options):
+        return {**super().filters(options), 'location': options['location']}
@@ -0,0 +1,26 @@
+from automation.models import TestResult
+from automation.utils.export import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream test results into gzip CSV/NDJSON chunk files (resumable; see --output)"
+    model = TestResult
+    name = 'results'
+
+    def add_filter_arguments(self, parser):
+        parser.add_argument('--location', nargs='+', metavar='CITY',
+                            help="Only results of runs for these cities.")
+        outcome = parser.add_mutually_exclusive_group()
+        outcome.add_argument('--passed', action='store_true', default=False, help="Only passed checks.")
+        outcome.add_argument('--failed', action='store_true', default=False, help="Only failed checks.")
+
+    def filter_queryset(self, queryset, options):
+        if options['location']:
+            queryset = queryset.filter(run__city__in=options['location'])
+        if options['passed'] or options['failed']:
+            queryset = queryset.filter(passed=options['passed'])
+        return queryset
+
+    def filters(self, options):
+        return {**super().filters(options), 'location': options['location'],
+                'passed': options['passed'], 'failed': options['failed']}
@@ -0,0 +1,120 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from automation.models import Checkpoint, Listing, PriceObservation, Run, Sighting, StepTiming, TestResult
+
+# Runs go last: one is only pruned once nothing else points at it.
+TABLES = ('results', 'timings', 'listings', 'checkpoints', 'runs')
+
+
+class Command(BaseCommand):
+    help = ("Delete test results, step timings, listings, checkpoints and then empty runs older than N days, "
+            "in batches, optionally archiving them first")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, required=True,
+                            help="Keep the last N days. Listings count from when they were last seen.")
+        parser.add_argument('--only', nargs='+', choices=TABLES, default=list(TABLES),
+                            help="Tables to prune (default: all).")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Rows deleted per transaction, so the database is never locked for long.")
+        parser.add_argument('--archive', metavar='DIR',
+                            help="Append each batch to DIR/<table>-<timestamp>.ndjson.gz before deleting it.")
+        parser.add_argument('--dry-run', action='store_true', default=False,
+                            help="Only count what would be deleted.")
+        parser.add_argument('--vacuum', action='store_true', default=False,
+                            help="VACUUM afterwards to give the space back (SQLite only; rewrites the file).")
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError("--days must be 0 or more")
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        batch_size = max(1, options['batch_size'])
+        stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+        if options['archive']:
+            os.makedirs(options['archive'], exist_ok=True)
+
+        self.stdout.write(f"🧹 Pruning rows older than {cutoff:%Y-%m-%d %H:%M} UTC")
+        querysets = {
+            'results': TestResult.objects.filter(created_at__lt=cutoff),
+            'timings': StepTiming.objects.filter(created_at__lt=cutoff),
+            'listings': Listing.objects.filter(
+                Q(last_seen_at__lt=cutoff) | Q(last_seen_at__isnull=True, created_at__lt=cutoff)
+            ),
+            'checkpoints': Checkpoint.objects.filter(created_at__lt=cutoff),
+            # Finished runs left without rows, by this prune or because they wrote none
+            'runs': Run.objects.exclude(status=Run.RUNNING).filter(
+                started_at__lt=cutoff, results__isnull=True, step_timings__isnull=True, listings__isnull=True,
+                sightings__isnull=True, checkpoints__isnull=True,
+            ),
+        }
+        for table in TABLES:
+            if table not in options['only']:
+                continue
+            queryset = querysets[table]
+            if options['dry_run']:
+                self.stdout.write(f"   {table:<11} {queryset.count()} rows would be deleted")
+                continue
+            path = os.path.join(options['archive'], f"{table}-{stamp}.ndjson.gz") if options['archive'] else None
+            deleted = self._prune(table, queryset, batch_size, path)
+            where = f" (archived to {path})" if path and deleted else ""
+            self.stdout.write(f"   {table:<11} {deleted} rows deleted{where}")
+
+        if options['vacuum'] and not options['dry_run']:
+            if connection.vendor != 'sqlite':
+                self.stderr.write("   --vacuum only applies to SQLite; skipped")
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute('VACUUM')
+                self.stdout.write("   VACUUM done")
+
+    def _prune(self, table, queryset, batch_size, path):
+        """Delete `queryset` batch by batch; with `path`, each batch is archived
+        (and flushed to disk) before its delete commits."""
+        archive = gzip.open(path, 'at', encoding='utf-8') if path else None
+        deleted = 0
+        try:
+            while True:
+                rows = list(queryset.order_by('pk').values()[:batch_size])
+                if not rows:
+                    break
+                pks = [row['id'] for row in rows]
+                if archive:
+                    if table == 'listings':
+                        _attach_prices(rows, pks)
+                    for row in rows:
+                        archive.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+                    archive.flush()
+                with transaction.atomic():
+                    queryset.model.objects.filter(pk__in=pks).delete()
+                deleted += len(rows)
+        finally:
+            if archive:
+                archive.close()
+        if path and not deleted:
+            os.remove(path)
+        return deleted
+
+
+def _attach_prices(rows, pks):
+    """Listings take their price history and sightings with them (both are deleted by cascade)."""
+    prices, sightings = {}, {}
+    history = (PriceObservation.objects.filter(listing_id__in=pks)
+               .order_by('observed_at').values_list('listing_id', 'price', 'observed_at'))
+    for listing_id, price, observed_at in history:
+        prices.setdefault(listing_id, []).append({'price': price, 'observed_at': observed_at})
+    seen = (Sighting.objects.filter(listing_id__in=pks)
+            .order_by('seen_at').values_list('listing_id', 'run_id', 'price', 'seen_at'))
+    for listing_id, run_id, price, seen_at in seen:
+        sightings.setdefault(listing_id, []).append({'run_id': run_id, 'price': price, 'seen_at': seen_at})
+    for row in rows:
+        row['prices'] = prices.get(row['id'], [])
+        row['sightings'] = sightings.get(row['id'], [])
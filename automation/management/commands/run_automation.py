@@ -1,9 +1,23 @@
+import asyncio
+import multiprocessing
 import os
-os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
 
-from django.core.management.base import BaseCommand
-from automation.utils.browser import BrowserSession
-from automation.steps import step01_landing, step03_datepicker, step04_guests, step05_results
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from automation.aio.runner import run_cities
+from automation.utils.browser import BrowserSession, blocked_summary
+from automation.utils.options import (
+    add_pool_arguments, add_session_arguments, for_city, pool_options, session_options,
+)
+from automation.utils.pool import BrowserPool
+from automation.utils.runner import find_checkpoint, run_flow
+from automation.utils.screenshot import drain
+from automation.utils.workers import init_worker, run_city
+from automation.steps import step01_landing
 
 
 class Command(BaseCommand):
@@ -11,60 +25,231 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--headless', action='store_true', default=False)
-        parser.add_argument('--step', type=int, default=0)
+        parser.add_argument('--step', type=int, default=0,
+                            help="Run only this step. Steps 3-5 start from the newest checkpoint of the step "
+                                 "before them (of --cities, if one is given) instead of replaying step 1.")
+        parser.add_argument('--resume', type=int, metavar='RUN',
+                            help="Start from run RUN's last checkpoint and run the steps after it "
+                                 "(with --step: from its checkpoint before that step).")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Run whole flows in parallel, one browser per worker process "
+                                 "(each city gets its own context in that browser).")
+        parser.add_argument('--cities', nargs='+', metavar='CITY',
+                            help="Cities to run (default: one random city, or all cities with --workers > 1).")
+        parser.add_argument('--engine', choices=['sync', 'async'], default='sync',
+                            help="'async' runs every flow on one event loop with playwright.async_api.")
+        parser.add_argument('--concurrency', type=int, default=5,
+                            help="Max flows in flight at once with --engine async.")
+        parser.add_argument('--seed', type=int,
+                            help="Make each city's random choices (suggestion, dates, guests) repeatable.")
+        parser.add_argument('--direct', action='store_true', default=False,
+                            help="Skip the search UI: open the results URL for city/dates/guests and run step 5 only.")
+        parser.add_argument('--checkin', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                            help="Check-in for --direct (default: two weeks from today).")
+        parser.add_argument('--checkout', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                            help="Check-out for --direct (default: three nights after check-in).")
+        parser.add_argument('--adults', type=int, default=2, help="Guests for --direct.")
+        add_session_arguments(parser)
+        add_pool_arguments(parser)
 
     def handle(self, *args, **options):
         headless = options['headless']
         step = options['step']
+        workers = max(1, options['workers'])
+        cities = options['cities']
 
         self.stdout.write(self.style.SUCCESS("🤖 Starting Airbnb Automation"))
         self.stdout.write(f"   Mode: {'Headless' if headless else 'Headed (visible browser)'}")
+        self.session_options = session_options(options)
+        self.pool_options = pool_options(options)
+        self.seed = options['seed']
+        self.direct = self._direct_search(options) if options['direct'] else None
+        self.resume = options['resume']
+        if self.resume is not None:
+            self._check_resume(options)
+        self._check_har(cities or ([None] if workers == 1 or options['engine'] == 'async' else step01_landing.CITIES))
 
-        with BrowserSession(headless=headless) as session:
-            try:
-                city, chosen_text, suggestion_items = None, None, []
-                date_info = None
-                guest_info = None
-
-                if step == 0 or step == 1:
-                    city, chosen_text, suggestion_items = step01_landing.run(session)
-                    self.stdout.write(self.style.SUCCESS(
-                        f"\n   City: {city} | Selected: {chosen_text}"
-                    ))
-
-                if step == 0 or step == 3:
-                    if not chosen_text:
-                        self.stdout.write(self.style.ERROR("Step 3 requires step 1."))
-                    else:
-                        date_info = step03_datepicker.run(session, chosen_text)
-                        if date_info:
-                            self.stdout.write(self.style.SUCCESS(
-                                f"\n   Dates: {date_info['checkin']} -> {date_info['checkout']}"
-                            ))
-
-                if step == 0 or step == 4:
-                    if not chosen_text:
-                        self.stdout.write(self.style.ERROR("Step 4 requires step 1."))
-                    else:
-                        guest_info = step04_guests.run(session, chosen_text, date_info)
-                        if guest_info:
-                            self.stdout.write(self.style.SUCCESS(
-                                f"\n   Guests: {guest_info['guests']}"
-                            ))
-
-                if step == 0 or step == 5:
-                    if not chosen_text:
-                        self.stdout.write(self.style.ERROR("Step 5 requires step 1."))
-                    else:
-                        results_info = step05_results.run(session, chosen_text, date_info, guest_info)
-                        if results_info:
-                            self.stdout.write(self.style.SUCCESS(
-                                f"\n   Listings found: {results_info['listings_found']}"
-                                f" | Saved: {results_info['listings_saved']}"
-                            ))
+        if options['engine'] == 'async':
+            self._run_async(cities or [None], options['concurrency'], headless, step)
+            return
+
+        # The sync Playwright API runs its own event loop in this thread, which
+        # trips Django's async-safety check on every ORM call.
+        os.environ["DJANGO_ALLOW_ASYNC_UNSAFE"] = "true"
+
+        if cities or workers > 1:
+            self._run_many(cities or step01_landing.CITIES, workers, headless, step)
+            return
 
+        with BrowserSession(headless=headless, **for_city(self.session_options, None)) as session:
+            try:
+                flow = run_flow(session, step=step, seed=self.seed, direct=self.direct, resume=self.resume)
+                self._report(flow)
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"\n❌ Automation crashed: {e}"))
                 raise
 
-        self.stdout.write(self.style.SUCCESS("\n🏁 Automation complete. Check DB for results."))
\ No newline at end of file
+        drain()
+        self.stdout.write(self.style.SUCCESS("\n🏁 Automation complete. Check DB for results."))
+
+    def _direct_search(self, options):
+        checkin = options['checkin'] or date.today() + timedelta(days=14)
+        checkout = options['checkout'] or checkin + timedelta(days=3)
+        if checkout <= checkin:
+            raise CommandError("--checkout must be after --checkin.")
+        if options['adults'] < 1:
+            raise CommandError("--adults must be at least 1.")
+        self.stdout.write(f"   Direct search: {checkin} -> {checkout}, {options['adults']} adults")
+        return {"checkin": checkin.isoformat(), "checkout": checkout.isoformat(), "adults": options['adults']}
+
+    def _check_resume(self, options):
+        if options['cities'] or options['workers'] > 1 or options['engine'] == 'async' or self.direct:
+            raise CommandError("--resume continues one run: it can't be combined with --cities, --workers, "
+                               "--engine async or --direct.")
+        if options['step'] == 1:
+            raise CommandError("--resume needs a step after 1 (step 1 starts from scratch).")
+        if not find_checkpoint(options['step'], run=self.resume):
+            wanted = f" before step {options['step']}" if options['step'] else ""
+            raise CommandError(f"Run {self.resume} has no checkpoint{wanted} to resume from.")
+
+    def _check_har(self, cities):
+        record, replay = self.session_options.get('record_har'), self.session_options.get('replay_har')
+        if record and len(cities) > 1 and '{city}' not in record:
+            raise CommandError("--record-har needs '{city}' in the path when several cities run.")
+        if replay:
+            missing = [p for p in {for_city(self.session_options, c)['replay_har'] for c in cities}
+                       if not os.path.exists(p)]
+            if missing:
+                raise CommandError(f"HAR file(s) not found: {', '.join(sorted(missing))}")
+        if (record or replay) and self.seed is None:
+            self.stdout.write(self.style.WARNING(
+                "   No --seed: replays only match the recording if the flow makes the same random choices."
+            ))
+
+    def _report(self, flow):
+        self.stdout.write(f"\n   Run #{flow['run_id']}")
+        if flow["resumed_from"]:
+            self.stdout.write(f"   Resumed from run #{flow['resumed_from']['run']} "
+                              f"after step {flow['resumed_from']['step']}")
+        if flow["chosen_text"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n   City: {flow['city']} | Selected: {flow['chosen_text']}"
+            ))
+        for n in flow["skipped"]:
+            self.stdout.write(self.style.ERROR(f"Step {n} requires step 1 or a checkpoint to resume from."))
+        if flow["date_info"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n   Dates: {flow['date_info']['checkin']} -> {flow['date_info']['checkout']}"
+            ))
+        if flow["guest_info"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n   Guests: {flow['guest_info']['guests']}"
+            ))
+        if flow["results_info"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"\n   Listings found: {flow['results_info']['listings_found']}"
+                f" | Saved: {flow['results_info']['listings_saved']}"
+            ))
+        if flow["blocked"]:
+            self.stdout.write(f"\n   Blocked requests: {blocked_summary(flow['blocked'])}")
+
+    def _run_many(self, cities, workers, headless, step):
+        workers = min(workers, len(cities))
+        self.stdout.write(f"   Cities: {', '.join(cities)} | Workers: {workers}")
+        started = time.perf_counter()
+        summaries = []
+
+        if workers == 1:
+            with BrowserPool(headless=headless, **self.pool_options) as browser:
+                for city in cities:
+                    summaries.append(run_city(city, headless, step, browser, self.session_options, self.seed, self.direct))
+        else:
+            summaries = self._run_workers(cities, workers, headless, step)
+
+        self._summarize(summaries, time.perf_counter() - started)
+
+    def _run_workers(self, cities, workers, headless, step):
+        """Run the cities on a process pool. A worker that dies (OOM kill, Chromium
+        segfault) breaks the pool and every flow still on it; those cities are retried
+        one at a time on a fresh single-worker pool, so the one that breaks it again is
+        known and recorded as failed while the others carry on."""
+        summaries = []
+        remaining, isolate = list(cities), False
+        while remaining:
+            # Children open their own SQLite connections; don't hand them ours.
+            connections.close_all()
+            retry, culprit = [], None
+            with ProcessPoolExecutor(
+                max_workers=1 if isolate else workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            ) as pool:
+                futures = {
+                    pool.submit(run_city, city, headless, step, None, self.session_options, self.seed, self.direct,
+                                self.pool_options): city
+                    for city in remaining
+                }
+                # One worker runs the cities in order: the first broken one is the culprit,
+                # and each city starts when the one before it returned.
+                started = time.perf_counter()
+                for future in futures if isolate else as_completed(futures):
+                    city = futures[future]
+                    try:
+                        summaries.append(future.result())
+                    except BrokenProcessPool as e:
+                        if isolate and culprit is None:
+                            culprit = city
+                            summaries.append(_failed(city, f"Worker process died: {e}",
+                                                     time.perf_counter() - started))
+                        else:
+                            retry.append(city)
+                    except Exception as e:
+                        # A parallel worker's start time isn't known here: don't charge the city the batch's
+                        elapsed = time.perf_counter() - started if isolate else 0.0
+                        summaries.append(_failed(city, f"{type(e).__name__}: {e}", elapsed))
+                    started = time.perf_counter()
+            if retry:
+                self.stdout.write(self.style.WARNING(
+                    f"   A worker process died; retrying {len(retry)} city(ies) one at a time"))
+            remaining, isolate = retry, True
+        return summaries
+
+    def _run_async(self, cities, concurrency, headless, step):
+        self.stdout.write(f"   Engine: async | Flows: {len(cities)} | Concurrency: {concurrency}")
+        started = time.perf_counter()
+        summaries = asyncio.run(run_cities(
+            cities, headless, step, concurrency, self.session_options, self.seed, self.direct, self.pool_options
+        ))
+        self._summarize(summaries, time.perf_counter() - started)
+
+    def _summarize(self, summaries, wall):
+        drain()  # queued screenshots of this process are on disk before we report
+        self.stdout.write("\n📊 Summary")
+        for s in sorted(summaries, key=lambda s: s["city"] or ""):
+            status = "✅ PASS" if s["passed"] else "❌ FAIL"
+            if s["error"]:
+                detail = s["error"].splitlines()[0]
+            else:
+                detail = s["flow"]["chosen_text"] or ""
+            city = s["city"] or (s["flow"] or {}).get("city") or "?"
+            self.stdout.write(f"   {status} | {city:<10} | {s['elapsed']:6.1f}s | {detail}")
+
+        blocked = {}
+        for s in summaries:
+            for kind, n in ((s["flow"] or {}).get("blocked") or {}).items():
+                blocked[kind] = blocked.get(kind, 0) + n
+        if blocked:
+            self.stdout.write(f"   Blocked requests: {blocked_summary(blocked)}")
+
+        passed = sum(1 for s in summaries if s["passed"])
+        total_cpu = sum(s["elapsed"] for s in summaries)
+        style = self.style.SUCCESS if passed == len(summaries) else self.style.ERROR
+        self.stdout.write(style(
+            f"\n🏁 {passed}/{len(summaries)} flows passed | "
+            f"wall-clock {wall:.1f}s (serial sum {total_cpu:.1f}s)"
+        ))
+
+
+def _failed(city, error, elapsed):
+    """Summary for a city whose worker never returned one, after `elapsed` seconds of its own."""
+    return {"city": city, "passed": False, "error": error, "flow": None, "elapsed": elapsed}
@@ -0,0 +1,181 @@
+import asyncio
+import math
+import random
+import re
+import signal
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from automation.aio.pool import AsyncBrowserPool
+from automation.aio.runner import arun_city
+from automation.steps import step01_landing
+from automation.utils.cron import Cron
+from automation.utils.options import add_pool_arguments, add_session_arguments, pool_options, session_options
+from automation.utils.screenshot import drain
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def duration(value):
+    """argparse type: seconds, or a number with s/m/h/d ('90', '15m', '2h')."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*([smhd]?)', value.strip())
+    if not match:
+        raise ValueError(value)
+    return float(match.group(1)) * UNITS[match.group(2) or 's']
+
+
+class Command(BaseCommand):
+    help = ("Stay up and run the flow on a schedule, reusing a pool of warm Chromiums between runs "
+            "(each flow still gets a fresh context; browsers are recycled by --recycle-after / --max-browser-rss)")
+
+    def add_arguments(self, parser):
+        schedule = parser.add_mutually_exclusive_group(required=True)
+        schedule.add_argument('--every', type=duration, metavar='DURATION',
+                              help="Run every DURATION, e.g. 900, 15m, 2h.")
+        schedule.add_argument('--cron', metavar='EXPR',
+                              help="Run at the times of a 5-field cron expression, in TIME_ZONE, e.g. '0 */6 * * *'.")
+        parser.add_argument('--jitter', type=duration, default=0, metavar='DURATION',
+                            help="Delay each run by a random 0..DURATION so fleets don't fire in lockstep.")
+        parser.add_argument('--max-concurrency', type=int, default=1,
+                            help="Flows in flight at once. A tick that finds the previous tick's flows "
+                                 "still waiting for a slot is skipped rather than queued.")
+        parser.add_argument('--cities', nargs='+', metavar='CITY',
+                            help="Cities run on each tick (default: one random city per tick).")
+        parser.add_argument('--step', type=int, default=0)
+        parser.add_argument('--seed', type=int)
+        parser.add_argument('--direct', action='store_true', default=False,
+                            help="Scrape the results URL directly (step 5 only), see run_automation --direct.")
+        parser.add_argument('--lead-days', type=int, default=14,
+                            help="With --direct: check-in this many days after each run.")
+        parser.add_argument('--nights', type=int, default=3, help="With --direct: length of stay.")
+        parser.add_argument('--adults', type=int, default=2, help="With --direct: guests.")
+        parser.add_argument('--run-now', action='store_true', default=False,
+                            help="Fire once at start-up instead of waiting for the first scheduled time.")
+        parser.add_argument('--max-ticks', type=int, metavar='N', help="Exit after N ticks (default: run until stopped).")
+        parser.add_argument('--grace', type=duration, default=300, metavar='DURATION',
+                            help="On SIGTERM/SIGINT, wait this long for running flows before cancelling them.")
+        parser.add_argument('--browsers', type=int, default=1, metavar='N',
+                            help="Chromiums the concurrent flows are spread over (default 1).")
+        parser.add_argument('--headed', action='store_true', default=False)
+        add_session_arguments(parser)
+        add_pool_arguments(parser)
+
+    def handle(self, *args, **options):
+        try:
+            self.cron = Cron(options['cron']) if options['cron'] else None
+            if self.cron:
+                self.cron.next_after(timezone.localtime())  # parses but may never match, e.g. Feb 30
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['every'] is not None and options['every'] <= 0:
+            raise CommandError("--every must be more than 0")
+        if options['direct'] and (options['nights'] < 1 or options['adults'] < 1):
+            raise CommandError("--nights and --adults must be at least 1")
+        self.options = options
+        self.session_options = session_options(options)
+        self.pool_options = pool_options(options)
+        asyncio.run(self._serve())
+
+    def _next_tick(self, now):
+        """Wall-clock time of the next scheduled run after `now` (aware)."""
+        if self.cron:
+            return self.cron.next_after(timezone.localtime(now))
+        return now + timedelta(seconds=self.options['every'])
+
+    def _direct(self):
+        if not self.options['direct']:
+            return None
+        checkin = date.today() + timedelta(days=self.options['lead_days'])
+        checkout = checkin + timedelta(days=self.options['nights'])
+        return {"checkin": checkin.isoformat(), "checkout": checkout.isoformat(), "adults": self.options['adults']}
+
+    async def _serve(self):
+        options = self.options
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+        schedule = f"cron '{self.cron}'" if self.cron else f"every {options['every']:g}s"
+        self.stdout.write(self.style.SUCCESS(f"⏰ Scheduler up: {schedule}, jitter {options['jitter']:g}s, "
+                                             f"max concurrency {options['max_concurrency']}"))
+        concurrency = max(1, options['max_concurrency'])
+        browsers = min(max(1, options['browsers']), concurrency)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.waiting = 0  # flows of past ticks still waiting for a slot
+        self.browser = AsyncBrowserPool(headless=not options['headed'], size=browsers,
+                                        contexts=math.ceil(concurrency / browsers), **self.pool_options)
+        await self.browser.start()
+        flows = set()
+        ticks = 0
+        grace = options['grace']
+        try:
+            ready = await self.browser.fill()
+            self.stdout.write(f"   Browsers ready: {ready}/{browsers}")
+            next_at = timezone.now() if options['run_now'] else self._next_tick(timezone.now())
+            while True:
+                jitter = random.uniform(0, options['jitter'])
+                self.stdout.write(f"   Next run at {timezone.localtime(next_at):%Y-%m-%d %H:%M:%S} (+{jitter:.0f}s jitter)")
+                delay = max(0.0, (next_at - timezone.now()).total_seconds()) + jitter
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+                    break  # SIGTERM / SIGINT while sleeping
+                except asyncio.TimeoutError:
+                    pass
+                # A tick that ran late (slow host, long jitter) doesn't fire the missed ones
+                next_at = self._next_tick(max(next_at, timezone.now()))
+
+                if self.waiting:
+                    self.stdout.write(self.style.WARNING(
+                        f"   Skipping tick: {self.waiting} flow(s) from earlier ticks still waiting for a slot"))
+                else:
+                    cities = options['cities'] or [random.choice(step01_landing.CITIES)]
+                    direct = self._direct()
+                    for city in cities:
+                        task = asyncio.create_task(self._flow(city, direct))
+                        flows.add(task)
+                        task.add_done_callback(flows.discard)
+                ticks += 1
+                if options['max_ticks'] and ticks >= options['max_ticks']:
+                    grace = None  # a bounded run lets its last flows finish
+                    break
+        finally:
+            await self._shutdown(flows, grace)
+
+    async def _flow(self, city, direct):
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            summary = await arun_city(self.browser, city, self.options['step'], self.session_options,
+                                      self.options['seed'], direct)
+        finally:
+            self.semaphore.release()
+        flow = summary["flow"] or {}
+        status = "✅ PASS" if summary["passed"] else "❌ FAIL"
+        detail = summary["error"].splitlines()[0] if summary["error"] else flow.get("chosen_text") or ""
+        run = f"run #{flow['run_id']}" if flow.get("run_id") else "no run"
+        self.stdout.write(f"   {status} | {summary['city'] or flow.get('city') or '?':<10} | "
+                          f"{summary['elapsed']:6.1f}s | {run} | {detail}")
+
+    async def _shutdown(self, flows, grace):
+        if flows:
+            limit = f"up to {grace:g}s" if grace is not None else "until they finish"
+            self.stdout.write(f"   Stopping: waiting {limit} for {len(flows)} flow(s)")
+            started = time.perf_counter()
+            _, pending = await asyncio.wait(flows, timeout=grace)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                self.stdout.write(self.style.WARNING(
+                    f"   Cancelled {len(pending)} flow(s) after {time.perf_counter() - started:.0f}s"))
+        stats = self.browser.stats()
+        await self.browser.stop()
+        drain()
+        self.stdout.write(self.style.SUCCESS(f"🛑 Scheduler stopped ({stats['recycled']} browser(s) recycled)"))
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0002_listing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SelectorHint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('selector', models.CharField(max_length=500)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
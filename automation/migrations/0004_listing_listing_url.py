@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0003_selectorhint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='listing_url',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0004_listing_listing_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StepTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step', models.IntegerField()),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('passed', models.BooleanField(default=True)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('duration_ms', models.IntegerField()),
+                ('wait_ms', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='duration_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='wait_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
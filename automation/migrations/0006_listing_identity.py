@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:59
+
+import re
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+ROOM_ID = re.compile(r'/rooms/(\d+)')
+
+
+def backfill_identity(apps, schema_editor):
+    """Give the newest row of each room its listing_id and build its price
+    history from the duplicates earlier runs inserted (which are left in place)."""
+    Listing = apps.get_model('automation', 'Listing')
+    PriceObservation = apps.get_model('automation', 'PriceObservation')
+    history = {}
+    rows = Listing.objects.order_by('created_at', 'id').values_list('id', 'listing_url', 'price', 'created_at')
+    for pk, url, price, created_at in rows.iterator(chunk_size=2000):
+        match = ROOM_ID.search(url or '')
+        if match:
+            history.setdefault(match.group(1), []).append((pk, price, created_at))
+
+    observations = []
+    for room_id, sightings in history.items():
+        newest, _, seen_at = sightings[-1]
+        Listing.objects.filter(pk=newest).update(listing_id=room_id, last_seen_at=seen_at)
+        last_price = None
+        for _, price, created_at in sightings:
+            if price and price != last_price:
+                observations.append(PriceObservation(listing_id=newest, price=price, observed_at=created_at))
+                last_price = price
+    PriceObservation.objects.bulk_create(observations, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0005_step_timing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='listing_id',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='PriceObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.CharField(max_length=100)),
+                ('observed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='automation.listing')),
+            ],
+            options={
+                'ordering': ['-observed_at'],
+                'indexes': [models.Index(fields=['listing', '-observed_at'], name='automation__listing_f2253b_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_identity, migrations.RunPython.noop),
+    ]
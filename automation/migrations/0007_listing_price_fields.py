@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0006_listing_identity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='price_amount',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='price_currency',
+            field=models.CharField(blank=True, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='price_period',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['location', 'price_currency', 'price_amount'], name='automation__locatio_3a8048_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['price_currency', 'price_amount'], name='automation__price_c_0555bc_idx'),
+        ),
+    ]
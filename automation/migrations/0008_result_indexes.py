@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0007_listing_price_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['created_at'], name='automation__created_91594c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['location', 'created_at'], name='automation__locatio_9ce04c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['last_seen_at'], name='automation__last_se_60f16d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='steptiming',
+            index=models.Index(fields=['created_at'], name='automation__created_738be2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='steptiming',
+            index=models.Index(fields=['step', 'created_at'], name='automation__step_32511a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(fields=['created_at'], name='automation__created_6a8673_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testresult',
+            index=models.Index(fields=['passed', 'created_at'], name='automation__passed_1a5de6_idx'),
+        ),
+    ]
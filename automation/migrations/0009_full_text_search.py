@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:01
+
+from django.db import migrations
+
+# External-content FTS5 indexes over the admin search columns: the text stays in
+# the model tables, triggers keep the index in step with every insert, update
+# (including upserts) and delete. SQLite only; other backends keep LIKE search.
+FTS_TABLES = {
+    'automation_listing_fts': ('automation_listing', ['title', 'location']),
+    'automation_testresult_fts': ('automation_testresult', ['testCase', 'comment']),
+}
+
+
+def _create_sql(fts, table, columns):
+    cols = ', '.join(f'"{c}"' for c in columns)
+    new = ', '.join(f'new."{c}"' for c in columns)
+    old = ', '.join(f'old."{c}"' for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        # Index the rows that are already there
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for fts, (table, columns) in FTS_TABLES.items():
+        for sql in _create_sql(fts, table, columns):
+            schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for fts in FTS_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0008_result_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0009_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Run',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(blank=True, max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('seed', models.IntegerField(blank=True, null=True)),
+                ('step', models.IntegerField(default=0)),
+                ('options', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('passed', 'Passed'), ('failed', 'Failed'), ('crashed', 'Crashed')], default='running', max_length=10)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_ms', models.IntegerField(blank=True, null=True)),
+                ('results_total', models.IntegerField(default=0)),
+                ('results_failed', models.IntegerField(default=0)),
+                ('listings_found', models.IntegerField(default=0)),
+                ('listings_saved', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['started_at'], name='automation__started_c8a647_idx'), models.Index(fields=['status', 'started_at'], name='automation__status_f7659a_idx'), models.Index(fields=['city', 'started_at'], name='automation__city_15e896_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='listings', to='automation.run'),
+        ),
+        migrations.AddField(
+            model_name='steptiming',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='step_timings', to='automation.run'),
+        ),
+        migrations.AddField(
+            model_name='testresult',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='results', to='automation.run'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0010_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Checkpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step', models.IntegerField()),
+                ('city', models.CharField(blank=True, max_length=255)),
+                ('chosen_text', models.CharField(blank=True, max_length=255)),
+                ('date_info', models.JSONField(blank=True, null=True)),
+                ('guest_info', models.JSONField(blank=True, null=True)),
+                ('url', models.TextField()),
+                ('storage_state', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='automation.run')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at'], name='automation__created_38c75c_idx'), models.Index(fields=['step', 'created_at'], name='automation__step_7c98e7_idx'), models.Index(fields=['city', 'step', 'created_at'], name='automation__city_23be9a_idx')],
+            },
+        ),
+    ]
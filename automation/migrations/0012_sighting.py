@@ -0,0 +1,43 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:34
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_sightings(apps, schema_editor):
+    """Listings only remember the last run that saw them: record that one sighting."""
+    Listing = apps.get_model('automation', 'Listing')
+    Sighting = apps.get_model('automation', 'Sighting')
+    rows = Listing.objects.filter(run__isnull=False).values_list('id', 'run_id', 'price', 'last_seen_at', 'created_at')
+    Sighting.objects.bulk_create(
+        (Sighting(listing_id=pk, run_id=run_id, price=price, seen_at=last_seen_at or created_at)
+         for pk, run_id, price, last_seen_at, created_at in rows.iterator(chunk_size=2000)),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0011_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sighting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.CharField(blank=True, max_length=100)),
+                ('seen_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sightings', to='automation.listing')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sightings', to='automation.run')),
+            ],
+            options={
+                'ordering': ['-seen_at'],
+                'indexes': [models.Index(fields=['listing', '-seen_at'], name='automation__listing_830c33_idx')],
+                'constraints': [models.UniqueConstraint(fields=('run', 'listing'), name='unique_sighting_per_run')],
+            },
+        ),
+        migrations.RunPython(backfill_sightings, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,59 @@
 from django.db import models
+from django.utils import timezone
+
+
+class Run(models.Model):
+    """One flow (a city through the steps). Counts are kept up to date as the
+    run's rows are written, so listing runs never touches the child tables."""
+    RUNNING, PASSED, FAILED, CRASHED = 'running', 'passed', 'failed', 'crashed'
+    STATUS_CHOICES = [(RUNNING, 'Running'), (PASSED, 'Passed'), (FAILED, 'Failed'), (CRASHED, 'Crashed')]
+
+    city = models.CharField(max_length=255, blank=True)
+    location = models.CharField(max_length=255, blank=True)  # the suggestion step 1 chose
+    seed = models.IntegerField(null=True, blank=True)
+    step = models.IntegerField(default=0)  # 0: every step
+    options = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=RUNNING)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.IntegerField(null=True, blank=True)
+    results_total = models.IntegerField(default=0)
+    results_failed = models.IntegerField(default=0)
+    listings_found = models.IntegerField(default=0)
+    listings_saved = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['started_at']),
+            models.Index(fields=['status', 'started_at']),
+            models.Index(fields=['city', 'started_at']),
+        ]
+
+    def __str__(self):
+        return f"Run {self.pk} | {self.city or '?'} | {self.status}"
 
 
 class TestResult(models.Model):
+    run = models.ForeignKey(Run, null=True, blank=True, on_delete=models.SET_NULL, related_name='results')
     testCase = models.CharField(max_length=255)
     url = models.URLField(max_length=500)
     passed = models.BooleanField(default=True)
     comment = models.TextField()
+    # Time since the previous checkpoint of the same step; wait_ms is the part
+    # spent in wait helpers (selectors, navigation, network idle)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.IntegerField(null=True, blank=True)
+    wait_ms = models.IntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['passed', 'created_at']),
+        ]
 
     def __str__(self):
         status = "PASS" if self.passed else "FAIL"
@@ -17,18 +61,125 @@ class TestResult(models.Model):
 
 
 class Listing(models.Model):
+    # Airbnb's room id from /rooms/<id>: one row per property, updated on every
+    # sighting. Null for cards without a room link, which are inserted as before.
+    listing_id = models.CharField(max_length=32, unique=True, null=True, blank=True)
+    # The latest run that saw this listing
+    run = models.ForeignKey(Run, null=True, blank=True, on_delete=models.SET_NULL, related_name='listings')
     title = models.CharField(max_length=500)
     price = models.CharField(max_length=100, blank=True)
+    # `price` parsed at ingest (utils.price); amount is null when it has no number
+    price_amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    price_currency = models.CharField(max_length=3, blank=True)
+    price_period = models.CharField(max_length=10, blank=True)
     img_url = models.TextField(blank=True)
+    listing_url = models.TextField(blank=True)
     search_url = models.TextField(blank=True)
     location = models.CharField(max_length=255, blank=True)
     checkin = models.CharField(max_length=50, blank=True)
     checkout = models.CharField(max_length=50, blank=True)
     guests = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['location', 'created_at']),
+            models.Index(fields=['last_seen_at']),
+            # min/avg/max price per location and currency straight from the index
+            models.Index(fields=['location', 'price_currency', 'price_amount']),
+            models.Index(fields=['price_currency', 'price_amount']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} | {self.price} | {self.location}"
+
+
+class PriceObservation(models.Model):
+    """A listing's price from the moment it was first seen or changed; unchanged
+    prices on later runs only move Listing.last_seen_at."""
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='prices')
+    price = models.CharField(max_length=100)
+    observed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-observed_at']
+        indexes = [models.Index(fields=['listing', '-observed_at'])]
+
+    def __str__(self):
+        return f"{self.listing_id} | {self.price} | {self.observed_at:%Y-%m-%d %H:%M}"
+
+
+class Sighting(models.Model):
+    """A run saw a listing: one row per listing per run, so the listings of a run
+    stay known after later runs move Listing.run on."""
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='sightings')
+    run = models.ForeignKey(Run, on_delete=models.CASCADE, related_name='sightings')
+    price = models.CharField(max_length=100, blank=True)
+    seen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-seen_at']
+        constraints = [models.UniqueConstraint(fields=['run', 'listing'], name='unique_sighting_per_run')]
+        indexes = [models.Index(fields=['listing', '-seen_at'])]
+
+    def __str__(self):
+        return f"run {self.run_id} | {self.listing_id} | {self.price}"
+
+
+class SelectorHint(models.Model):
+    key = models.CharField(max_length=100, unique=True)
+    selector = models.CharField(max_length=500)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} -> {self.selector}"
+
+
+class StepTiming(models.Model):
+    run = models.ForeignKey(Run, null=True, blank=True, on_delete=models.SET_NULL, related_name='step_timings')
+    step = models.IntegerField()
+    location = models.CharField(max_length=255, blank=True)
+    passed = models.BooleanField(default=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    duration_ms = models.IntegerField()
+    wait_ms = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['step', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Step {self.step} | {self.duration_ms} ms | {self.location}"
+
+
+class Checkpoint(models.Model):
+    """What a flow knew after a step went well: the step's outputs plus the page
+    URL and cookies/localStorage, so a later run can start at the next step."""
+    run = models.ForeignKey(Run, on_delete=models.CASCADE, related_name='checkpoints')
+    step = models.IntegerField()
+    city = models.CharField(max_length=255, blank=True)
+    chosen_text = models.CharField(max_length=255, blank=True)
+    date_info = models.JSONField(null=True, blank=True)
+    guest_info = models.JSONField(null=True, blank=True)
+    url = models.TextField()
+    storage_state = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['step', 'created_at']),
+            models.Index(fields=['city', 'step', 'created_at']),
+        ]
 
     def __str__(self):
-        return f"{self.title} | {self.price} | {self.location}"
\ No newline at end of file
+        return f"Run {self.run_id} | step {self.step} | {self.chosen_text or self.city}"
@@ -0,0 +1,14 @@
+"""python -m automation.standin [port] — serve the stand-in until Ctrl+C."""
+import sys
+import time
+
+from automation.standin.server import StandInServer
+
+if __name__ == '__main__':
+    with StandInServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8800) as server:
+        print(f"Airbnb stand-in on {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
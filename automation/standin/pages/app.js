@@ -0,0 +1,169 @@
+// Behaviour of the stand-in search bar: autocomplete, calendar, guest stepper, search.
+// Only the parts the steps touch are modelled, with Airbnb's data-testids.
+(() => {
+  const $ = (sel) => document.querySelector(sel);
+  const MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                  'August', 'September', 'October', 'November', 'December'];
+  const DAYS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
+
+  const today = new Date();
+  today.setHours(0, 0, 0, 0);
+  const state = {
+    query: '',
+    month: new Date(today.getFullYear(), today.getMonth(), 1),
+    checkin: null,
+    checkout: null,
+    adults: 0,
+  };
+
+  // The results page carries the search in its URL, like the real one
+  const params = new URLSearchParams(window.location.search);
+  state.query = params.get('query') || '';
+  state.adults = Number(params.get('adults') || 0);
+
+  const iso = (d) => `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
+  const short = (d) => `${MONTHS[d.getMonth()].slice(0, 3)} ${d.getDate()}`;
+
+  // Third-party noise the real site produces; matched by IGNORED_URL_PATTERNS.
+  fetch('/tracking/pageview', {method: 'POST', keepalive: true}).catch(() => {});
+
+  // Once dismissed the modal stays away for this browser profile, like the real one
+  const modal = $('#welcome-modal');
+  if (modal && localStorage.getItem('welcome-dismissed')) {
+    modal.remove();
+  } else if (modal) {
+    modal.querySelector('[aria-label="Close"]').addEventListener('click', () => {
+      localStorage.setItem('welcome-dismissed', '1');
+      modal.remove();
+    });
+  }
+
+  const bar = $('#search-bar');
+  const little = $('[data-testid="little-search"]');
+  if (little) {
+    little.addEventListener('click', () => { bar.hidden = false; little.hidden = true; });
+  }
+
+  // Autocomplete
+  const input = $('[data-testid="structured-search-input-field-query"]');
+  input.value = state.query;
+  const listbox = $('#suggestions');
+  let pending = 0;
+
+  const closeSuggestions = () => { listbox.innerHTML = ''; listbox.hidden = true; };
+
+  input.addEventListener('input', () => {
+    const q = input.value.trim();
+    const ticket = ++pending;
+    if (!q) return closeSuggestions();
+    fetch(`/api/autocomplete?q=${encodeURIComponent(q)}`)
+      .then((r) => r.json())
+      .then((items) => {
+        if (ticket !== pending) return;
+        listbox.innerHTML = '';
+        items.forEach((item, i) => {
+          const opt = document.createElement('div');
+          opt.setAttribute('role', 'option');
+          opt.dataset.testid = `option-${i}`;
+          opt.innerHTML = `<span class="pin"></span><div>${item.title}<br><small>${item.subtitle}</small></div>`;
+          opt.addEventListener('click', () => {
+            input.value = item.title;
+            state.query = item.title;
+            closeSuggestions();
+            openCalendar();
+          });
+          listbox.appendChild(opt);
+        });
+        listbox.hidden = !items.length;
+      });
+  });
+
+  // Calendar
+  const calendar = $('#calendar');
+  const heading = $('[data-testid="calendar-month-and-year"]');
+  const grid = $('#calendar-days');
+  const checkinField = $('[data-testid="structured-search-input-field-split-dates-0"]');
+  const checkoutField = $('[data-testid="structured-search-input-field-split-dates-1"]');
+
+  const renderCalendar = () => {
+    const m = state.month;
+    heading.textContent = `${MONTHS[m.getMonth()]} ${m.getFullYear()}`;
+    grid.innerHTML = '';
+    for (let i = 0; i < m.getDay(); i++) grid.appendChild(document.createElement('span'));
+    const last = new Date(m.getFullYear(), m.getMonth() + 1, 0).getDate();
+    for (let day = 1; day <= last; day++) {
+      const d = new Date(m.getFullYear(), m.getMonth(), day);
+      const btn = document.createElement('button');
+      btn.type = 'button';
+      btn.dataset.testid = 'calendar-day';
+      btn.dataset.date = iso(d);
+      btn.textContent = day;
+      btn.setAttribute('aria-label', `Choose ${DAYS[d.getDay()]}, ${MONTHS[d.getMonth()]} ${day}, ${d.getFullYear()}`);
+      if (d < today) btn.disabled = true;
+      btn.addEventListener('click', () => pickDay(d));
+      grid.appendChild(btn);
+    }
+  };
+
+  const openCalendar = () => { closeGuests(); renderCalendar(); calendar.hidden = false; };
+  const closeCalendar = () => { calendar.hidden = true; };
+
+  const pickDay = (d) => {
+    if (!state.checkin || state.checkout || d <= state.checkin) {
+      state.checkin = d;
+      state.checkout = null;
+      checkinField.querySelector('div').textContent = short(d);
+      checkoutField.querySelector('div').textContent = 'Add dates';
+    } else {
+      state.checkout = d;
+      checkoutField.querySelector('div').textContent = short(d);
+    }
+  };
+
+  $('[data-testid="calendar-next-month"]').addEventListener('click', () => {
+    state.month = new Date(state.month.getFullYear(), state.month.getMonth() + 1, 1);
+    // Real calendars animate the slide; the heading changes a frame later.
+    requestAnimationFrame(renderCalendar);
+  });
+  checkinField.addEventListener('click', openCalendar);
+  checkoutField.addEventListener('click', openCalendar);
+
+  // Guests
+  const guestsBtn = $('[data-testid="structured-search-input-field-guests-btn"]');
+  const panel = $('[data-testid="GuestPicker-panel"]');
+  const adultsValue = $('[data-testid="stepper-adults-value"]');
+
+  const closeGuests = () => { panel.hidden = true; };
+  const renderGuests = () => {
+    adultsValue.textContent = String(state.adults);
+    guestsBtn.querySelector('div').textContent =
+      state.adults ? `${state.adults} guest${state.adults > 1 ? 's' : ''}` : 'Add guests';
+  };
+
+  guestsBtn.addEventListener('click', () => { closeCalendar(); panel.hidden = false; });
+  $('[data-testid="stepper-adults-increase-button"]').addEventListener('click', () => {
+    state.adults = Math.min(16, state.adults + 1);
+    renderGuests();
+  });
+  $('[data-testid="stepper-adults-decrease-button"]').addEventListener('click', () => {
+    state.adults = Math.max(0, state.adults - 1);
+    renderGuests();
+  });
+  renderGuests();
+
+  document.addEventListener('keydown', (e) => {
+    if (e.key === 'Escape') { closeCalendar(); closeGuests(); closeSuggestions(); }
+  });
+
+  // Search
+  $('[data-testid="structured-search-input-search-button"]').addEventListener('click', () => {
+    const query = state.query || input.value.trim() || 'Anywhere';
+    const params = new URLSearchParams();
+    if (state.checkin) params.set('checkin', iso(state.checkin));
+    if (state.checkout) params.set('checkout', iso(state.checkout));
+    if (state.adults) params.set('adults', String(state.adults));
+    params.set('query', query);
+    const slug = query.replace(/,\s*/g, '--').replace(/\s+/g, '-');
+    window.location.href = `/s/${encodeURIComponent(slug)}/homes?${params}`;
+  });
+})();
@@ -0,0 +1,204 @@
+"""A local stand-in for the Airbnb pages the steps drive.
+
+Serves a landing page with the search bar (autocomplete, calendar, guest stepper),
+paginated search results and room pages, all with Airbnb's data-testids, so flows
+can be run and timed without the network. Pure stdlib: no Django needed.
+"""
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlparse
+
+PAGES_DIR = Path(__file__).parent / 'pages'
+
+PAGE_SIZE = 18
+TOTAL_LISTINGS = 90
+
+COUNTRIES = {
+    "London": "United Kingdom", "Paris": "France", "Tokyo": "Japan", "New York": "United States",
+    "Barcelona": "Spain", "Sydney": "Australia", "Dubai": "United Arab Emirates",
+    "Amsterdam": "Netherlands", "Rome": "Italy", "Bangkok": "Thailand",
+}
+
+KINDS = ("Apartment", "Loft", "Home", "Condo", "Guest suite", "Townhouse", "Cottage")
+AREAS = ("Old Town", "City Centre", "Riverside", "Harbour", "Market District", "University Quarter")
+
+IMAGE_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="320" height="320">'
+    '<rect width="320" height="320" fill="hsl({hue},45%,70%)"/></svg>'
+)
+
+STATIC_TYPES = {'.js': 'text/javascript', '.css': 'text/css'}
+
+
+def _template(name) -> Template:
+    return Template((PAGES_DIR / name).read_text())
+
+
+def suggestions(query: str) -> list:
+    """Autocomplete entries for `query`, shaped like Airbnb's (title + subtitle)."""
+    query = query.strip()
+    if not query:
+        return []
+    city = next((c for c in COUNTRIES if c.lower().startswith(query.lower())), query.title())
+    country = COUNTRIES.get(city, "Anywhere")
+    return [
+        {"title": f"{city}, {country}", "subtitle": "City"},
+        *({"title": f"{area}, {city}", "subtitle": "Neighbourhood"} for area in AREAS[:4]),
+    ]
+
+
+def listings(location: str) -> list:
+    """The same TOTAL_LISTINGS listings for a location on every request."""
+    rng = random.Random(location)
+    city = location.split(',')[0].strip() or "Anywhere"
+    return [
+        {
+            "room_id": rng.randint(10**7, 10**9),
+            "title": f"{rng.choice(KINDS)} in {rng.choice(AREAS)}, {city}",
+            "subtitle": f"{rng.randint(1, 4)} beds · ★ {rng.uniform(4.2, 5.0):.2f}",
+            "price": f"${rng.randint(45, 480)}",
+        }
+        for _ in range(TOTAL_LISTINGS)
+    ]
+
+
+def _short_date(value):
+    try:
+        year, month, day = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    months = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+    return f"{months[month - 1]} {day}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "AirbnbStandIn/1.0"
+
+    def log_message(self, format, *args):
+        pass  # one line per request drowns the step output
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path
+
+        if path == '/':
+            return self._html(_template('landing.html').substitute(search_bar=self._search_bar(hidden=False)))
+        if path == '/api/autocomplete':
+            return self._send(200, 'application/json', json.dumps(suggestions(params.get('q', ''))))
+        if path.startswith('/s/') and path.endswith('/homes'):
+            return self._html(self._results(unquote(path[3:-6]), params))
+        if path.startswith('/rooms/'):
+            return self._room(path[len('/rooms/'):])
+        if path.startswith('/img/'):
+            hue = sum(map(ord, path)) % 360
+            return self._send(200, 'image/svg+xml', IMAGE_SVG.format(hue=hue))
+        if path.startswith('/static/'):
+            return self._static(path[len('/static/'):])
+        self._send(404, 'text/plain', 'Not found')
+
+    def do_POST(self):
+        # Tracking beacons: accept and drop
+        self._send(204, 'text/plain', '')
+
+    def _search_bar(self, hidden):
+        return _template('search_bar.html').substitute(hidden=' hidden' if hidden else '')
+
+    def _results(self, slug, params):
+        location = params.get('query') or slug.replace('--', ', ').replace('-', ' ')
+        items = listings(location)
+        try:
+            offset = max(0, int(params.get('items_offset', 0)))
+        except ValueError:
+            offset = 0
+
+        card = _template('card.html')
+        cards = ''.join(card.substitute(item) for item in items[offset:offset + PAGE_SIZE])
+
+        links = []
+        for page_offset in range(0, len(items), PAGE_SIZE):
+            number = page_offset // PAGE_SIZE + 1
+            if page_offset == offset:
+                links.append(f'    <button type="button" aria-current="page">{number}</button>')
+            else:
+                href = '?' + urlencode({**params, 'items_offset': page_offset})
+                links.append(f'    <a href="{href}" aria-label="Page {number}">{number}</a>')
+        if offset + PAGE_SIZE < len(items):
+            href = '?' + urlencode({**params, 'items_offset': offset + PAGE_SIZE})
+            links.append(f'    <a href="{href}" aria-label="Next">Next</a>')
+
+        checkin, checkout = _short_date(params.get('checkin')), _short_date(params.get('checkout'))
+        adults = params.get('adults')
+        return _template('results.html').substitute(
+            location=location,
+            dates=f"{checkin} – {checkout}" if checkin and checkout else "Any week",
+            guests=f"{adults} guests" if adults else "Add guests",
+            total=len(items),
+            cards=cards,
+            pagination='\n'.join(links),
+            search_bar=self._search_bar(hidden=True),
+        )
+
+    def _room(self, room_id):
+        for location in COUNTRIES:
+            for item in listings(f"{location}, {COUNTRIES[location]}"):
+                if str(item["room_id"]) == room_id:
+                    return self._html(_template('room.html').substitute(item))
+        # Unknown id (e.g. a free-text search): still a page, like a delisted room
+        self._html(_template('room.html').substitute(room_id=quote(room_id), title="Listing", price=""))
+
+    def _static(self, name):
+        filepath = (PAGES_DIR / name).resolve()
+        if filepath.parent != PAGES_DIR.resolve() or filepath.suffix not in STATIC_TYPES or not filepath.exists():
+            return self._send(404, 'text/plain', 'Not found')
+        self._send(200, STATIC_TYPES[filepath.suffix], filepath.read_text())
+
+    def _html(self, body):
+        self._send(200, 'text/html; charset=utf-8', body)
+
+    def _send(self, status, content_type, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandInServer:
+    """Serves the stand-in on a background thread; port 0 picks a free one."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.host = host
+        self.port = port
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), StandInHandler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -1,10 +1,10 @@
 import random
 
-from playwright.sync_api import TimeoutError as PWTimeout
-
 from automation.utils.browser import BrowserSession
 from automation.utils.logger import log_result
+from automation.utils.resolver import resolve
 from automation.utils.screenshot import take_screenshot
+from automation.utils.waits import wait_for_state
 
 URL = "https://www.airbnb.com/"
 
@@ -20,10 +20,31 @@ SUGGESTION_SELECTORS = [
     'ul[role="listbox"] li',
 ]
 
+MODAL_CLOSE_SELECTORS = [
+    '[aria-label="Close"]',
+    'button[data-testid="close-button"]',
+    'button:has-text("Got it")',
+    'button:has-text("Dismiss")',
+    'button:has-text("Close")',
+]
+
+SEARCH_INPUT_SELECTORS = [
+    '[data-testid="structured-search-input-field-query"]',
+    'input[placeholder*="Search destinations"]',
+    'input[placeholder*="Where are you going"]',
+]
+
+SEARCH_OPENER_SELECTORS = [
+    '[data-testid="little-search"]',
+    '[data-testid="little-search-query"]',
+    '[data-testid="structured-search-input-field-query"]',
+    'button[aria-label*="Search"]',
+]
+
 
 def _log(session, name, comment, screenshot_name, force_fail=False):
-    # take_screenshot(session.page, screenshot_name)
     passed = session.passed() and not force_fail
+    # take_screenshot(session, screenshot_name, passed)
     if not session.passed():
         comment += f" | Errors: {session.error_summary()}"
     log_result(name, session.page.url, passed, comment)
@@ -39,46 +60,38 @@ def _clean(text):
 def _dismiss_modal(session):
     page = session.page
     dismissed = False
-    for sel in [
-        '[aria-label="Close"]',
-        'button[data-testid="close-button"]',
-        'button:has-text("Got it")',
-        'button:has-text("Dismiss")',
-        'button:has-text("Close")',
-    ]:
+    btn, sel = resolve(page, "modal_close", MODAL_CLOSE_SELECTORS, timeout=2000)
+    if btn:
         try:
-            btn = page.locator(sel).first
-            if btn.is_visible(timeout=2000):
-                btn.click()
-                page.wait_for_timeout(800)
-                dismissed = True
-                break
+            btn.click()
+            wait_for_state(page, sel, 'hidden', timeout=2000)
+            dismissed = True
         except Exception:
-            continue
+            pass
     _log(session, "Close modal / pop-up on landing",
          "Modal detected and closed." if dismissed else "No modal appeared.",
          "close_modal")
 
 
-def _type_and_select_suggestion(page, city):
+def _open_search(page):
+    """Click whatever opens the location search input."""
+    el, _ = resolve(page, "search_opener", SEARCH_OPENER_SELECTORS, timeout=2000)
+    if el:
+        try:
+            el.click()
+            wait_for_state(page, SEARCH_INPUT_SELECTORS[0], 'visible', timeout=3000)
+        except Exception:
+            pass
+
+
+def _type_and_select_suggestion(page, city, pick=None):
     """
     Type city, wait for dropdown, pick a random suggestion,
     click it using bounding box coordinates, return results.
+    With `pick`, click the suggestion with that text (else the first) instead.
     """
     # Find search input
-    search_input = None
-    for sel in [
-        '[data-testid="structured-search-input-field-query"]',
-        'input[placeholder*="Search destinations"]',
-        'input[placeholder*="Where are you going"]',
-    ]:
-        try:
-            el = page.locator(sel).first
-            if el.is_visible(timeout=2000):
-                search_input = el
-                break
-        except Exception:
-            continue
+    search_input, _ = resolve(page, "search_input", SEARCH_INPUT_SELECTORS, timeout=2000)
 
     if not search_input:
         return [], None, False
@@ -89,19 +102,8 @@ def _type_and_select_suggestion(page, city):
     for ch in city:
         search_input.type(ch, delay=random.randint(100, 200))
 
-    # Wait for dropdown
-    dropdown_sel = None
-    for _ in range(10):
-        page.wait_for_timeout(300)
-        for sel in SUGGESTION_SELECTORS:
-            try:
-                if page.locator(sel).count() > 0 and page.locator(sel).first.is_visible(timeout=300):
-                    dropdown_sel = sel
-                    break
-            except Exception:
-                continue
-        if dropdown_sel:
-            break
+    # Wait for dropdown and note which selector it matched
+    _, dropdown_sel = resolve(page, "suggestions", SUGGESTION_SELECTORS, timeout=3000)
 
     if not dropdown_sel:
         return [], None, False
@@ -127,7 +129,10 @@ def _type_and_select_suggestion(page, city):
         return [], None, False
 
     # Pick a random suggestion
-    idx = random.randint(0, len(suggestions) - 1)
+    if pick is not None:
+        idx = suggestions.index(pick) if pick in suggestions else 0
+    else:
+        idx = random.randint(0, len(suggestions) - 1)
     chosen = suggestions[idx]
     print(f"  → Clicking suggestion {idx+1}: '{chosen}'")
 
@@ -141,59 +146,50 @@ def _type_and_select_suggestion(page, city):
     cx = box["x"] + box["width"] / 2
     cy = box["y"] + box["height"] / 2
     page.mouse.click(cx, cy)
-    page.wait_for_timeout(2500)
+    # The list closes once the suggestion is applied
+    wait_for_state(page, dropdown_sel, 'hidden', timeout=5000)
     print(f"  ✓ Clicked at ({cx:.0f}, {cy:.0f})")
 
     return suggestions, chosen, True
 
 
-def run(session):
+def run(session, city=None):
     page = session.page
     print("\n🚀 STEP 01 — Website Landing & Initial Search Setup")
     print("=" * 55)
 
     # 1. Load homepage
     print("\n[1] Loading Airbnb homepage...")
-    page.goto(URL, wait_until="domcontentloaded", timeout=60_000)
-    page.evaluate("localStorage.clear(); sessionStorage.clear();")
-    page.wait_for_timeout(2000)
+    page.goto(session.base_url or URL, wait_until="domcontentloaded", timeout=60_000)
+    if not session.warm:
+        page.evaluate("localStorage.clear(); sessionStorage.clear();")
+    wait_for_state(page, "header", 'visible', timeout=10_000)
     _log(session, "Homepage load", "Airbnb homepage loaded successfully.", "homepage_load")
 
     # 2. Dismiss modal
     print("\n[2] Checking for modals...")
-    _dismiss_modal(session)
+    if session.warm:
+        print("  Skipped: warm start, the saved state already has the modal dismissed.")
+    else:
+        _dismiss_modal(session)
 
     # 3. Verify homepage
     print("\n[3] Verifying homepage...")
-    try:
-        page.wait_for_selector("header", timeout=10_000)
-        ok = True
-    except PWTimeout:
-        ok = False
+    ok = wait_for_state(page, "header", 'visible', timeout=10_000)
     _log(session, "Verify homepage content",
          "Header confirmed visible." if ok else "Header not found.",
          "homepage_verify", force_fail=not ok)
+    if ok:
+        # Only a landing that passed becomes the state later warm runs start from
+        session.save_storage_state()
 
     # 4. Click search field opener
     print("\n[4] Clicking search field...")
-    for sel in [
-        '[data-testid="little-search"]',
-        '[data-testid="little-search-query"]',
-        '[data-testid="structured-search-input-field-query"]',
-        'button[aria-label*="Search"]',
-    ]:
-        try:
-            el = page.locator(sel).first
-            if el.is_visible(timeout=2000):
-                el.click()
-                page.wait_for_timeout(800)
-                break
-        except Exception:
-            continue
+    _open_search(page)
     _log(session, "Click search field", "Search field clicked and opened.", "search_field_click")
 
     # 5-9. Type city, capture suggestions, click one — all atomically
-    city = random.choice(CITIES)
+    city = city or random.choice(CITIES)
     print(f"\n[5] Typing city: '{city}'")
 
     suggestions, chosen_text, click_ok = _type_and_select_suggestion(page, city)
@@ -223,4 +219,13 @@ def run(session):
          "suggestion_selected", force_fail=not click_ok)
 
     print("\n✅ Step 01 complete!")
-    return city, chosen_text, suggestions
\ No newline at end of file
+    return city, chosen_text, suggestions
+
+
+def reselect(session, chosen_text):
+    """Put step 1's location back in the search bar of a restored homepage, so a
+    resumed step 3 finds the date picker it opens. True if the suggestion was clicked."""
+    print(f"\n↩️  Re-selecting '{chosen_text}' from the checkpoint...")
+    _open_search(session.page)
+    _, _, ok = _type_and_select_suggestion(session.page, chosen_text, pick=chosen_text)
+    return ok
@@ -3,12 +3,42 @@ from datetime import datetime
 
 from automation.utils.browser import BrowserSession
 from automation.utils.logger import log_result
+from automation.utils.resolver import remember, resolve
 from automation.utils.screenshot import take_screenshot
+from automation.utils.waits import read_text, wait_for_network_idle, wait_for_text_change
+
+MONTH_HEADING = 'h2[aria-live], [data-testid="calendar-month-and-year"]'
+CHECKIN_FIELD = '[data-testid="structured-search-input-field-split-dates-0"]'
+CHECKOUT_FIELD = '[data-testid="structured-search-input-field-split-dates-1"]'
+
+CALENDAR_DAY_SELECTORS = [
+    '[data-testid="calendar-day"]',
+    'button[aria-label*="202"]',
+    'button[aria-label*="203"]',
+]
+
+DATE_FIELD_SELECTORS = [
+    CHECKIN_FIELD,
+    '[data-testid="structured-search-input-field-dates-0"]',
+    '[data-testid="structured-search-input-field-dates"]',
+    'button:has-text("Add dates")',
+    'button:has-text("Check in")',
+    '[aria-label*="Check in"]',
+    '[data-testid*="date"]',
+    '[data-testid*="check"]',
+]
+
+NEXT_MONTH_SELECTORS = [
+    '[aria-label="Move forward to switch to the next month"]',
+    '[data-testid="calendar-next-month"]',
+    '[aria-label="Next month"]',
+    'button[aria-label*="next" i]',
+]
 
 
 def _log(session, name, comment, screenshot_name, force_fail=False):
-    # take_screenshot(session.page, screenshot_name)
     passed = session.passed() and not force_fail
+    # take_screenshot(session, screenshot_name, passed)
     if not session.passed():
         comment += f" | Errors: {session.error_summary()}"
     log_result(name, session.page.url, passed, comment)
@@ -64,15 +94,9 @@ def _get_days(page):
     return []
 
 
-def _is_calendar_open(page):
-    for sel in ['[data-testid="calendar-day"]', 'button[aria-label*="202"]',
-                'button[aria-label*="203"]']:
-        try:
-            if page.locator(sel).first.is_visible(timeout=1500):
-                return True
-        except Exception:
-            continue
-    return False
+def _is_calendar_open(page, timeout=1500):
+    el, _ = resolve(page, "calendar_day", CALENDAR_DAY_SELECTORS, timeout=timeout)
+    return el is not None
 
 
 def run(session, chosen_text):
@@ -82,11 +106,10 @@ def run(session, chosen_text):
 
     # 1. Open date picker
     print("\n[1] Opening date picker...")
-    page.wait_for_timeout(2000)
-
     print(f"  Current URL: {page.url}")
 
-    is_open = _is_calendar_open(page)
+    # Selecting a suggestion usually opens the calendar by itself
+    is_open = _is_calendar_open(page, timeout=3000)
     print(f"  Calendar already open: {is_open}")
 
     if not is_open:
@@ -98,31 +121,20 @@ def run(session, chosen_text):
             if btn.is_visible(timeout=2000):
                 print(f"  → Clicking search button")
                 btn.click()
-                page.wait_for_timeout(2000)
+                wait_for_network_idle(page, timeout=5000)
         except Exception:
             pass
 
-        # Step 2: now look for date fields
-        for sel in [
-            '[data-testid="structured-search-input-field-split-dates-0"]',
-            '[data-testid="structured-search-input-field-dates-0"]',
-            '[data-testid="structured-search-input-field-dates"]',
-            'button:has-text("Add dates")',
-            'button:has-text("Check in")',
-            '[aria-label*="Check in"]',
-            '[data-testid*="date"]',
-            '[data-testid*="check"]',
-        ]:
+        # Step 2: now look for the date field
+        el, sel = resolve(page, "date_field", DATE_FIELD_SELECTORS, timeout=2000, record=False)
+        if el:
             try:
-                el = page.locator(sel).first
-                if el.is_visible(timeout=2000):
-                    print(f"  → Clicking date field: {sel}")
-                    el.click()
-                    page.wait_for_timeout(2000)
-                    if _is_calendar_open(page):
-                        break
+                print(f"  → Clicking date field: {sel}")
+                el.click()
+                if _is_calendar_open(page, timeout=3000):
+                    remember("date_field", sel)
             except Exception:
-                continue
+                pass
 
     is_open = _is_calendar_open(page)
     # Debug visible testids if still not open
@@ -133,7 +145,6 @@ def run(session, chosen_text):
         except Exception:
             pass
 
-    is_open = _is_calendar_open(page)
     _log(session, "Date picker modal opens",
          f"Date picker opened after selecting '{chosen_text}'."
          if is_open else f"Date picker did not open after selecting '{chosen_text}'.",
@@ -146,20 +157,16 @@ def run(session, chosen_text):
     num_clicks = random.randint(3, 8)
     print(f"\n[2] Navigating {num_clicks} months forward...")
     clicked_count = 0
-    for sel in ['[aria-label="Move forward to switch to the next month"]',
-                '[data-testid="calendar-next-month"]',
-                '[aria-label="Next month"]',
-                'button[aria-label*="next" i]']:
+    btn, _ = resolve(page, "next_month", NEXT_MONTH_SELECTORS, timeout=2000)
+    if btn:
         try:
-            btn = page.locator(sel).first
-            if btn.is_visible(timeout=2000):
-                for _ in range(num_clicks):
-                    btn.click()
-                    page.wait_for_timeout(500)
-                    clicked_count += 1
-                break
+            for _ in range(num_clicks):
+                before = read_text(page, MONTH_HEADING)
+                btn.click()
+                wait_for_text_change(page, MONTH_HEADING, before, timeout=2000)
+                clicked_count += 1
         except Exception:
-            continue
+            pass
 
     current_month = _get_month(page)
     print(f"  📅 Now viewing: {current_month}")
@@ -169,7 +176,6 @@ def run(session, chosen_text):
 
     # 3. Select check-in
     print("\n[3] Selecting check-in date...")
-    page.wait_for_timeout(500)
     days = _get_days(page)
     if not days:
         _log(session, "Select check-in date", "No days found in calendar.",
@@ -182,8 +188,9 @@ def run(session, chosen_text):
     checkin_date = _parse_date(checkin_el)
     checkin_label = checkin_el.get_attribute('aria-label') or checkin_el.inner_text().strip()
     print(f"  → Check-in: '{checkin_label}'")
+    before = read_text(page, CHECKIN_FIELD)
     checkin_el.click()
-    page.wait_for_timeout(1000)
+    wait_for_text_change(page, CHECKIN_FIELD, before, timeout=2000)
     _log(session, "Select check-in date",
          f"Check-in selected: '{checkin_label}'"
          f"{' (' + checkin_date.strftime('%b %d, %Y') + ')' if checkin_date else ''}.",
@@ -191,7 +198,6 @@ def run(session, chosen_text):
 
     # 4. Select check-out
     print("\n[4] Selecting check-out date...")
-    page.wait_for_timeout(500)
     days = _get_days(page)
 
     checkout_el = None
@@ -225,8 +231,9 @@ def run(session, chosen_text):
 
     checkout_label = checkout_el.get_attribute('aria-label') or checkout_el.inner_text().strip()
     print(f"  → Check-out: '{checkout_label}'")
+    before = read_text(page, CHECKOUT_FIELD)
     checkout_el.click()
-    page.wait_for_timeout(1000)
+    wait_for_text_change(page, CHECKOUT_FIELD, before, timeout=2000)
     _log(session, "Select check-out date",
          f"Check-out selected: '{checkout_label}'"
          f"{' (' + checkout_date.strftime('%b %d, %Y') + ')' if checkout_date else ''}.",
@@ -234,10 +241,9 @@ def run(session, chosen_text):
 
     # 5. Confirm dates in fields
     print("\n[5] Confirming dates in input fields...")
-    page.wait_for_timeout(800)
     confirmed = []
-    for sel in ['[data-testid="structured-search-input-field-split-dates-0"]',
-                '[data-testid="structured-search-input-field-split-dates-1"]',
+    for sel in [CHECKIN_FIELD,
+                CHECKOUT_FIELD,
                 '[data-testid="structured-search-input-field-dates-0"]',
                 '[data-testid="structured-search-input-field-dates-1"]']:
         try:
@@ -1,12 +1,53 @@
 import random
 
 from automation.utils.logger import log_result
+from automation.utils.resolver import remember, resolve
 from automation.utils.screenshot import take_screenshot
+from automation.utils.waits import (
+    CALENDAR_DAY, read_text, wait_for_navigation, wait_for_state, wait_for_text_change, wait_for_url_param,
+)
+
+ADULTS_VALUE = '[data-testid="stepper-adults-value"]'
+ADULTS_PLUS = '[data-testid="stepper-adults-increase-button"]'
+GUESTS_BTN = '[data-testid="structured-search-input-field-guests-btn"]'
+
+SEARCH_BAR_SELECTORS = [
+    '[data-testid="little-search"]',
+    '[data-testid="little-search-icon"]',
+    '[data-testid="little-search-query"]',
+]
+
+GUESTS_BTN_SELECTORS = [
+    GUESTS_BTN,
+    '[data-testid="structured-search-input-field-guests"]',
+    '[data-testid="little-search-guests"]',
+    '[data-testid="little-search-anon-guest-display"]',
+    'button[aria-label*="guest" i]',
+    'button[aria-label*="Who" i]',
+    'button:has-text("Add guests")',
+    'button:has-text("Who")',
+    '[data-testid*="guest"]',
+]
+
+ADULTS_PLUS_SELECTORS = [
+    ADULTS_PLUS,
+    'button[aria-label*="increase adults" i]',
+    'button[aria-label*="add adult" i]',
+]
+
+GUEST_POPUP_SELECTORS = ADULTS_PLUS_SELECTORS + ['[data-testid="GuestPicker-panel"]']
+
+SEARCH_BTN_SELECTORS = [
+    '[data-testid="structured-search-input-search-button"]',
+    'button[aria-label*="Search" i]',
+    'button[type="submit"]',
+    'button:has-text("Search")',
+]
 
 
 def _log(session, name, comment, screenshot_name, force_fail=False):
-    take_screenshot(session.page, screenshot_name)
     passed = session.passed() and not force_fail
+    take_screenshot(session, screenshot_name, passed)
     if not session.passed():
         comment += f" | Errors: {session.error_summary()}"
     log_result(name, session.page.url, passed, comment)
@@ -18,8 +59,9 @@ def _click_plus(page, btn, times):
     clicked = 0
     for _ in range(times):
         try:
+            before = read_text(page, ADULTS_VALUE)
             btn.click()
-            page.wait_for_timeout(400)
+            wait_for_text_change(page, ADULTS_VALUE, before, timeout=2000)
             clicked += 1
         except Exception:
             break
@@ -39,61 +81,38 @@ def _get_count(page, sel):
 
 def _expand_search_bar(page):
     """On results page, the search bar is collapsed — click it to expand."""
-    for sel in [
-        '[data-testid="little-search"]',
-        '[data-testid="little-search-icon"]',
-        '[data-testid="little-search-query"]',
-    ]:
-        try:
-            el = page.locator(sel).first
-            if el.is_visible(timeout=1500):
-                el.click()
-                page.wait_for_timeout(1500)
-                print(f"  ✓ Expanded search bar via: {sel}")
-                return True
-        except Exception:
-            continue
-    return False
+    el, sel = resolve(page, "search_bar", SEARCH_BAR_SELECTORS, timeout=1500, record=False)
+    if not el:
+        return False
+    try:
+        el.click()
+    except Exception:
+        return False
+    if wait_for_state(page, GUESTS_BTN, 'visible', timeout=3000):
+        remember("search_bar", sel)
+    print(f"  ✓ Expanded search bar via: {sel}")
+    return True
 
 
 def _find_guests_btn(page):
     """Find and click the guests button in the expanded search bar."""
-    for sel in [
-        '[data-testid="structured-search-input-field-guests-btn"]',
-        '[data-testid="structured-search-input-field-guests"]',
-        '[data-testid="little-search-guests"]',
-        '[data-testid="little-search-anon-guest-display"]',
-        'button[aria-label*="guest" i]',
-        'button[aria-label*="Who" i]',
-        'button:has-text("Add guests")',
-        'button:has-text("Who")',
-        '[data-testid*="guest"]',
-    ]:
-        try:
-            el = page.locator(sel).first
-            if el.is_visible(timeout=1500):
-                el.click()
-                page.wait_for_timeout(1200)
-                print(f"  ✓ Clicked guests btn: {sel}")
-                return True
-        except Exception:
-            continue
-    return False
+    el, sel = resolve(page, "guests_btn", GUESTS_BTN_SELECTORS, timeout=1500, record=False)
+    if not el:
+        return False
+    try:
+        el.click()
+    except Exception:
+        return False
+    # Only a click that actually opened the stepper counts as a win
+    if wait_for_state(page, ADULTS_PLUS, 'visible', timeout=3000):
+        remember("guests_btn", sel)
+    print(f"  ✓ Clicked guests btn: {sel}")
+    return True
 
 
 def _popup_is_open(page):
-    for sel in [
-        '[data-testid="stepper-adults-increase-button"]',
-        'button[aria-label*="increase adults" i]',
-        'button[aria-label*="add adult" i]',
-        '[data-testid="GuestPicker-panel"]',
-    ]:
-        try:
-            if page.locator(sel).first.is_visible(timeout=1500):
-                return True
-        except Exception:
-            continue
-    return False
+    el, _ = resolve(page, "guest_popup", GUEST_POPUP_SELECTORS, timeout=1500)
+    return el is not None
 
 
 def run(session, chosen_text, date_info):
@@ -103,7 +122,7 @@ def run(session, chosen_text, date_info):
 
     print(f"  Current URL: {page.url}")
     page.keyboard.press("Escape")
-    page.wait_for_timeout(800)
+    wait_for_state(page, CALENDAR_DAY, 'hidden', timeout=2000)
 
     # 1. Click the guests field
     # Strategy: on results page the search bar is collapsed, expand it first
@@ -151,24 +170,13 @@ def run(session, chosen_text, date_info):
     target_guests = random.randint(2, 5)
     print(f"\n[3] Selecting {target_guests} guests...")
 
-    adults_plus = None
-    for sel in [
-        '[data-testid="stepper-adults-increase-button"]',
-        'button[aria-label*="increase adults" i]',
-        'button[aria-label*="add adult" i]',
-    ]:
-        try:
-            el = page.locator(sel).first
-            if el.is_visible(timeout=1500):
-                adults_plus = el
-                print(f"  ✓ + button: {sel}")
-                break
-        except Exception:
-            continue
+    adults_plus, sel = resolve(page, "adults_plus", ADULTS_PLUS_SELECTORS, timeout=1500)
+    if adults_plus:
+        print(f"  ✓ + button: {sel}")
 
     actual_guests = 0
     if adults_plus:
-        current = _get_count(page, '[data-testid="stepper-adults-value"]') or 1
+        current = _get_count(page, ADULTS_VALUE) or 1
         clicks = max(0, target_guests - current)
         print(f"  Current: {current}, clicking + {clicks}x")
         done = _click_plus(page, adults_plus, clicks)
@@ -184,10 +192,9 @@ def run(session, chosen_text, date_info):
 
     # 4. Verify count shown in field
     print("\n[4] Verifying guest count in field...")
-    page.wait_for_timeout(500)
     displayed = None
     for sel in [
-        '[data-testid="structured-search-input-field-guests-btn"]',
+        GUESTS_BTN,
         '[data-testid="little-search-guests"]',
         '[data-testid="little-search-anon-guest-display"]',
         '[data-testid*="guest"]',
@@ -218,23 +225,19 @@ def run(session, chosen_text, date_info):
     # 6. Click Search
     print("\n[6] Clicking Search button...")
     search_clicked = False
-    for sel in [
-        '[data-testid="structured-search-input-search-button"]',
-        'button[aria-label*="Search" i]',
-        'button[type="submit"]',
-        'button:has-text("Search")',
-    ]:
+    el, sel = resolve(page, "search_btn", SEARCH_BTN_SELECTORS, timeout=2000)
+    if el:
         try:
-            el = page.locator(sel).first
-            if el.is_visible(timeout=2000):
-                print(f"  → {sel}")
-                el.click()
-                page.wait_for_timeout(3000)
-                search_clicked = True
-                print(f"  ✓ URL: {page.url}")
-                break
+            print(f"  → {sel}")
+            old_url = page.url
+            el.click()
+            wait_for_navigation(page, old_url, timeout=15_000)
+            # The results page can land before its URL has the guest count
+            wait_for_url_param(page, "adults", timeout=5000)
+            search_clicked = True
+            print(f"  ✓ URL: {page.url}")
         except Exception:
-            continue
+            pass
 
     _log(session, "Click Search button",
          f"Search submitted. URL: {page.url}" if search_clicked else "Search button not found.",
@@ -1,14 +1,91 @@
 import re
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import quote, urlencode, urljoin, urlparse, parse_qs
 
+from automation.steps.step01_landing import URL
 from automation.utils.logger import log_result
+from automation.utils.price import price_fields
 from automation.utils.screenshot import take_screenshot
+from automation.utils.resolver import resolve
+from automation.utils.waits import (
+    read_text, wait_for_count_above, wait_for_navigation, wait_for_network_idle, wait_for_text_change,
+)
+from automation.utils.writer import flush_current, save_listings
 from automation.models import Listing
 
+LISTING_ID_RE = re.compile(r'/rooms/(\d+)')
+
+RESULTS_SELECTORS = [
+    '[data-testid="card-container"]',
+    '[data-testid="listing-card-title"]',
+    '[data-testid="explore-section-wrapper"]',
+    '[data-testid="listing-tile"]',
+    'div[itemprop="itemListElement"]',
+]
+
+CARD_SELECTOR = '[data-testid="card-container"], [data-testid="listing-tile"]'
+CARD_TITLE = '[data-testid="listing-card-title"]'
+
+SEARCH_BAR_TEXT_SELECTORS = [
+    '[data-testid="little-search"]',
+    '[data-testid="little-search-query"]',
+    '[data-testid="structured-search-input-field-query"]',
+]
+
+NEXT_PAGE_SELECTORS = [
+    'a[aria-label="Next"]',
+    'nav[aria-label*="pagination" i] a[aria-label*="next" i]',
+    'button[aria-label="Next"]',
+]
+
+# Runs inside the page: reads every card in one round trip and returns plain JSON.
+# Mirrors the old per-card selector fallbacks (Playwright's :has-text becomes a
+# scan of spans for a currency symbol). `offset` skips cards already read when
+# infinite scroll appends to the same page.
+EXTRACT_LISTINGS_JS = r"""({limit, offset}) => {
+    let cards = document.querySelectorAll('[data-testid="card-container"]');
+    if (!cards.length) cards = document.querySelectorAll('[data-testid="listing-tile"]');
+
+    const text = (el) => (el && (el.innerText || el.textContent) || '').trim();
+    const firstText = (card, selectors, ok) => {
+        for (const sel of selectors) {
+            const t = text(card.querySelector(sel));
+            if (ok(t)) return t;
+        }
+        return null;
+    };
+    const hasDigit = (t) => /\d/.test(t);
+
+    const listings = [];
+    for (const card of Array.from(cards).slice(offset, offset + limit)) {
+        const title = firstText(card,
+            ['[data-testid="listing-card-title"]', 'div[data-testid*="title"]', '[aria-label]', 'h3', 'h2'],
+            (t) => t.length > 3);
+        if (!title) continue;
+
+        let price = firstText(card,
+            ['[data-testid="price-availability-row"]', 'span[data-testid*="price"]'], hasDigit);
+        if (!price) {
+            const span = Array.from(card.querySelectorAll('span'))
+                .find((s) => /[$£€]/.test(text(s)) && hasDigit(text(s)));
+            price = span ? text(span) : firstText(card, ['[class*="price"]'], hasDigit);
+        }
+
+        const img = card.querySelector('img');
+        const link = card.querySelector('a[href*="/rooms/"]') || card.querySelector('a[href]');
+        listings.push({
+            title: title,
+            price: price ? price.split('\n')[0].trim() : 'N/A',
+            img_url: img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '',
+            listing_url: link ? link.href : '',
+        });
+    }
+    return {cards: cards.length, listings: listings};
+}"""
+
 
 def _log(session, name, comment, screenshot_name, force_fail=False):
-    take_screenshot(session.page, screenshot_name)
     passed = session.passed() and not force_fail
+    take_screenshot(session, screenshot_name, passed)
     if not session.passed():
         comment += f" | Errors: {session.error_summary()}"
     log_result(name, session.page.url, passed, comment)
@@ -30,6 +107,144 @@ def _parse_url_params(url):
         return {}
 
 
+def _ui_checks(page_text, date_info, guest_info):
+    """Which of the search's check-in date and guest count show up in the page text."""
+    checks = []
+    checkin = date_info.get("checkin", "") if date_info else ""
+    guests = str(guest_info.get("guests", "")) if guest_info else ""
+    # Dates may appear as "Feb 1 - Feb 5" or "Feb 1–5" etc.
+    if checkin:
+        # Try matching month abbreviation from the date
+        month_match = re.search(r'(\w{3})\s+\d+', checkin)
+        if month_match and month_match.group(0).lower() in page_text.lower():
+            checks.append("check-in date visible")
+    if guests and guests in page_text:
+        checks.append(f"guest count ({guests}) visible")
+    return checks
+
+
+def _location_shown(text, chosen_text):
+    """Whether the search bar text names the chosen location."""
+    return bool(chosen_text) and chosen_text.split(",")[0].lower() in text.lower()
+
+
+def _url_checks(url_params):
+    """"name=value" for each search parameter the results URL carries."""
+    return [f"{k}={url_params[k]}" for k in ("checkin", "checkout", "adults") if url_params.get(k)]
+
+
+def _fresh(listings, seen, limit=None):
+    """Up to `limit` listings whose link isn't in `seen` yet (pages can repeat cards); adds theirs to it."""
+    fresh = []
+    for item in listings:
+        if limit is not None and len(fresh) >= limit:
+            break
+        if not item["listing_url"] or item["listing_url"] not in seen:
+            fresh.append(item)
+            seen.add(item["listing_url"])
+    return fresh
+
+
+def _print_page(number, listings, found):
+    """Print a results page's listings, numbered after the `found` before them."""
+    print(f"  Page {number}: {len(listings)} listings")
+    for i, item in enumerate(listings, found + 1):
+        print(f"  [{i}] {item['title'][:50]} | {item['price']}")
+
+
+def build_search_url(city, checkin=None, checkout=None, adults=None, base_url=URL):
+    """Results URL for a search, the reverse of _parse_url_params.
+
+    "Paris, France" -> /s/Paris--France/homes?checkin=...&checkout=...&adults=...&query=Paris, France
+    """
+    slug = re.sub(r'\s+', '-', re.sub(r',\s*', '--', city.strip()))
+    params = {"checkin": checkin, "checkout": checkout, "adults": adults, "query": city}
+    query = urlencode({k: v for k, v in params.items() if v})
+    return urljoin(base_url, f"/s/{quote(slug)}/homes?{query}")
+
+
+def listing_id(url):
+    """Airbnb's room id from a listing link (/rooms/<id>), or None."""
+    match = LISTING_ID_RE.search(url or "")
+    return match.group(1) if match else None
+
+
+def _listing_rows(listings, search_url, chosen_text, url_params, date_info, guest_info):
+    """Unsaved Listing objects for the scraped items, ready for bulk upsert."""
+    return [
+        Listing(
+            listing_id=listing_id(item["listing_url"]),
+            title=item["title"][:500],
+            price=item["price"][:100],
+            **price_fields(item["price"]),
+            img_url=item["img_url"][:1000],
+            listing_url=item["listing_url"][:1000],
+            search_url=search_url[:1000],
+            location=chosen_text or "",
+            checkin=url_params.get("checkin") or (date_info.get("checkin") if date_info else ""),
+            checkout=url_params.get("checkout") or (date_info.get("checkout") if date_info else ""),
+            guests=guest_info.get("guests", 0) if guest_info else 0,
+        )
+        for item in listings
+    ]
+
+
+def _extract_listings(page, limit=20, offset=0):
+    """Scrape title, price, image and link of up to `limit` cards in a single evaluate call."""
+    try:
+        data = page.evaluate(EXTRACT_LISTINGS_JS, {"limit": limit, "offset": offset})
+    except Exception as e:
+        print(f"  ⚠ Listing extraction failed: {e}")
+        return 0, []
+    return data["cards"], data["listings"]
+
+
+def _next_page(page, cards):
+    """Move to more results: offset to read from next, or None when there are no more.
+
+    Follows the pagination "Next" link (offset 0 on the new page); without one,
+    scrolls to the bottom in case the list grows in place (offset = cards read).
+    """
+    link, _ = resolve(page, "next_page", NEXT_PAGE_SELECTORS, timeout=1500)
+    if link:
+        before, old_url = read_text(page, CARD_TITLE), page.url
+        link.click()
+        moved = wait_for_navigation(page, old_url, timeout=15_000)
+        changed = wait_for_text_change(page, CARD_TITLE, before, timeout=10_000)
+        return 0 if moved or changed else None
+    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    if wait_for_count_above(page, CARD_SELECTOR, cards, timeout=5000):
+        return cards
+    return None
+
+
+def iter_result_pages(page, max_pages=1, max_listings=20):
+    """Yield (page_number, url, listings) for each results page as soon as it is parsed;
+    listings already yielded (by link) are left out.
+
+    Stops after `max_pages` pages or `max_listings` listings (0/None: no limit), or
+    when there is no next page and scrolling loads nothing new. Only the current
+    page's listings and the links seen so far are held, so memory stays small
+    however far it goes.
+    """
+    number = taken = offset = 0
+    seen = set()
+    while True:
+        number += 1
+        # Card prices/images fill in after the first cards render
+        wait_for_network_idle(page, timeout=3000)
+        # Read every card, then cap: repeats don't count toward max_listings
+        cards, listings = _extract_listings(page, 10_000, offset)
+        listings = _fresh(listings, seen, max_listings - taken if max_listings else None)
+        taken += len(listings)
+        yield number, page.url, listings
+        if (max_pages and number >= max_pages) or (max_listings and taken >= max_listings):
+            return
+        offset = _next_page(page, cards)
+        if offset is None:
+            return
+
+
 def run(session, chosen_text, date_info, guest_info):
     page = session.page
     print("\n🔍 STEP 05 — Search Results Verification & Scraping")
@@ -40,22 +255,10 @@ def run(session, chosen_text, date_info, guest_info):
 
     # 1. Verify results page loaded
     print("\n[1] Verifying results page loaded...")
-    results_loaded = False
-
-    for sel in [
-        '[data-testid="card-container"]',
-        '[data-testid="listing-card-title"]',
-        '[data-testid="explore-section-wrapper"]',
-        '[data-testid="listing-tile"]',
-        'div[itemprop="itemListElement"]',
-    ]:
-        try:
-            if page.locator(sel).first.is_visible(timeout=5000):
-                results_loaded = True
-                print(f"  ✓ Results confirmed via: {sel}")
-                break
-        except Exception:
-            continue
+    el, sel = resolve(page, "results", RESULTS_SELECTORS, timeout=10_000)
+    results_loaded = el is not None
+    if results_loaded:
+        print(f"  ✓ Results confirmed via: {sel}")
 
     _log(session, "Search results page loads",
          f"Results page loaded. URL: {current_url}" if results_loaded
@@ -67,35 +270,19 @@ def run(session, chosen_text, date_info, guest_info):
 
     # 2. Confirm dates and guest count appear in page UI
     print("\n[2] Checking dates and guests in page UI...")
-    page.wait_for_timeout(1000)
 
     ui_checks = []
 
-    # Look for dates in the search bar / filters area
-    checkin = date_info.get("checkin", "") if date_info else ""
-    checkout = date_info.get("checkout", "") if date_info else ""
-    guests = str(guest_info.get("guests", "")) if guest_info else ""
-
     # Check for date text anywhere visible on page
     try:
-        page_text = page.inner_text("body")
-        # Dates may appear as "Feb 1 - Feb 5" or "Feb 1–5" etc.
-        if checkin:
-            # Try matching month abbreviation from the date
-            month_match = re.search(r'(\w{3})\s+\d+', checkin)
-            if month_match and month_match.group(0).lower() in page_text.lower():
-                ui_checks.append(f"check-in date visible")
-        if guests and guests in page_text:
-            ui_checks.append(f"guest count ({guests}) visible")
+        ui_checks = _ui_checks(page.inner_text("body"), date_info, guest_info)
     except Exception:
         pass
 
     # Also look in the top search bar text
-    for sel in ['[data-testid="little-search"]', '[data-testid="little-search-query"]',
-                '[data-testid="structured-search-input-field-query"]']:
+    for sel in SEARCH_BAR_TEXT_SELECTORS:
         try:
-            text = page.locator(sel).first.inner_text()
-            if chosen_text and chosen_text.split(",")[0].lower() in text.lower():
+            if _location_shown(page.locator(sel).first.inner_text(), chosen_text):
                 ui_checks.append("location visible in search bar")
                 break
         except Exception:
@@ -111,115 +298,58 @@ def run(session, chosen_text, date_info, guest_info):
     url_params = _parse_url_params(current_url)
     print(f"  URL params: {url_params}")
 
-    url_valid = bool(url_params.get("checkin") or url_params.get("adults"))
-    url_checks = []
-    if url_params.get("checkin"):
-        url_checks.append(f"checkin={url_params['checkin']}")
-    if url_params.get("checkout"):
-        url_checks.append(f"checkout={url_params['checkout']}")
-    if url_params.get("adults"):
-        url_checks.append(f"adults={url_params['adults']}")
+    url_checks = _url_checks(url_params)
 
     _log(session, "Dates and guests present in URL",
          f"URL contains: {', '.join(url_checks)}." if url_checks
          else f"No search params found in URL: {current_url}",
          "results_url_check")
 
-    # 4. Scrape listings
+    # 4-5. Scrape page by page, storing each page's listings as it arrives
     print("\n[4] Scraping listing data...")
-    page.wait_for_timeout(1000)
-
-    listings = []
-
-    # Get all listing cards
-    cards = page.locator('[data-testid="card-container"]').all()
-    if not cards:
-        cards = page.locator('[data-testid="listing-tile"]').all()
-    print(f"  Found {len(cards)} listing cards")
-
-    for i, card in enumerate(cards[:20]):  # Cap at 20 listings
-        try:
-            title, price, img_url = None, None, None
-
-            # Title
-            for sel in ['[data-testid="listing-card-title"]', 'div[data-testid*="title"]',
-                        '[aria-label]', 'h3', 'h2']:
-                try:
-                    el = card.locator(sel).first
-                    text = el.inner_text().strip()
-                    if text and len(text) > 3:
-                        title = text
-                        break
-                except Exception:
-                    continue
-
-            # Price
-            for sel in ['[data-testid="price-availability-row"]', 'span[data-testid*="price"]',
-                        'span:has-text("$")', 'span:has-text("£")', 'span:has-text("€")',
-                        '[class*="price"]']:
-                try:
-                    el = card.locator(sel).first
-                    text = el.inner_text().strip()
-                    if text and any(c.isdigit() for c in text):
-                        price = text.split("\n")[0].strip()
-                        break
-                except Exception:
-                    continue
-
-            # Image URL
+    found = saved = pages = 0
+    try:
+        for pages, page_url, listings in iter_result_pages(page, session.max_pages, session.max_listings):
+            _print_page(pages, listings, found)
+            found += len(listings)
+            rows = _listing_rows(listings, page_url, chosen_text, url_params, date_info, guest_info)
             try:
-                img = card.locator("img").first
-                img_url = img.get_attribute("src") or img.get_attribute("data-src")
-            except Exception:
-                pass
-
-            if title:
-                listings.append({
-                    "title": title,
-                    "price": price or "N/A",
-                    "img_url": img_url or "",
-                })
-                print(f"  [{i+1}] {title[:50]} | {price}")
-        except Exception:
-            continue
+                # Counted once written, after repeated listing ids collapse; rows a
+                # failed flush keeps are counted by the flush that writes them.
+                saved += save_listings(rows)  # written now when no run buffer is active
+                saved += flush_current()  # a failure on a later page keeps what was stored so far
+            except Exception as e:
+                print(f"  ⚠ DB save failed: {e}")
+    except Exception as e:
+        print(f"  ⚠ Pagination stopped after page {pages}: {e}")
 
     _log(session, "Scrape listing titles, prices, images",
-         f"Scraped {len(listings)} listings from results page." if listings
+         f"Scraped {found} listings from {pages} results page(s)." if found
          else "No listings could be scraped.",
-         "results_scraped", force_fail=not listings)
+         "results_scraped", force_fail=not found)
 
-    if not listings:
+    if not found:
         return None
 
-    # 5. Store listings in DB
-    print(f"\n[5] Storing {len(listings)} listings in database...")
-    saved = 0
-    search_url = current_url
-
-    for item in listings:
-        try:
-            Listing.objects.create(
-                title=item["title"][:500],
-                price=item["price"][:100],
-                img_url=item["img_url"][:1000],
-                search_url=search_url[:1000],
-                location=chosen_text or "",
-                checkin=url_params.get("checkin") or (date_info.get("checkin") if date_info else ""),
-                checkout=url_params.get("checkout") or (date_info.get("checkout") if date_info else ""),
-                guests=guest_info.get("guests", 0) if guest_info else 0,
-            )
-            saved += 1
-        except Exception as e:
-            print(f"  ⚠ DB save failed: {e}")
-
+    print(f"\n[5] Stored {saved}/{found} listings in database")
     _log(session, "Store listing data in database",
-         f"Saved {saved}/{len(listings)} listings to database." if saved
+         f"Saved {saved}/{found} listings to database." if saved
          else "Failed to save listings to database.",
          "results_stored", force_fail=saved == 0)
 
     print("\n✅ Step 05 complete!")
     return {
-        "listings_found": len(listings),
+        "listings_found": found,
         "listings_saved": saved,
+        "pages": pages,
         "url_params": url_params,
-    }
\ No newline at end of file
+    }
+
+
+def run_direct(session, city, checkin, checkout, adults):
+    """Skip the search UI: open the results URL for this search and run the results checks."""
+    print("\n⏩ Direct search URL")
+    url = build_search_url(city, checkin, checkout, adults, base_url=session.base_url or URL)
+    print(f"  → {url}")
+    session.page.goto(url, wait_until="domcontentloaded", timeout=60_000)
+    return run(session, city, {"checkin": checkin, "checkout": checkout}, {"guests": adults})
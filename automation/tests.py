@@ -1,3 +1,240 @@
-from django.test import TestCase
+import base64
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from automation.models import Listing, PriceObservation, Sighting
+from automation.utils.cron import Cron
+from automation.utils.export import ExportCommand
+from automation.utils.price import parse_price, price_fields
+from automation.utils.serialize import InvalidCursor, decode_cursor, encode_cursor
+from automation.utils.writer import ResultBuffer, start_run, upsert_listings
+
+
+class PriceParsingTests(SimpleTestCase):
+    def test_amount_currency_and_period(self):
+        cases = {
+            "$123 night": (Decimal('123'), 'USD', 'night'),
+            "US$ 1,234 total": (Decimal('1234'), 'USD', 'total'),
+            "1.234,50 € month": (Decimal('1234.50'), 'EUR', 'month'),
+            "¥12,000 / week": (Decimal('12000'), 'JPY', 'week'),
+            "99 zł": (Decimal('99'), 'PLN', ''),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_price(text), expected)
+
+    def test_discount_charges_the_last_amount(self):
+        self.assertEqual(parse_price("$150 $120 night"), (Decimal('120'), 'USD', 'night'))
+
+    def test_stay_length_counts_as_total(self):
+        self.assertEqual(parse_price("EUR 99 for 5 nights"), (Decimal('99'), 'EUR', 'total'))
+
+    def test_no_amount(self):
+        for text in ("N/A", "", None):
+            with self.subTest(text=text):
+                self.assertEqual(parse_price(text), (None, '', ''))
+
+    def test_misread_amount_is_dropped(self):
+        self.assertIsNone(price_fields("$12345678901 night")['price_amount'])
+
+
+class CronTests(SimpleTestCase):
+    # 2026-01-01 is a Thursday
+    start = datetime(2026, 1, 1, 10, 7)
+
+    def test_steps(self):
+        self.assertEqual(Cron('*/15 * * * *').next_after(self.start), datetime(2026, 1, 1, 10, 15))
+
+    def test_strictly_after(self):
+        self.assertEqual(Cron('7 10 * * *').next_after(self.start), datetime(2026, 1, 2, 10, 7))
+
+    def test_weekday_only(self):
+        self.assertEqual(Cron('0 9 * * 1').next_after(self.start), datetime(2026, 1, 5, 9, 0))
+
+    def test_sunday_as_7(self):
+        self.assertEqual(Cron('0 0 * * 7').next_after(self.start), datetime(2026, 1, 4, 0, 0))
+
+    def test_restricted_day_fields_match_either(self):
+        # Friday the 2nd comes before the 13th
+        self.assertEqual(Cron('0 0 13 * 5').next_after(self.start), datetime(2026, 1, 2, 0, 0))
+
+    def test_day_step_is_a_restriction(self):
+        # '*/2' restricts the day of month, so odd days OR Mondays: the 3rd, not Monday the 5th
+        self.assertEqual(Cron('0 0 */2 * 1').next_after(self.start), datetime(2026, 1, 3, 0, 0))
+
+    def test_never_matches(self):
+        with self.assertRaises(ValueError):
+            Cron('0 0 30 2 *').next_after(self.start)
+
+    def test_invalid_expressions(self):
+        for expression in ('* * *', '60 * * * *', '*/0 * * * *', '0 0 0 * *', 'a * * * *', '5-1 * * * *'):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                Cron(expression)
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip_keeps_microseconds(self):
+        when = timezone.now().replace(microsecond=123456)
+        cursor = encode_cursor({'created_at': when, 'id': 42}, 'created_at')
+        self.assertEqual(decode_cursor(cursor), (when, 42))
+
+    def test_invalid_cursors(self):
+        bad = ('', 'not-a-cursor', encode_cursor({'created_at': timezone.now(), 'id': 1}, 'created_at')[:-3])
+        for cursor in bad:
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+    def test_id_must_be_an_integer(self):
+        raw = base64.urlsafe_b64encode(json.dumps([timezone.now().isoformat(), "1"]).encode()).decode()
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(raw)
+
+
+@override_settings(AUTOMATION_API_TOKEN=None)
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.paris = start_run(city='Paris')
+        upsert_listings([Listing(title=f"Room {n}", listing_id=str(n), price=f"${n}0 night", run=cls.paris)
+                         for n in range(1, 6)])
+
+    def test_pages_follow_the_cursor(self):
+        seen, url = [], '/api/listings/?limit=2'
+        while url:
+            page = self.client.get(url).json()
+            seen += [row['listing_id'] for row in page['results']]
+            url = page['next']
+        self.assertEqual(sorted(seen), ['1', '2', '3', '4', '5'])
+
+    def test_run_filter(self):
+        page = self.client.get(f'/api/listings/?run={self.paris.pk}').json()
+        self.assertEqual(len(page['results']), 5)
+        self.assertEqual(self.client.get(f'/api/listings/?run={self.paris.pk + 1}').json()['results'], [])
+
+    def test_bad_parameters_are_400(self):
+        for url in ('/api/listings/?cursor=garbage', '/api/listings/?run=x', '/api/results/?run=1.5',
+                    '/api/listings/?limit=ten', '/api/runs/?since=yesterday', '/api/results/?passed=maybe'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+    def test_get_only(self):
+        self.assertEqual(self.client.post('/api/listings/').status_code, 405)
+
+
+class ExportResumeTests(TestCase):
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+        upsert_listings([Listing(title=f"Room {n}", listing_id=str(n)) for n in range(1, 8)])
+
+    def _export(self, *args):
+        call_command('export_listings', '--output', self.output, '--format', 'ndjson', '--chunk-rows', '3',
+                     *args, stdout=io.StringIO())
+
+    def _exported_ids(self):
+        with open(os.path.join(self.output, 'manifest.json')) as f:
+            manifest = json.load(f)
+        ids = []
+        for chunk in manifest['chunks']:
+            with gzip.open(os.path.join(self.output, chunk['file']), 'rt') as f:
+                ids += [json.loads(line)['listing_id'] for line in f]
+        return manifest, ids
+
+    def test_resume_continues_after_the_last_complete_file(self):
+        write_chunk = ExportCommand._write_chunk
+        calls = []
+
+        def interrupted(self, *args):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("interrupted")
+            return write_chunk(self, *args)
+
+        with mock.patch.object(ExportCommand, '_write_chunk', interrupted), self.assertRaises(RuntimeError):
+            self._export()
+        manifest, ids = self._exported_ids()
+        self.assertFalse(manifest['complete'])
+        self.assertEqual(len(ids), 3)
+
+        self._export()
+        manifest, ids = self._exported_ids()
+        self.assertTrue(manifest['complete'])
+        self.assertEqual(sorted(ids, key=int), [str(n) for n in range(1, 8)])
+        self.assertEqual([chunk['rows'] for chunk in manifest['chunks']], [3, 3, 1])
+
+    def test_resume_with_other_filters_is_refused(self):
+        self._export()
+        with self.assertRaises(CommandError):
+            self._export('--location', 'Paris')
+
+    def test_restart_starts_over(self):
+        self._export()
+        upsert_listings([Listing(title="Room 8", listing_id='8')])
+        self._export('--restart')
+        _, ids = self._exported_ids()
+        self.assertEqual(len(ids), 8)
+
+
+class UpsertListingsTests(TestCase):
+    def test_price_history_only_on_change(self):
+        upsert_listings([Listing(title="Room", listing_id='1', price="$100 night")])
+        upsert_listings([Listing(title="Room", listing_id='1', price="$100 night")])
+        upsert_listings([Listing(title="Room (new photos)", listing_id='1', price="$90 night")])
+
+        listing = Listing.objects.get()
+        self.assertEqual(listing.title, "Room (new photos)")
+        self.assertEqual(listing.price, "$90 night")
+        self.assertEqual(list(listing.prices.order_by('observed_at').values_list('price', flat=True)),
+                         ["$100 night", "$90 night"])
+
+    def test_repeats_in_a_batch_count_once(self):
+        written = upsert_listings([
+            Listing(title="Room", listing_id='1', price="$100 night"),
+            Listing(title="Room", listing_id='1', price="$95 night"),
+            Listing(title="No link"),
+        ])
+        self.assertEqual(written, 2)
+        self.assertEqual(Listing.objects.count(), 2)
+        self.assertEqual(Listing.objects.get(listing_id='1').price, "$95 night")  # the last sighting wins
+        self.assertEqual(PriceObservation.objects.count(), 1)
+
+    def test_each_run_keeps_its_sightings(self):
+        first, second = start_run(city='Paris'), start_run(city='Paris')
+        with ResultBuffer(first) as buffer:
+            buffer.add_listings([Listing(title="Room", listing_id='1', price="$100 night"),
+                                 Listing(title="Other", listing_id='2', price="$80 night")])
+        with ResultBuffer(second) as buffer:
+            buffer.add_listings([Listing(title="Room", listing_id='1', price="$90 night")])
+
+        self.assertEqual(Listing.objects.get(listing_id='1').run, second)
+        self.assertEqual(set(Listing.objects.filter(sightings__run=first).values_list('listing_id', flat=True)),
+                         {'1', '2'})
+        self.assertEqual(Sighting.objects.get(run=second).price, "$90 night")
+        first.refresh_from_db()
+        self.assertEqual(first.listings_saved, 2)
+
+    def test_failed_flush_keeps_rows_for_the_next(self):
+        run = start_run(city='Paris')
+        buffer = ResultBuffer(run)
+        buffer.add_listings([Listing(title="Room", listing_id='1', price="$100 night")])
+        with mock.patch('automation.utils.writer.upsert_listings', side_effect=RuntimeError("database is locked")):
+            with self.assertRaises(RuntimeError):
+                buffer.flush()
+        self.assertEqual(len(buffer.listings), 1)
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(Listing.objects.count(), 1)
+        self.assertLess(timezone.now() - Listing.objects.get().last_seen_at, timedelta(minutes=1))
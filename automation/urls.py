@@ -0,0 +1,11 @@
+from django.urls import path
+
+from automation import views
+
+app_name = 'automation'
+
+urlpatterns = [
+    path('listings/', views.listings, name='listings'),
+    path('results/', views.results, name='results'),
+    path('runs/', views.runs, name='runs'),
+]
@@ -1,5 +1,12 @@
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
 from playwright.sync_api import sync_playwright, Browser, Page
 
+from automation.utils.screenshot import ScreenshotPolicy, run_dir
+
 
 # Third-party tracking/ad/telemetry URLs — irrelevant to our tests
 IGNORED_URL_PATTERNS = (
@@ -12,8 +19,12 @@ IGNORED_URL_PATTERNS = (
 IGNORED_CONSOLE_PATTERNS = (
     'AbortError', 'signal is aborted', 'ResizeObserver',
     'Non-Error promise rejection', 'Load failed',
+    'ERR_BLOCKED_BY_CLIENT',  # requests aborted by our own ResourcePolicy
 )
 
+# Resource types that can be skipped when a step asserts nothing about them
+HEAVY_RESOURCE_TYPES = ('image', 'font', 'media')
+
 
 def _is_ignored_url(url: str) -> bool:
     return any(pattern in url for pattern in IGNORED_URL_PATTERNS)
@@ -23,35 +34,146 @@ def _is_ignored_console(msg: str) -> bool:
     return any(pattern in msg for pattern in IGNORED_CONSOLE_PATTERNS)
 
 
-class BrowserSession:
-    """Manages browser lifecycle and tracks console errors / network failures."""
+LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage']
 
-    def __init__(self, headless: bool = True):
-        self.headless = headless
-        self._playwright = None
-        self._browser: Browser = None
-        self.page: Page = None
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1366, 'height': 768},
+    'user_agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) '
+        'Chrome/120.0.0.0 Safari/537.36'
+    ),
+}
+
+
+# Added as an init script by restore(): puts a checkpoint's localStorage back the first
+# time each of its origins loads in the tab, then leaves the site's own writes alone.
+RESTORE_STORAGE_JS = """
+origins => {
+    const saved = origins.find(o => o.origin === location.origin);
+    if (!saved || sessionStorage.getItem('__checkpoint_restored')) return;
+    for (const {name, value} of saved.localStorage) localStorage.setItem(name, value);
+    sessionStorage.setItem('__checkpoint_restored', '1');
+}
+"""
+
+
+class ResourcePolicy:
+    """Which requests a session aborts via context.route, and how many it has blocked.
+
+    Trackers/ads (IGNORED_URL_PATTERNS) are blocked on every step when block_trackers
+    is set; `block_types` (e.g. HEAVY_RESOURCE_TYPES) only on the steps listed in
+    `block_steps` (all steps if None).
+    """
+
+    def __init__(self, block_trackers: bool = True, block_types=(), block_steps=None):
+        self.block_trackers = block_trackers
+        self.block_types = frozenset(block_types)
+        self.block_steps = frozenset(block_steps) if block_steps is not None else None
+        self.step = None
+        self.blocked = Counter()
+
+    def copy(self) -> 'ResourcePolicy':
+        """Same rules, fresh counters (each session gets its own)."""
+        return ResourcePolicy(self.block_trackers, self.block_types, self.block_steps)
+
+    @property
+    def active(self) -> bool:
+        return self.block_trackers or bool(self.block_types)
+
+    def reason(self, url: str, resource_type: str):
+        """Why this request should be aborted, or None to let it through."""
+        if self.block_trackers and _is_ignored_url(url):
+            return 'tracker'
+        if resource_type in self.block_types and (self.block_steps is None or self.step in self.block_steps):
+            return resource_type
+        return None
+
+
+def blocked_summary(blocked) -> str:
+    """'tracker=12, image=3' from {reason: count} (a ResourcePolicy's or a flow's), most first."""
+    return ', '.join(f"{kind}={n}" for kind, n in sorted(blocked.items(), key=lambda kv: -kv[1]))
+
+
+class SessionState:
+    """Per-session bookkeeping shared by the sync and async sessions:
+    console / network errors, the optional resource policy, where screenshots go,
+    which site the flow starts on (None: the real one), HAR record/replay files,
+    the saved storage state used for warm starts and how many results pages /
+    listings step05 collects (0: no limit)."""
+
+    def __init__(self, policy: ResourcePolicy = None, screenshots: ScreenshotPolicy = None,
+                 base_url: str = None, record_har: str = None, replay_har: str = None,
+                 storage_state: str = None, max_pages: int = 1, max_listings: int = 20):
         self.console_errors: list = []
         self.network_errors: list = []
+        self.base_url = base_url
+        self.record_har = record_har
+        self.replay_har = replay_har
+        # Warm when a saved state exists: step01 skips clearing storage and the modal.
+        # Cold with a path: step01 saves the state there once the landing is done.
+        self.storage_state = storage_state
+        self.warm = bool(storage_state and os.path.exists(storage_state))
+        self.max_pages = max_pages
+        self.max_listings = max_listings
+        self.step = None
+        self.policy = policy.copy() if policy and policy.active else None
+        self.screenshots = screenshots or ScreenshotPolicy()
+        self.screenshot_dir = run_dir()
 
-    def start(self):
-        self._playwright = sync_playwright().start()
-        self._browser = self._playwright.chromium.launch(
-            headless=self.headless,
-            args=['--no-sandbox', '--disable-dev-shm-usage'],
-        )
-        context = self._browser.new_context(
-            viewport={'width': 1366, 'height': 768},
-            user_agent=(
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/120.0.0.0 Safari/537.36'
-            ),
-        )
-        context.clear_cookies()
-        self.page = context.new_page()
-        self._attach_listeners()
-        return self
+    def _context_options(self) -> dict:
+        options = dict(CONTEXT_OPTIONS)
+        if self.record_har:
+            # Written when the context closes; 'full' keeps bodies so replays can serve them
+            Path(self.record_har).parent.mkdir(parents=True, exist_ok=True)
+            options.update(record_har_path=self.record_har, record_har_mode='full')
+        if self.warm:
+            options['storage_state'] = self.storage_state
+        return options
+
+    def describe(self) -> dict:
+        """The options this session runs with, as JSON for Run.options."""
+        options = {
+            'base_url': self.base_url,
+            'screenshots': self.screenshots.mode,
+            'max_pages': self.max_pages,
+            'max_listings': self.max_listings,
+            'warm_start': self.warm,
+            'record_har': self.record_har,
+            'replay_har': self.replay_har,
+        }
+        if self.policy:
+            options['block_trackers'] = self.policy.block_trackers
+            options['block_resources'] = sorted(self.policy.block_types)
+            options['block_steps'] = sorted(self.policy.block_steps) if self.policy.block_steps is not None else None
+        return {key: value for key, value in options.items() if value not in (None, False, [])}
+
+    def _write_storage_state(self, state: dict):
+        # Parallel flows may save at once: write aside and swap so readers never see half a file
+        path = Path(self.storage_state)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{id(self)}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _restore_script(storage_state: dict):
+        origins = [o for o in storage_state.get('origins', []) if o.get('localStorage')]
+        return f"({RESTORE_STORAGE_JS})({json.dumps(origins)})" if origins else None
+
+    def enter_step(self, step: int):
+        """Called by the runners before each step so per-step policies can switch."""
+        self.step = step
+        if self.policy:
+            self.policy.step = step
+
+    def _block_reason(self, route):
+        if not self.policy:
+            return None
+        reason = self.policy.reason(route.request.url, route.request.resource_type)
+        if reason:
+            self.policy.blocked[reason] += 1
+        return reason
 
     def _attach_listeners(self):
         self.page.on('console', self._on_console)
@@ -83,11 +205,115 @@ class BrowserSession:
     def passed(self) -> bool:
         return not self.has_errors()
 
+
+class SharedBrowser:
+    """One Playwright driver + Chromium process that hands out isolated BrowserSessions."""
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self._playwright = None
+        self.browser: Browser = None
+
+    def start(self):
+        self._playwright = sync_playwright().start()
+        try:
+            self.browser = self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def is_connected(self) -> bool:
+        return bool(self.browser and self.browser.is_connected())
+
+    def session(self, **options) -> 'BrowserSession':
+        """New session in its own BrowserContext (cookies, storage, listeners are not shared)."""
+        return BrowserSession(headless=self.headless, browser=self.browser, **options)
+
     def stop(self):
-        if self._browser:
-            self._browser.close()
+        if self.browser:
+            self.browser.close()
+            self.browser = None
         if self._playwright:
             self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class BrowserSession(SessionState):
+    """Manages browser lifecycle and tracks console errors / network failures.
+
+    Pass ``browser`` (e.g. from SharedBrowser) to open a context on an already
+    running browser instead of launching a new one; only the context is closed on stop.
+    Other keyword options are SessionState's.
+    """
+
+    def __init__(self, headless: bool = True, browser: Browser = None, **options):
+        super().__init__(**options)
+        self.headless = headless
+        self._playwright = None
+        self._browser: Browser = browser
+        self._owns_browser = browser is None
+        self._context = None
+        self.page: Page = None
+
+    def start(self):
+        if self._owns_browser:
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        self._context = self._browser.new_context(**self._context_options())
+        if not self.warm:
+            self._context.clear_cookies()
+        if self.replay_har:
+            # Requests missing from the HAR fail instead of going to the network
+            self._context.route_from_har(self.replay_har, not_found='abort')
+        if self.policy:
+            self._context.route('**/*', self._route)
+        self.page = self._context.new_page()
+        self._attach_listeners()
+        return self
+
+    def save_storage_state(self):
+        """Save cookies + localStorage for later warm starts (cold sessions with a path only)."""
+        if self.storage_state and not self.warm:
+            self._write_storage_state(self._context.storage_state())
+
+    def snapshot(self) -> dict:
+        """This context's cookies + localStorage right now (for checkpoints)."""
+        return self._context.storage_state()
+
+    def restore(self, storage_state: dict, url: str):
+        """Continue where a checkpoint left off: its cookies and localStorage, then `url`."""
+        if storage_state.get('cookies'):
+            self._context.add_cookies(storage_state['cookies'])
+        script = self._restore_script(storage_state)
+        if script:
+            self._context.add_init_script(script=script)
+        self.page.goto(url, wait_until="domcontentloaded", timeout=60_000)
+
+    def _route(self, route):
+        if self._block_reason(route):
+            route.abort('blockedbyclient')
+        else:
+            route.fallback()
+
+    def stop(self):
+        if self._context:
+            try:
+                self._context.close()
+            except Exception:
+                pass  # browser already gone
+            self._context = None
+        if self._owns_browser:
+            if self._browser:
+                self._browser.close()
+            if self._playwright:
+                self._playwright.stop()
 
     def __enter__(self):
         return self.start()
@@ -0,0 +1,87 @@
+# A small five-field cron expression (minute hour day-of-month month day-of-week)
+# for run_scheduler: numbers, '*', ranges 'a-b', steps '*/n' / 'a-b/n' and lists.
+from datetime import datetime, timedelta
+
+FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 6),  # 0 = Sunday; 7 is accepted as Sunday too
+)
+
+# How far ahead next_after looks before deciding the expression never matches (e.g. Feb 30)
+HORIZON = timedelta(days=366 * 5)
+
+
+def _parse_field(text, name, low, high):
+    values = set()
+    top = 7 if name == 'day of week' else high
+    for part in text.split(','):
+        body, _, step = part.partition('/')
+        try:
+            step = int(step) if step else 1
+            if body == '*':
+                start, end = low, high
+            elif '-' in body:
+                start, end = (int(v) for v in body.split('-', 1))
+            else:
+                start = int(body)
+                end = high if step != 1 else start
+        except ValueError:
+            raise ValueError(f"Bad {name} field in cron expression: {text!r}")
+        if step < 1:
+            raise ValueError(f"{name} step must be 1 or more: {text!r}")
+        if not (low <= start <= end <= top):
+            raise ValueError(f"{name} must be within {low}-{top}: {text!r}")
+        values.update(v % 7 if name == 'day of week' else v for v in range(start, end + 1, step))
+    return frozenset(values)
+
+
+class Cron:
+    """Parsed cron expression; next_after(dt) is the next matching minute after dt.
+
+    As in cron, when both day fields are restricted a day matches if either does.
+    Only a literal '*' leaves a day field unrestricted: '*/2' or '1-31' restrict it.
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields (minute hour day month weekday): {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(text, *field) for text, field in zip(parts, FIELDS)
+        )
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+
+    def _day_matches(self, dt: datetime) -> bool:
+        weekday = (dt.weekday() + 1) % 7  # Python: Monday = 0; cron: Sunday = 0
+        if self._any_day or self._any_weekday:
+            return dt.day in self.days and weekday in self.weekdays
+        return dt.day in self.days or weekday in self.weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        """Next matching time strictly after `after` (same tzinfo, whole minutes).
+
+        Skips whole days, then hours, then minutes that can't match, so it stays
+        cheap for sparse schedules. Raises ValueError if nothing matches within HORIZON.
+        """
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + HORIZON
+        while dt <= limit:
+            if dt.month not in self.months or not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __str__(self):
+        return self.expression
@@ -0,0 +1,169 @@
+# Base for the export_* commands: stream a model's rows into gzip CSV / NDJSON
+# chunk files, resumable through a manifest kept next to them.
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from automation.utils.serialize import SHAPES, encode_cursor, json_line, keyset, parse_timestamp
+
+MANIFEST = 'manifest.json'
+FORMATS = ('csv', 'ndjson')
+
+
+def timestamp(value):
+    """argparse type: ISO date or datetime."""
+    when = parse_timestamp(value)
+    if when is None:
+        raise ValueError(value)
+    return when
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class ExportCommand(BaseCommand):
+    """Subclasses set `model` and `name`, and add their own filters with
+    add_filter_arguments / filter_queryset / filters (the last records them in the manifest)."""
+
+    model = None
+    name = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', required=True, metavar='DIR',
+                            help=f"Directory for the {self.name}-NNNNN.<format>.gz chunks and {MANIFEST}.")
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--since', type=timestamp, metavar='DATE',
+                            help="Only rows created at or after this ISO date/datetime.")
+        parser.add_argument('--until', type=timestamp, metavar='DATE',
+                            help="Only rows created before this (default: when the export first started, "
+                                 "so a resumed export covers the same rows).")
+        parser.add_argument('--run', type=int, nargs='+', metavar='ID', help="Only rows of these runs.")
+        parser.add_argument('--chunk-rows', type=int, default=100_000,
+                            help="Rows per output file; a resumed export restarts after the last complete file.")
+        parser.add_argument('--restart', action='store_true', default=False,
+                            help="Ignore an existing manifest in --output and start over.")
+        self.add_filter_arguments(parser)
+
+    def add_filter_arguments(self, parser):
+        pass
+
+    def filter_queryset(self, queryset, options):
+        return queryset
+
+    def filter_runs(self, queryset, runs):
+        """The rows of `runs` (--run)."""
+        return queryset.filter(run_id__in=runs)
+
+    def filters(self, options) -> dict:
+        """The filters as JSON, stored in the manifest so a resume can't change them."""
+        return {'run': options['run']}
+
+    def handle(self, *args, **options):
+        fields, order_field = SHAPES[self.model]
+        output = options['output']
+        os.makedirs(output, exist_ok=True)
+        manifest = self._manifest(output, options)
+
+        queryset = self.model.objects.filter(**{f'{order_field}__lt': parse_datetime(manifest['until'])})
+        if manifest['since']:
+            queryset = queryset.filter(**{f'{order_field}__gte': parse_datetime(manifest['since'])})
+        if options['run']:
+            queryset = self.filter_runs(queryset, options['run'])
+        queryset = self.filter_queryset(queryset, options)
+        rows = keyset(queryset, order_field, manifest['cursor']).values(*fields).iterator(chunk_size=2000)
+
+        if manifest['chunks']:
+            done = sum(chunk['rows'] for chunk in manifest['chunks'])
+            self.stdout.write(f"   Resuming after {len(manifest['chunks'])} file(s), {done} rows")
+        chunk_rows = max(1, options['chunk_rows'])
+        total = 0
+        while True:
+            number = len(manifest['chunks']) + 1
+            filename = f"{self.name}-{number:05d}.{manifest['format']}.gz"
+            written, last = self._write_chunk(os.path.join(output, filename), rows, fields,
+                                              manifest['format'], chunk_rows)
+            if not written:
+                break
+            total += written
+            manifest['chunks'].append({'file': filename, 'rows': written})
+            manifest['cursor'] = encode_cursor(last, order_field)
+            self._save(output, manifest)
+            self.stdout.write(f"   {filename}: {written} rows")
+            if written < chunk_rows:
+                break
+
+        manifest['complete'] = True
+        self._save(output, manifest)
+        rows_total = sum(chunk['rows'] for chunk in manifest['chunks'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Exported {total} {self.name} this run; {rows_total} in {len(manifest['chunks'])} file(s) in {output}"
+        ))
+
+    def _manifest(self, output, options):
+        path = os.path.join(output, MANIFEST)
+        wanted = {
+            'model': self.name,
+            'format': options['format'],
+            'since': options['since'].isoformat() if options['since'] else None,
+            'filters': self.filters(options),
+        }
+        if os.path.exists(path) and not options['restart']:
+            with open(path) as f:
+                manifest = json.load(f)
+            changed = [key for key in wanted if manifest.get(key) != wanted[key]]
+            if options['until'] and manifest['until'] != options['until'].isoformat():
+                changed.append('until')
+            if changed:
+                raise CommandError(f"{path} is for a different export ({', '.join(changed)} differ); "
+                                   "pass --restart or use another --output")
+            manifest['complete'] = False
+            return manifest
+        for name in os.listdir(output):
+            if name.startswith(f"{self.name}-") and name.endswith('.gz'):
+                os.remove(os.path.join(output, name))
+        until = options['until'] or timezone.now()
+        return {**wanted, 'until': until.isoformat(), 'cursor': None, 'chunks': [], 'complete': False}
+
+    def _write_chunk(self, path, rows, fields, fmt, limit):
+        """Up to `limit` rows into `path` (written aside, renamed when complete): (count, last row)."""
+        tmp = f"{path}.tmp"
+        written, last = 0, None
+        with gzip.open(tmp, 'wt', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f) if fmt == 'csv' else None
+            if writer:
+                writer.writerow(fields)
+            for row in rows:
+                if writer:
+                    writer.writerow([_csv_value(row[field]) for field in fields])
+                else:
+                    f.write(json_line(row))
+                written, last = written + 1, row
+                if written >= limit:
+                    break
+        if written:
+            os.replace(tmp, path)
+        else:
+            os.remove(tmp)
+        return written, last
+
+    def _save(self, output, manifest):
+        path = os.path.join(output, MANIFEST)
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{path}.tmp", path)
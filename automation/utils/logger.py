@@ -1,14 +1,44 @@
 from automation.models import TestResult
+from automation.utils import timing
+from automation.utils.writer import current_buffer
+
+
+def _print(testCase, passed, comment):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"  {status} | {testCase} | {comment}")
 
 
 def log_result(testCase: str, url: str, passed: bool, comment: str) -> TestResult:
-    """Save a test result to the database and print to console."""
-    result = TestResult.objects.create(
+    """Save a test result to the database (or the active run buffer) and print to console."""
+    result = TestResult(
         testCase=testCase,
         url=url,
         passed=passed,
         comment=comment,
+        **timing.lap(),
     )
-    status = "✅ PASS" if passed else "❌ FAIL"
-    print(f"  {status} | {testCase} | {comment}")
-    return result
\ No newline at end of file
+    buffer = current_buffer()
+    if buffer is not None:
+        buffer.add_result(result)
+    else:
+        result.save()
+    _print(testCase, passed, comment)
+    return result
+
+
+async def alog_result(testCase: str, url: str, passed: bool, comment: str) -> TestResult:
+    """Async variant of log_result for the asyncio engine."""
+    result = TestResult(
+        testCase=testCase,
+        url=url,
+        passed=passed,
+        comment=comment,
+        **timing.lap(),
+    )
+    buffer = current_buffer()
+    if buffer is not None:
+        buffer.add_result(result)
+    else:
+        await result.asave()
+    _print(testCase, passed, comment)
+    return result
@@ -0,0 +1,91 @@
+import re
+
+from automation.utils.browser import HEAVY_RESOURCE_TYPES, ResourcePolicy
+from automation.utils.pool import RECYCLE_AFTER
+from automation.utils.screenshot import SCREENSHOT_FORMATS, SCREENSHOT_MODES, ScreenshotPolicy
+
+HAR_OPTIONS = ('record_har', 'replay_har')
+
+
+def add_session_arguments(parser):
+    """Command-line flags that configure every BrowserSession a command opens."""
+    parser.add_argument('--base-url', metavar='URL',
+                        help="Start flows here instead of airbnb.com (e.g. the local stand-in).")
+    parser.add_argument('--block-trackers', action='store_true', default=False,
+                        help="Abort tracking/ad requests (IGNORED_URL_PATTERNS) instead of loading them.")
+    parser.add_argument('--block-resources', metavar='TYPES',
+                        help=f"Comma-separated resource types to abort, e.g. {','.join(HEAVY_RESOURCE_TYPES)}.")
+    parser.add_argument('--block-steps', type=int, nargs='+', metavar='N',
+                        help="Only block --block-resources on these steps (default: every step).")
+    parser.add_argument('--screenshots', choices=SCREENSHOT_MODES, default='full',
+                        help="When to capture: never, failed checks only, visible area, or the full page.")
+    parser.add_argument('--screenshot-format', choices=SCREENSHOT_FORMATS, default='png')
+    parser.add_argument('--screenshot-quality', type=int, metavar='0-100',
+                        help="JPEG quality (only with --screenshot-format jpeg).")
+    parser.add_argument('--warm-start', metavar='STATE_FILE',
+                        help="Reuse cookies/localStorage saved after a clean landing: if STATE_FILE exists "
+                             "step01 skips clearing storage and the modal check, otherwise the run starts "
+                             "cold and saves it. Default: every run starts cold.")
+    parser.add_argument('--pages', type=int, default=1, metavar='N',
+                        help="Results pages step05 follows (pagination or infinite scroll); 0 = all.")
+    parser.add_argument('--max-listings', type=int, default=20, metavar='N',
+                        help="Stop collecting listings after N (default 20); 0 = no limit.")
+    har = parser.add_mutually_exclusive_group()
+    har.add_argument('--record-har', metavar='PATH',
+                     help="Record each flow's network traffic to a HAR file; '{city}' in PATH "
+                          "is replaced per flow. Use with --seed so replays make the same choices.")
+    har.add_argument('--replay-har', metavar='PATH',
+                     help="Serve every request from a recorded HAR (no network); "
+                          "requests missing from it are aborted.")
+
+
+def session_options(options) -> dict:
+    """BrowserSession keyword arguments shared by every flow of this invocation."""
+    block_types = [t.strip() for t in (options['block_resources'] or '').split(',') if t.strip()]
+    policy = ResourcePolicy(
+        block_trackers=options['block_trackers'],
+        block_types=block_types,
+        block_steps=options['block_steps'],
+    )
+    result = {
+        'screenshots': ScreenshotPolicy(
+            mode=options['screenshots'],
+            image_format=options['screenshot_format'],
+            quality=options['screenshot_quality'],
+        ),
+        'max_pages': max(0, options['pages']),
+        'max_listings': max(0, options['max_listings']),
+    }
+    if policy.active:
+        result['policy'] = policy
+    if options['base_url']:
+        result['base_url'] = options['base_url']
+    if options['warm_start']:
+        result['storage_state'] = options['warm_start']
+    for key in HAR_OPTIONS:
+        if options[key]:
+            result[key] = options[key]
+    return result
+
+
+def add_pool_arguments(parser):
+    """Recycle policy of the browser pool long-running commands lease flows from."""
+    parser.add_argument('--recycle-after', type=int, default=RECYCLE_AFTER, metavar='N',
+                        help=f"Relaunch a browser after it has served N flows (default {RECYCLE_AFTER}); 0 = never.")
+    parser.add_argument('--max-browser-rss', type=float, metavar='MB',
+                        help="Relaunch a browser once its driver + Chromium processes use more than MB "
+                             "of resident memory (Linux). Default: no limit.")
+
+
+def pool_options(options) -> dict:
+    """BrowserPool keyword arguments from add_pool_arguments' flags."""
+    return {'recycle_after': max(0, options['recycle_after']), 'max_rss_mb': options['max_browser_rss']}
+
+
+def for_city(options: dict, city) -> dict:
+    """Session options for one flow: '{city}' in HAR paths becomes the city's slug."""
+    if not any(key in options for key in HAR_OPTIONS):
+        return options
+    slug = re.sub(r'[^a-z0-9]+', '-', (city or 'any').lower()).strip('-')
+    return {key: value.replace('{city}', slug) if key in HAR_OPTIONS else value
+            for key, value in options.items()}
@@ -0,0 +1,221 @@
+# A pool of SharedBrowsers that leases contexts to flows and replaces a Chromium
+# once it has served N flows, grown past an RSS limit, or crashed. Each pooled
+# browser has its own Playwright driver, so its memory is that process tree.
+import os
+from contextlib import contextmanager
+
+from automation.utils.browser import BrowserSession, SharedBrowser
+
+RECYCLE_AFTER = 50  # flows per browser before it is relaunched
+
+
+def process_table() -> dict:
+    """{pid: parent pid} of every process readable in /proc (empty where there is no /proc)."""
+    table = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return table
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue  # exited while we looked
+        # "pid (comm) state ppid ...": comm may contain spaces and parentheses
+        table[int(entry)] = int(stat.rsplit(')', 1)[1].split()[1])
+    return table
+
+
+def tree_rss_mb(root: int) -> float:
+    """Resident memory of process `root` and all its descendants, in MB; None if unreadable."""
+    table = process_table()
+    if root not in table:
+        return None
+    tree, frontier = set(), {root}
+    while frontier:
+        tree |= frontier
+        frontier = {pid for pid, parent in table.items() if parent in frontier} - tree
+    page = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    for pid in tree:
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total += int(f.read().split()[1]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+    return total / 2 ** 20
+
+
+def child_pids() -> set:
+    """Pids of this process's direct children."""
+    return {pid for pid, parent in process_table().items() if parent == os.getpid()}
+
+
+_pid_unknown = False  # whether "RSS can't be measured" has been printed
+
+
+def driver_pid(shared, children_before=()):
+    """Pid of the Playwright driver a SharedBrowser / AsyncSharedBrowser started (its
+    Chromium runs under it), or None.
+
+    Playwright doesn't publish it: read it from the driver transport where this
+    version has one, else take the child process the launch added (`children_before`
+    is child_pids() from before it). None when launches overlapped and it is ambiguous.
+    """
+    global _pid_unknown
+    try:
+        return shared._playwright._impl_obj._connection._transport._proc.pid
+    except AttributeError:
+        pass
+    spawned = child_pids() - set(children_before)
+    if len(spawned) == 1:
+        return spawned.pop()
+    if not _pid_unknown:
+        _pid_unknown = True
+        print("  ⚠️  Can't find a pooled browser's driver process; max RSS is not checked for it.")
+    return None
+
+
+class PooledBrowser:
+    """One pool slot: a browser, the processes it runs in and what the recycle policy looks at."""
+
+    def __init__(self, browser, pid=None):
+        self.browser = browser
+        self.pid = pid  # the browser's driver process; its tree is what max_rss_mb measures
+        self.flows = 0
+        self.leased = 0
+        self.retiring = None  # why it will be closed once its leases are back
+
+    def rss_mb(self):
+        return tree_rss_mb(self.pid) if self.pid else None
+
+    def recycle_reason(self, recycle_after: int, max_rss_mb: float = None):
+        """Why this browser should not take more flows, or None while it is healthy."""
+        if self.retiring:
+            return self.retiring
+        if not self.browser.is_connected():
+            return 'crashed'
+        if recycle_after and self.flows >= recycle_after:
+            return 'recycle-after limit'
+        if max_rss_mb:
+            rss = self.rss_mb()
+            if rss is not None and rss > max_rss_mb:
+                return f'RSS {rss:.0f} MB > {max_rss_mb:g} MB'
+        return None
+
+
+class PoolState:
+    """Slot bookkeeping shared by the sync and async pools.
+
+    Up to `size` browsers are launched as flows need them, each hosting up to
+    `contexts` flows at once. Before every lease each browser is checked: one that
+    crashed, served `recycle_after` flows (0: never) or whose process tree passed
+    `max_rss_mb` takes no new flows and is closed as soon as its last flow ends.
+    """
+
+    def __init__(self, headless: bool = True, size: int = 1, contexts: int = 1,
+                 recycle_after: int = RECYCLE_AFTER, max_rss_mb: float = None):
+        self.headless = headless
+        self.size = max(1, size)
+        self.contexts = max(1, contexts)
+        self.recycle_after = max(0, recycle_after or 0)
+        self.max_rss_mb = max_rss_mb
+        self.slots: list = []
+        self.recycled = 0
+        self.served = 0
+
+    def _check(self):
+        """Health-check every slot: mark the unhealthy ones; return those with no flow left."""
+        idle = []
+        for slot in self.slots:
+            reason = slot.recycle_reason(self.recycle_after, self.max_rss_mb)
+            if reason and not slot.retiring:
+                slot.retiring = reason
+            if slot.retiring and not slot.leased:
+                idle.append(slot)
+        return idle
+
+    def _pick(self):
+        """Healthy slot with the fewest flows and room for one more, or None."""
+        free = [slot for slot in self.slots if not slot.retiring and slot.leased < self.contexts]
+        return min(free, key=lambda slot: slot.leased, default=None)
+
+    def _retired(self, slot):
+        self.slots.remove(slot)
+        self.recycled += 1
+        print(f"  ♻️  Recycling browser after {slot.flows} flows: {slot.retiring}")
+
+    def stats(self) -> dict:
+        return {'browsers': len(self.slots), 'recycled': self.recycled, 'flows': self.served}
+
+
+class BrowserPool(PoolState):
+    """Leases BrowserSessions to flows, like SharedBrowser.session, from a pool of browsers.
+
+    A browser that dies or fails to launch only fails the flow that hit it; the next
+    lease launches a replacement. Sync Playwright objects belong to one thread, so a
+    pool is used from the thread that created it.
+    """
+
+    def start(self):
+        return self
+
+    def _launch(self):
+        children = child_pids()
+        browser = SharedBrowser(headless=self.headless).start()
+        slot = PooledBrowser(browser, driver_pid(browser, children))
+        self.slots.append(slot)
+        return slot
+
+    def _close(self, slot):
+        self._retired(slot)
+        try:
+            slot.browser.stop()
+        except Exception:
+            pass  # a crashed driver may fail to shut down; its processes exit with it
+
+    def _lease(self):
+        for slot in self._check():
+            self._close(slot)
+        slot = self._pick()
+        if slot is None:
+            if len(self.slots) >= self.size:
+                raise RuntimeError(f"Browser pool exhausted ({self.size} x {self.contexts} flows in use)")
+            slot = self._launch()
+        slot.leased += 1
+        return slot
+
+    def _release(self, slot):
+        slot.leased -= 1
+        slot.flows += 1
+        self.served += 1
+        if slot in self._check():
+            self._close(slot)
+
+    @contextmanager
+    def session(self, **options):
+        """A started BrowserSession in its own context on a healthy pooled browser."""
+        slot = self._lease()
+        session = BrowserSession(headless=self.headless, browser=slot.browser.browser, **options)
+        try:
+            yield session.start()
+        finally:
+            session.stop()
+            self._release(slot)
+
+    def stop(self):
+        while self.slots:
+            slot = self.slots.pop()
+            try:
+                slot.browser.stop()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
@@ -0,0 +1,78 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+# Symbols (and prefixed dollars) seen on Airbnb cards, mapped to ISO 4217 codes
+CURRENCY_SYMBOLS = {
+    'US$': 'USD', 'CA$': 'CAD', 'C$': 'CAD', 'A$': 'AUD', 'AU$': 'AUD', 'NZ$': 'NZD',
+    'HK$': 'HKD', 'S$': 'SGD', 'R$': 'BRL', 'MX$': 'MXN',
+    '$': 'USD', '£': 'GBP', '€': 'EUR', '¥': 'JPY', '₹': 'INR', '₩': 'KRW',
+    '₺': 'TRY', '₽': 'RUB', '฿': 'THB', '₱': 'PHP', '₪': 'ILS', 'zł': 'PLN', 'kr': 'SEK',
+}
+
+_SYMBOL = '|'.join(re.escape(s) for s in sorted(CURRENCY_SYMBOLS, key=len, reverse=True))
+_NUMBER = r'\d[\d,.\s]*\d|\d'  # \s: thin / no-break spaces group thousands too
+# "$123", "US$ 1,234", "EUR 99" or "1.234,50 €" / "99 zł"
+_AMOUNT_RE = re.compile(
+    rf'(?P<pre>{_SYMBOL}|\b[A-Z]{{3}}\b)\s?(?P<num>{_NUMBER})'
+    rf'|(?P<num2>{_NUMBER})\s?(?P<post>{_SYMBOL}|\b[A-Z]{{3}}\b)'
+)
+
+# Checked in order: "for 5 nights" / "total" win over the "night" they contain
+PERIODS = (
+    ('total', re.compile(r'\btotal\b|\bfor\s+\d+\s+nights?\b', re.I)),
+    ('month', re.compile(r'\bmonth(ly)?\b', re.I)),
+    ('week', re.compile(r'\bweek(ly)?\b', re.I)),
+    ('night', re.compile(r'\bnight\b', re.I)),
+)
+
+
+def _number(text):
+    """Decimal from "1,234", "1.234,50", "1 234" etc; None if it isn't one."""
+    text = re.sub(r'\s', '', text)
+    if ',' in text and '.' in text:
+        decimal_mark = ',' if text.rfind(',') > text.rfind('.') else '.'
+    elif ',' in text:
+        # "1,234" groups thousands, "12,50" is a decimal comma
+        decimal_mark = ',' if re.search(r',\d{1,2}$', text) else None
+    elif '.' in text:
+        decimal_mark = None if re.fullmatch(r'\d{1,3}(\.\d{3})+', text) else '.'
+    else:
+        decimal_mark = None
+    thousands = {',': '.', '.': ',', None: ',.'}[decimal_mark]
+    text = re.sub(f'[{re.escape(thousands)}]', '', text)
+    if decimal_mark == ',':
+        text = text.replace(',', '.')
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        return None
+
+
+def parse_price(text):
+    """(amount, currency, period) from card text such as "$123 night" or "€1.234 total".
+
+    With a discount ("$150 $120 night") the last amount is the one charged.
+    amount is None when there is no amount; currency ('USD', ...) and period
+    ('night', 'week', 'month', 'total') are '' when not given.
+    """
+    matches = list(_AMOUNT_RE.finditer(text or ''))
+    if not matches:
+        return None, '', ''
+    match = matches[-1]
+    symbol = match.group('pre') or match.group('post')
+    amount = _number(match.group('num') or match.group('num2'))
+    currency = CURRENCY_SYMBOLS.get(symbol, symbol if symbol.isupper() else '')
+    period = next((name for name, pattern in PERIODS if pattern.search(text)), '')
+    return amount, currency, period
+
+
+# Listing.price_amount is DecimalField(max_digits=12, decimal_places=2)
+MAX_AMOUNT = Decimal(10) ** 10
+
+
+def price_fields(text) -> dict:
+    """parse_price as Listing field values."""
+    amount, currency, period = parse_price(text)
+    if amount is not None and amount >= MAX_AMOUNT:
+        amount = None  # a misread number; the text is still in `price`
+    return {'price_amount': amount, 'price_currency': currency, 'price_period': period}
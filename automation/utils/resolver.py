@@ -0,0 +1,91 @@
+from playwright.sync_api import TimeoutError as PWTimeout
+
+from automation.models import SelectorHint
+from automation.utils.timing import counts_as_wait
+
+_hints = None  # {key: selector}, loaded from SelectorHint on first use in this process
+
+
+def _known():
+    global _hints
+    if _hints is None:
+        _hints = dict(SelectorHint.objects.values_list('key', 'selector'))
+    return _hints
+
+
+def forget():
+    """Drop the cached winners; the next lookup reloads them (e.g. after a rollback)."""
+    global _hints
+    _hints = None
+
+
+def ordered(key, candidates):
+    """Candidates with the last known winner for `key` moved to the front."""
+    best = _known().get(key)
+    if best in candidates:
+        return [best] + [c for c in candidates if c != best]
+    return list(candidates)
+
+
+def _changed(key, selector):
+    hints = _known()
+    if hints.get(key) == selector:
+        return False
+    hints[key] = selector
+    return True
+
+
+def remember(key, selector):
+    """Record `selector` as the winner for `key` so the next run tries it first."""
+    if _changed(key, selector):
+        SelectorHint.objects.update_or_create(key=key, defaults={'selector': selector})
+
+
+def _combined(page, order):
+    combined = page.locator(order[0])
+    for sel in order[1:]:
+        combined = combined.or_(page.locator(sel))
+    return combined.filter(visible=True).first
+
+
+# Which candidates the element the race found matches, in one round trip: true /
+# false, or null for Playwright-only selectors (:has-text, ...) the DOM can't test.
+_WINNER_JS = """(el, selectors) => selectors.map((s) => {
+    try { return el.matches(s); } catch (e) { return null; }
+})"""
+
+
+def _confirmed(order, matches):
+    """(first candidate the DOM confirms, candidates it couldn't test)."""
+    confirmed = next((sel for sel, match in zip(order, matches) if match), None)
+    return confirmed, [sel for sel, match in zip(order, matches) if match is None]
+
+
+@counts_as_wait
+def resolve(page, key, candidates, timeout=2000, record=True):
+    """Race every candidate in one locator and return (locator, selector) for the winner,
+    read off the element the race found rather than by querying each candidate again.
+
+    Waits at most `timeout` ms in total, however many candidates miss; returns
+    (None, None) if none becomes visible. With record=False the caller decides
+    (via remember) whether the winner actually worked.
+    """
+    order = ordered(key, candidates)
+    found = _combined(page, order)
+    try:
+        found.wait_for(state='visible', timeout=timeout)
+    except PWTimeout:
+        return None, None
+    try:
+        matches = found.evaluate(_WINNER_JS, order)
+    except Exception:
+        matches = [None] * len(order)  # re-rendered since the race: let Playwright check
+    sel, untested = _confirmed(order, matches)
+    if sel is None:
+        # Only a Playwright-only selector can have won: ask about this one element
+        sel = next((s for s in untested if found.and_(page.locator(s)).count()), None)
+    if sel is None:
+        return None, None
+    if record:
+        remember(key, sel)
+    return page.locator(sel).filter(visible=True).first, sel
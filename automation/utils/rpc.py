@@ -0,0 +1,53 @@
+# Counts the messages Playwright sends to the browser driver, per step. Every
+# locator call, wait and evaluate is at least one round trip, so this is the
+# cost the steps control directly (unlike page load times).
+from collections import Counter
+
+from playwright._impl import _connection
+
+_SEND_METHODS = ('send', 'send_return_as_dict', 'send_no_reply')
+
+
+class RpcCounter:
+    """Patch Channel.send* while active and count calls by (step, method).
+
+    The step comes from `session.step` (set by the runners via enter_step), so
+    point `session` at the session being measured; one flow at a time.
+    """
+
+    def __init__(self):
+        self.session = None
+        self.calls = Counter()
+        self._originals = {}
+
+    def _wrap(self, original):
+        counter = self
+
+        def wrapper(channel, method, *args, **kwargs):
+            step = counter.session.step if counter.session is not None else None
+            counter.calls[(step, method)] += 1
+            return original(channel, method, *args, **kwargs)
+
+        return wrapper
+
+    def per_step(self) -> Counter:
+        totals = Counter()
+        for (step, _), n in self.calls.items():
+            totals[step] += n
+        return totals
+
+    def reset(self):
+        self.calls.clear()
+
+    def __enter__(self):
+        for name in _SEND_METHODS:
+            original = getattr(_connection.Channel, name, None)
+            if original is not None:
+                self._originals[name] = original
+                setattr(_connection.Channel, name, self._wrap(original))
+        return self
+
+    def __exit__(self, *args):
+        for name, original in self._originals.items():
+            setattr(_connection.Channel, name, original)
+        self._originals.clear()
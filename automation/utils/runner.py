@@ -0,0 +1,257 @@
+import random
+import re
+from contextlib import contextmanager
+
+from automation.models import Checkpoint, Run, StepTiming
+from automation.steps import step01_landing, step03_datepicker, step04_guests, step05_results
+from automation.utils.timing import Stopwatch
+from automation.utils.writer import ResultBuffer, finish_run, save_step_timing, start_run
+
+RESUMES_FROM = {3: 1, 4: 3, 5: 4}  # step -> the step whose checkpoint it continues from
+ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def run_flow(session, step=0, city=None, seed=None, direct=None, resume=None):
+    """Run step01 -> step05 (or a single step) in one browser session.
+
+    Results and listings are buffered for the whole flow and written in one
+    transaction per step; whatever was collected is still written if a step raises.
+    Every row points at the flow's Run, whose id is flow["run_id"].
+    With a seed, the steps' random choices are the same every time for this city.
+    `direct` ({"checkin", "checkout", "adults"}) skips the search UI, see run_direct_flow.
+    Steps 1, 3 and 4 leave a Checkpoint when they succeed; a single later step, or
+    `resume` (a run id), starts from one instead of replaying step 1, see find_checkpoint.
+    """
+    seed_flow(seed, city)
+    if direct:
+        return run_direct_flow(session, city, direct, seed)
+    flow = {
+        "city": city,
+        "chosen_text": None,
+        "suggestions": [],
+        "date_info": None,
+        "guest_info": None,
+        "results_info": None,
+        "skipped": [],  # steps that could not run because step 1 produced no location
+        "timings": {},  # step -> seconds spent in the step itself (writes excluded)
+        "resumed_from": None,  # {"run", "step"} of the checkpoint the flow started from
+    }
+    checkpoint = find_checkpoint(step, city, resume)
+    steps = resume_flow(flow, step, checkpoint)
+
+    with recorded_run(session, flow, step, seed) as buffer:
+        if checkpoint:
+            session.restore(checkpoint.storage_state, resume_url(checkpoint, session.base_url))
+            if checkpoint.step == 1:
+                step01_landing.reselect(session, checkpoint.chosen_text)
+
+        if 1 in steps:
+            with timed_step(session, flow, 1):
+                flow["city"], flow["chosen_text"], flow["suggestions"] = step01_landing.run(session, city)
+            buffer.flush()
+            save_checkpoint(session, flow, buffer.run, 1)
+
+        if 3 in steps:
+            if not flow["chosen_text"]:
+                flow["skipped"].append(3)
+            else:
+                with timed_step(session, flow, 3):
+                    flow["date_info"] = step03_datepicker.run(session, flow["chosen_text"])
+                buffer.flush()
+                save_checkpoint(session, flow, buffer.run, 3)
+
+        if 4 in steps:
+            if not flow["chosen_text"]:
+                flow["skipped"].append(4)
+            else:
+                with timed_step(session, flow, 4):
+                    flow["guest_info"] = step04_guests.run(session, flow["chosen_text"], flow["date_info"])
+                buffer.flush()
+                save_checkpoint(session, flow, buffer.run, 4)
+
+        if 5 in steps:
+            if not flow["chosen_text"]:
+                flow["skipped"].append(5)
+            else:
+                with timed_step(session, flow, 5):
+                    flow["results_info"] = step05_results.run(
+                        session, flow["chosen_text"], flow["date_info"], flow["guest_info"]
+                    )
+    return flow
+
+
+def find_checkpoint(step=0, city=None, run=None):
+    """The Checkpoint a flow starts from, or None to start at step 1.
+
+    With `run` (a run id): that run's checkpoint of the step before `step`, or
+    its last one when every step is wanted. Otherwise only a single step 3-5
+    resumes, from the newest checkpoint of the step before it (of `city`, if given).
+    """
+    if step == 1 or (run is None and step not in RESUMES_FROM):
+        return None
+    checkpoints = Checkpoint.objects.all()
+    if run is not None:
+        checkpoints = checkpoints.filter(run_id=run)
+    elif city:
+        checkpoints = checkpoints.filter(city=city)
+    if step in RESUMES_FROM:
+        checkpoints = checkpoints.filter(step=RESUMES_FROM[step])
+    return checkpoints.order_by('-created_at', '-id').first()
+
+
+def resume_flow(flow, step=0, checkpoint=None):
+    """Seed the flow with a checkpoint's outputs; return the steps left to run."""
+    steps = (1, 3, 4, 5) if step == 0 else (step,)
+    if checkpoint is None:
+        return steps
+    flow.update(
+        city=checkpoint.city or flow["city"],
+        chosen_text=checkpoint.chosen_text or None,
+        date_info=checkpoint.date_info,
+        guest_info=checkpoint.guest_info,
+        resumed_from={"run": checkpoint.run_id, "step": checkpoint.step},
+    )
+    return tuple(n for n in steps if n > checkpoint.step)
+
+
+def resume_url(checkpoint, base_url=None):
+    """Where a restored session reopens: the page a checkpoint's step left is not enough,
+    since the search bar's state lives in the page, not the URL.
+
+    After step 1 that is the homepage (run_flow then re-selects the location). After
+    steps 3 and 4 it is the results URL of the search so far, whose search bar carries
+    the location, dates and guests; dates step 3 could only read as labels are left out.
+    """
+    if checkpoint.step == 1:
+        return base_url or step01_landing.URL
+    dates = {key: (checkpoint.date_info or {}).get(key) for key in ("checkin", "checkout")}
+    if not all(ISO_DATE_RE.match(str(value)) for value in dates.values()):
+        dates = {}
+    guests = (checkpoint.guest_info or {}).get("guests")
+    return step05_results.build_search_url(checkpoint.chosen_text, adults=guests,
+                                           base_url=base_url or step01_landing.URL, **dates)
+
+
+def checkpoint_fields(flow, n):
+    """Checkpoint columns taken from the flow after step `n` (the session adds URL and storage)."""
+    return {
+        "step": n,
+        "city": flow["city"] or "",
+        "chosen_text": flow["chosen_text"] or "",
+        "date_info": flow["date_info"],
+        "guest_info": flow["guest_info"],
+    }
+
+
+def save_checkpoint(session, flow, run, n):
+    """Record where the flow stands after step `n`, if the step produced its output."""
+    if step_output(flow, n):
+        Checkpoint.objects.create(run=run, url=session.page.url, storage_state=session.snapshot(),
+                                  **checkpoint_fields(flow, n))
+
+
+def direct_flow(city, direct):
+    """The flow dict a direct search starts from: steps 1, 3 and 4 are given, not run."""
+    city = city or random.choice(step01_landing.CITIES)
+    return {
+        "city": city,
+        "chosen_text": city,
+        "suggestions": [],
+        "date_info": {"checkin": direct["checkin"], "checkout": direct["checkout"]},
+        "guest_info": {"guests": direct["adults"]},
+        "results_info": None,
+        "skipped": [],
+        "timings": {},
+        "resumed_from": None,
+    }
+
+
+def run_direct_flow(session, city, direct, seed=None):
+    """Open the results URL for city/dates/guests and run only step05 (scraping jobs)."""
+    flow = direct_flow(city, direct)
+    with recorded_run(session, flow, 5, seed, direct):
+        with timed_step(session, flow, 5):
+            flow["results_info"] = step05_results.run_direct(session, flow["city"], **direct)
+    return flow
+
+
+def seed_flow(seed, city):
+    if seed is not None:
+        random.seed(f"{seed}:{city or ''}")
+
+
+def run_fields(session, flow, step, seed, direct):
+    """Run columns known when a flow starts."""
+    options = session.describe()
+    if direct:
+        options['direct'] = direct
+    if flow.get("resumed_from"):
+        options['resumed_from'] = flow["resumed_from"]
+    return {"city": flow["city"] or "", "seed": seed, "step": step, "options": options}
+
+
+def finish_fields(session, flow, step, crashed=False):
+    """Close the flow (blocked counts, pass/fail) and return (status, Run columns)."""
+    flow["blocked"] = dict(session.policy.blocked) if session.policy else {}
+    flow["passed"] = flow_passed(flow, step)
+    if crashed:
+        status = Run.CRASHED
+    else:
+        status = Run.PASSED if flow["passed"] else Run.FAILED
+    fields = {
+        "city": flow["city"] or "",
+        "location": flow["chosen_text"] or "",
+        "listings_found": (flow["results_info"] or {}).get("listings_found", 0),
+    }
+    return status, fields
+
+
+@contextmanager
+def recorded_run(session, flow, step=0, seed=None, direct=None):
+    """Buffer the flow's writes against a new Run and close the run with its outcome
+    (crashed if the block raises). Sets flow["run_id"], flow["blocked"] and flow["passed"]."""
+    run = start_run(**run_fields(session, flow, step, seed, direct))
+    flow["run_id"] = run.pk
+    crashed = True
+    try:
+        with ResultBuffer(run) as buffer:
+            yield buffer
+        crashed = False
+    finally:
+        status, fields = finish_fields(session, flow, step, crashed)
+        finish_run(run, status, **fields)
+
+
+@contextmanager
+def timed_step(session, flow, n):
+    """Mark step `n` as current on the session, time it, and store a StepTiming row.
+
+    The duration also lands in flow["timings"] (seconds) for the commands' reports.
+    """
+    session.enter_step(n)
+    passed = False
+    with Stopwatch() as stopwatch:
+        try:
+            yield
+            passed = bool(step_output(flow, n))
+        finally:
+            flow["timings"][n] = stopwatch.elapsed
+            save_step_timing(StepTiming(
+                step=n, location=flow["city"] or "", passed=passed, **stopwatch.total()
+            ))
+
+
+def step_output(flow, n):
+    """What step `n` contributed to the flow (None / empty if it failed or did not run)."""
+    return {
+        1: flow["chosen_text"],
+        3: flow["date_info"],
+        4: flow["guest_info"],
+        5: flow["results_info"],
+    }.get(n)
+
+
+def flow_passed(flow, step=0):
+    """A flow passes when every step it was asked to run returned a result."""
+    wanted = (1, 3, 4, 5) if step == 0 else (step,)
+    return all(step_output(flow, n) for n in wanted)
@@ -1,17 +1,103 @@
 import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
+
 from django.conf import settings
 
+# off      — never capture
+# failure  — only when the check failed
+# viewport — every check, visible area only
+# full     — every check, whole scrollable page (slowest, largest files)
+SCREENSHOT_MODES = ('off', 'failure', 'viewport', 'full')
+SCREENSHOT_FORMATS = ('png', 'jpeg')
+
+# One writer thread per process, so steps never wait on disk I/O. Capturing and encoding
+# stay on the step: the shot must show the page the check saw, and a sync Playwright
+# page belongs to its thread. ThreadPoolExecutor joins the writer at exit.
+_writer = None
+
+
+class ScreenshotPolicy:
+    """When to capture, how much of the page, and in which format."""
+
+    def __init__(self, mode: str = 'full', image_format: str = 'png', quality: int = None):
+        if mode not in SCREENSHOT_MODES:
+            raise ValueError(f"Unknown screenshot mode {mode!r}; expected one of {', '.join(SCREENSHOT_MODES)}")
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unknown screenshot format {image_format!r}; expected png or jpeg")
+        self.mode = mode
+        self.image_format = image_format
+        self.quality = quality if image_format == 'jpeg' else None
+
+    def wants(self, passed: bool) -> bool:
+        if self.mode == 'off':
+            return False
+        if self.mode == 'failure':
+            return not passed
+        return True
+
+    def options(self) -> dict:
+        """Keyword arguments for page.screenshot()."""
+        options = {'type': self.image_format, 'full_page': self.mode == 'full'}
+        if self.quality is not None:
+            options['quality'] = self.quality
+        return options
+
+    @property
+    def extension(self) -> str:
+        return 'jpg' if self.image_format == 'jpeg' else 'png'
+
+
+def run_dir() -> Path:
+    """A fresh per-run folder under SCREENSHOTS_DIR (created on first write)."""
+    return Path(settings.SCREENSHOTS_DIR) / f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
 
-def take_screenshot(page, test_name: str) -> str:
-    """Save screenshot and return relative path."""
-    folder = Path(settings.SCREENSHOTS_DIR)
-    folder.mkdir(parents=True, exist_ok=True)
 
+def _screenshot_path(folder: Path, test_name: str, extension: str) -> Path:
     # Sanitize filename
-    filename = re.sub(r'[^a-z0-9]+', '_', test_name.lower()).strip('_') + '.png'
-    filepath = folder / filename
+    filename = re.sub(r'[^a-z0-9]+', '_', test_name.lower()).strip('_') + '.' + extension
+    return folder / filename
+
+
+def _write(filepath: Path, data: bytes):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.write_bytes(data)
+
+
+def _submit(filepath: Path, data: bytes):
+    global _writer
+    if _writer is None:
+        _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screenshots')
+    _writer.submit(_write, filepath, data)
+
+
+def drain():
+    """Block until every queued screenshot is on disk."""
+    global _writer
+    if _writer is not None:
+        _writer.shutdown(wait=True)
+        _writer = None
+
+
+def take_screenshot(session, test_name: str, passed: bool = True) -> str:
+    """Capture per the session's ScreenshotPolicy and queue the write; return the path or None."""
+    policy = session.screenshots
+    if not policy.wants(passed):
+        return None
+    filepath = _screenshot_path(session.screenshot_dir, test_name, policy.extension)
+    _submit(filepath, session.page.screenshot(**policy.options()))
+    print(f"  📸 Screenshot queued: {filepath.parent.name}/{filepath.name}")
+    return str(filepath)
+
 
-    page.screenshot(path=str(filepath), full_page=True)
-    print(f"  📸 Screenshot saved: {filepath.name}")
-    return str(filepath)
\ No newline at end of file
+async def atake_screenshot(session, test_name: str, passed: bool = True) -> str:
+    """Async variant of take_screenshot for the asyncio engine."""
+    policy = session.screenshots
+    if not policy.wants(passed):
+        return None
+    filepath = _screenshot_path(session.screenshot_dir, test_name, policy.extension)
+    _submit(filepath, await session.page.screenshot(**policy.options()))
+    print(f"  📸 Screenshot queued: {filepath.parent.name}/{filepath.name}")
+    return str(filepath)
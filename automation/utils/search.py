@@ -0,0 +1,43 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# FTS5 tables created by migration 0009 (SQLite only), per model
+FTS_TABLES = {
+    'automation.listing': 'automation_listing_fts',
+    'automation.testresult': 'automation_testresult_fts',
+}
+
+_available = {}
+
+
+def fts_table(model):
+    """The model's FTS5 table, or None when the database doesn't have one."""
+    table = FTS_TABLES.get(model._meta.label_lower)
+    if table is None or connection.vendor != 'sqlite':
+        return None
+    if table not in _available:
+        _available[table] = table in connection.introspection.table_names()
+    return table if _available[table] else None
+
+
+def match_expression(term):
+    """FTS5 query for a search box term: every word must match as a prefix.
+
+    Words are quoted, so FTS syntax typed by the user (NEAR, -, column:) is
+    taken literally. "paris err" -> '"paris"* "err"*'.
+    """
+    words = re.findall(r'\w+', term or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def full_text_q(model, term):
+    """Q matching `model` rows whose indexed text matches `term`, or None when
+    full-text search doesn't apply (no FTS table, no words in the term)."""
+    table = fts_table(model)
+    expression = match_expression(term)
+    if table is None or not expression:
+        return None
+    return Q(pk__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [expression]))
@@ -0,0 +1,10 @@
+import math
+
+
+def percentile(values, p):
+    """Nearest-rank percentile (p in 0-100) of `values`; None when empty."""
+    ordered = sorted(v for v in values if v is not None)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,105 @@
+# Wall-clock bookkeeping for steps and their _log checkpoints. The runner starts a
+# Stopwatch per step; each log_result takes a lap (time since the previous
+# checkpoint) and the wait helpers add the time they spend blocked to it, so every
+# row can say how much of its duration was waiting rather than acting.
+import contextvars
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+
+from django.utils import timezone
+
+_current = contextvars.ContextVar('stopwatch', default=None)
+
+
+def current_stopwatch():
+    return _current.get()
+
+
+class Stopwatch:
+    """Elapsed and waited time of one step, plus the open lap since the last checkpoint."""
+
+    def __init__(self):
+        self.started_at = timezone.now()
+        self._started = time.perf_counter()
+        self.wait = 0.0
+        self._lap_at = self.started_at
+        self._lap_started = self._started
+        self._lap_wait = 0.0
+        self._depth = 0  # nested waits (resolve inside a helper) count once
+        self._token = None
+
+    def add_wait(self, seconds: float):
+        self.wait += seconds
+        self._lap_wait += seconds
+
+    def lap(self) -> dict:
+        """Timing fields for the checkpoint that ends now; the next lap starts here."""
+        now, at = time.perf_counter(), timezone.now()
+        fields = {
+            'started_at': self._lap_at,
+            'finished_at': at,
+            'duration_ms': round((now - self._lap_started) * 1000),
+            'wait_ms': round(self._lap_wait * 1000),
+        }
+        self._lap_at, self._lap_started, self._lap_wait = at, now, 0.0
+        return fields
+
+    def total(self) -> dict:
+        """Timing fields for the whole step so far."""
+        return {
+            'started_at': self.started_at,
+            'finished_at': timezone.now(),
+            'duration_ms': round((time.perf_counter() - self._started) * 1000),
+            'wait_ms': round(self.wait * 1000),
+        }
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *args):
+        _current.reset(self._token)
+
+
+def lap() -> dict:
+    """Close the current checkpoint's lap, or {} when no step is being timed."""
+    stopwatch = current_stopwatch()
+    return stopwatch.lap() if stopwatch else {}
+
+
+@contextmanager
+def waiting():
+    """Count the enclosed block as waiting on the page."""
+    stopwatch = current_stopwatch()
+    if stopwatch is None or stopwatch._depth:
+        yield
+        return
+    stopwatch._depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stopwatch._depth -= 1
+        stopwatch.add_wait(time.perf_counter() - started)
+
+
+def counts_as_wait(fn):
+    """Decorator for wait helpers (sync or async): their time is booked as waiting."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with waiting():
+                return await fn(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with waiting():
+            return fn(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,99 @@
+# Condition-based waits used by the steps instead of fixed wait_for_timeout sleeps.
+# Each helper returns True as soon as its condition holds and False once the timeout
+# expires; none of them raise, so a step can log the miss and carry on.
+from urllib.parse import urlparse, parse_qs
+
+from playwright.sync_api import TimeoutError as PWTimeout
+
+from automation.utils.timing import counts_as_wait
+
+CALENDAR_DAY = '[data-testid="calendar-day"], button[aria-label*="202"], button[aria-label*="203"]'
+
+# JS predicate: first element matching `sel` exists and its text/value differs from `old`.
+_TEXT_CHANGED_JS = """([sel, old]) => {
+    const el = document.querySelector(sel);
+    if (!el) return false;
+    const now = (el.innerText || el.value || '').trim();
+    return now !== old;
+}"""
+
+_COUNT_ABOVE_JS = """([sel, n]) => document.querySelectorAll(sel).length > n"""
+
+_TEXT_JS = """(sel) => {
+    const el = document.querySelector(sel);
+    return el ? (el.innerText || el.value || '').trim() : null;
+}"""
+
+
+def _has_param(url, name):
+    return name in parse_qs(urlparse(url).query)
+
+
+@counts_as_wait
+def wait_for_state(page, selector, state='visible', timeout=5000):
+    """Wait for the first match of `selector` to become visible/hidden/attached/detached."""
+    try:
+        page.wait_for_selector(selector, state=state, timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+def wait_for_network_idle(page, timeout=5000):
+    """Wait for no network activity for 500 ms (capped: Airbnb keeps background requests going)."""
+    try:
+        page.wait_for_load_state('networkidle', timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+def wait_for_navigation(page, old_url, timeout=15_000):
+    """Wait for the URL to move away from `old_url` and the new document to be parsed."""
+    try:
+        page.wait_for_url(lambda url: url != old_url, wait_until='domcontentloaded', timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+def wait_for_url_param(page, name, timeout=15_000):
+    """Wait for query parameter `name` to appear in the page URL."""
+    if _has_param(page.url, name):
+        return True
+    try:
+        page.wait_for_url(lambda url: _has_param(url, name), wait_until='commit', timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+def read_text(page, selector):
+    """Current text (or input value) of the first match, or None if absent."""
+    try:
+        return page.evaluate(_TEXT_JS, selector)
+    except Exception:
+        return None
+
+
+@counts_as_wait
+def wait_for_text_change(page, selector, old, timeout=3000):
+    """Wait for the first match of `selector` to show text different from `old`."""
+    try:
+        page.wait_for_function(_TEXT_CHANGED_JS, arg=[selector, old or ''], timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
+
+
+@counts_as_wait
+def wait_for_count_above(page, selector, count, timeout=5000):
+    """Wait for more than `count` elements to match `selector` (e.g. infinite scroll loaded more)."""
+    try:
+        page.wait_for_function(_COUNT_ABOVE_JS, arg=[selector, count], timeout=timeout)
+        return True
+    except PWTimeout:
+        return False
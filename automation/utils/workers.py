@@ -0,0 +1,56 @@
+import atexit
+import os
+import time
+
+import django
+
+# Worker processes are started with "spawn", so this module must stay importable
+# before Django is set up: anything touching models is imported inside the functions.
+
+_browser = None  # this process's BrowserPool, created on first use
+
+
+def init_worker():
+    """Process-pool initializer: give each worker its own Django setup and DB connection."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ.setdefault("DJANGO_ALLOW_ASYNC_UNSAFE", "true")
+    django.setup()
+
+
+def _worker_browser(headless, pool_options=None):
+    """One pooled Chromium per worker process, reused by every city the worker runs
+    and relaunched when it crashes or hits the recycle policy."""
+    global _browser
+    from automation.utils.pool import BrowserPool
+
+    if _browser is None:
+        _browser = BrowserPool(headless=headless, **(pool_options or {})).start()
+    return _browser
+
+
+@atexit.register
+def _stop_worker_browser():
+    global _browser
+    if _browser is not None:
+        _browser.stop()
+        _browser = None
+
+
+def run_city(city, headless=True, step=0, browser=None, session_options=None, seed=None, direct=None,
+             pool_options=None):
+    """Run the whole flow for one city in a fresh context and return a picklable summary."""
+    from automation.utils.options import for_city
+    from automation.utils.runner import run_flow
+
+    started = time.perf_counter()
+    summary = {"city": city, "passed": False, "error": None, "flow": None}
+    try:
+        shared = browser or _worker_browser(headless, pool_options)
+        with shared.session(**for_city(session_options or {}, city)) as session:
+            flow = run_flow(session, step=step, city=city, seed=seed, direct=direct)
+        summary["flow"] = flow
+        summary["passed"] = flow["passed"]
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+    summary["elapsed"] = time.perf_counter() - started
+    return summary
@@ -0,0 +1,212 @@
+import contextvars
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from automation.models import Run, TestResult, Listing, PriceObservation, Sighting, StepTiming
+
+# The buffer of the run executing in this thread / asyncio task, if any.
+_current = contextvars.ContextVar('result_buffer', default=None)
+
+# Refreshed on every sighting of a known listing; created_at keeps the first one.
+UPSERT_FIELDS = ['title', 'price', 'price_amount', 'price_currency', 'price_period', 'img_url',
+                 'listing_url', 'search_url', 'location', 'checkin', 'checkout', 'guests',
+                 'last_seen_at', 'run']
+
+
+def current_buffer():
+    return _current.get()
+
+
+class ResultBuffer:
+    """Run-scoped writer: collects TestResult / Listing / StepTiming rows and bulk-writes them in one transaction.
+
+    While a buffer is active (``with ResultBuffer():`` / ``async with``), log_result and
+    save_listings append to it instead of writing. flush() at step boundaries; leaving
+    the block flushes whatever is left, including when the run raised.
+    With a `run`, every row is linked to it and its counts are bumped in the same transaction.
+    """
+
+    def __init__(self, run: Run = None):
+        self.run = run
+        self.results: list = []
+        self.listings: list = []
+        self.step_timings: list = []
+        self._token = None
+
+    def add_result(self, result: TestResult):
+        self.results.append(result)
+
+    def add_listings(self, listings):
+        self.listings.extend(listings)
+
+    def add_step_timing(self, timing: StepTiming):
+        self.step_timings.append(timing)
+
+    def flush(self) -> int:
+        """Write everything buffered; return how many listings that saved (after dedupe)."""
+        if not self.results and not self.listings and not self.step_timings:
+            return 0
+        # Dropped only once the transaction commits: if the write fails (e.g. "database
+        # is locked" under parallel workers) the rows stay for the next flush.
+        results, listings, step_timings = list(self.results), list(self.listings), list(self.step_timings)
+        rows = (*results, *listings, *step_timings)
+        if self.run is not None:
+            for row in rows:
+                row.run = self.run
+        try:
+            with transaction.atomic():
+                TestResult.objects.bulk_create(results)
+                saved = upsert_listings(listings)
+                StepTiming.objects.bulk_create(step_timings)
+                if self.run is not None:
+                    Run.objects.filter(pk=self.run.pk).update(
+                        results_total=F('results_total') + len(results),
+                        results_failed=F('results_failed') + sum(1 for r in results if not r.passed),
+                        listings_saved=F('listings_saved') + saved,
+                    )
+        except Exception:
+            for row in rows:
+                row.pk = None  # ids from the rolled-back inserts; the retry inserts afresh
+            raise
+        del self.results[:len(results)]
+        del self.listings[:len(listings)]
+        del self.step_timings[:len(step_timings)]
+        return saved
+
+    async def aflush(self) -> int:
+        return await sync_to_async(self.flush)()
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *args):
+        try:
+            self.flush()
+        finally:
+            _current.reset(self._token)
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *args):
+        try:
+            await self.aflush()
+        finally:
+            _current.reset(self._token)
+
+
+def flush_current() -> int:
+    """Write the active run's buffer now (e.g. after each results page), if there is one.
+    Returns how many listings that saved."""
+    buffer = current_buffer()
+    if buffer is not None:
+        return buffer.flush()
+    return 0
+
+
+async def aflush_current() -> int:
+    buffer = current_buffer()
+    if buffer is not None:
+        return await buffer.aflush()
+    return 0
+
+
+def start_run(**fields) -> Run:
+    """Create the Run a flow's rows will point at (status 'running' until finish_run)."""
+    return Run.objects.create(**fields)
+
+
+def finish_run(run: Run, status: str, **fields):
+    """Close the run: status, end time, duration and any `fields`. The counts the
+    buffer maintains are left alone."""
+    run.status = status
+    run.finished_at = timezone.now()
+    run.duration_ms = round((run.finished_at - run.started_at).total_seconds() * 1000)
+    for name, value in fields.items():
+        setattr(run, name, value)
+    run.save(update_fields=['status', 'finished_at', 'duration_ms', *fields])
+
+
+def upsert_listings(listings) -> int:
+    """Insert new listings and update known ones in place, keyed on listing_id.
+
+    A PriceObservation is appended only for new listings and changed prices, so
+    repeat sightings cost an update rather than a row. Listings without an id
+    are plain inserts. Listings with a run also get that run's Sighting (one per
+    run: a later batch of the same run updates it). Call inside a transaction.
+    Returns how many listings were written: repeats of a listing_id within the
+    batch count once.
+    """
+    if not listings:
+        return 0
+    now = timezone.now()
+    keyed, plain = {}, []
+    for listing in listings:
+        listing.last_seen_at = now
+        if listing.listing_id:
+            keyed[listing.listing_id] = listing  # last sighting in the batch wins
+        else:
+            plain.append(listing)
+    Listing.objects.bulk_create(plain)
+    if not keyed:
+        _record_sightings(plain, now)
+        return len(plain)
+
+    known = Listing.objects.filter(listing_id__in=keyed)
+    previous = dict(known.values_list('listing_id', 'price'))
+    Listing.objects.bulk_create(list(keyed.values()), update_conflicts=True,
+                                unique_fields=['listing_id'], update_fields=UPSERT_FIELDS)
+    pks = dict(known.values_list('listing_id', 'pk'))
+    for key, listing in keyed.items():
+        listing.pk = pks[key]  # not every backend returns the id of an updated row
+    _record_sightings([*plain, *keyed.values()], now)
+    PriceObservation.objects.bulk_create(
+        PriceObservation(listing_id=pks[key], price=listing.price, observed_at=now)
+        for key, listing in keyed.items()
+        if listing.price and listing.price != previous.get(key)
+    )
+    return len(plain) + len(keyed)
+
+
+def _record_sightings(listings, now):
+    """Upsert the Sighting of each written listing that belongs to a run."""
+    Sighting.objects.bulk_create(
+        [Sighting(listing_id=listing.pk, run_id=listing.run_id, price=listing.price, seen_at=now)
+         for listing in listings if listing.run_id],
+        update_conflicts=True, unique_fields=['run', 'listing'], update_fields=['price', 'seen_at'],
+    )
+
+
+def save_listings(listings) -> int:
+    """Buffer the listings if a run is active, otherwise upsert them in one transaction.
+
+    Returns how many were written now: 0 when they were only buffered (the buffer's
+    flush writes them, or fails to).
+    """
+    buffer = current_buffer()
+    if buffer is not None:
+        buffer.add_listings(listings)
+        return 0
+    with transaction.atomic():
+        return upsert_listings(listings)
+
+
+async def asave_listings(listings) -> int:
+    buffer = current_buffer()
+    if buffer is not None:
+        buffer.add_listings(listings)
+        return 0
+    return await sync_to_async(save_listings)(listings)
+
+
+def save_step_timing(timing: StepTiming):
+    """Buffer the step's timing if a run is active, otherwise save it now."""
+    buffer = current_buffer()
+    if buffer is not None:
+        buffer.add_step_timing(timing)
+    else:
+        timing.save()
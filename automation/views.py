@@ -1,3 +1,126 @@
-from django.shortcuts import render
+"""Read-only JSON / NDJSON API over listings, test results and runs.
 
-# Create your views here.
+Every endpoint pages with a keyset cursor on (created_at, id) -- (started_at, id)
+for runs: a page is {"results": [...], "next": url-or-null}. With ?format=ndjson
+(or Accept: application/x-ndjson) the whole filtered set is streamed instead, one
+object per line, read from the database in chunks so memory stays flat.
+"""
+import hmac
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from automation.models import Listing, Run, TestResult
+from automation.utils.serialize import (
+    SHAPES, InvalidCursor, encode_cursor, json_line, keyset, parse_timestamp,
+)
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK = 2000
+
+NDJSON = 'application/x-ndjson'
+
+# query parameter -> lookup, per endpoint
+# listings of a run are the ones it saw, not only those it was the last to see
+LISTING_FILTERS = {'location': 'location', 'run': 'sightings__run_id', 'listing_id': 'listing_id',
+                   'currency': 'price_currency'}
+RESULT_FILTERS = {'run': 'run_id', 'test_case': 'testCase', 'passed': 'passed'}
+RUN_FILTERS = {'city': 'city', 'status': 'status'}
+INTEGER_LOOKUPS = ('run_id', 'sightings__run_id')
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def api_view(view):
+    """GET only, bearer-token check when AUTOMATION_API_TOKEN is set, 400 on bad parameters."""
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = getattr(settings, 'AUTOMATION_API_TOKEN', None)
+        if token:
+            given = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+            if not hmac.compare_digest(given.encode(), token.encode()):
+                return JsonResponse({'error': 'Missing or invalid bearer token'}, status=401)
+        try:
+            return view(request, *args, **kwargs)
+        except (BadRequest, InvalidCursor) as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    return wrapper
+
+
+def _timestamp(value, name):
+    when = parse_timestamp(value)
+    if when is None:
+        raise BadRequest(f"{name} must be an ISO date or datetime, got {value!r}")
+    return when
+
+
+def _filtered(request, queryset, filters):
+    """Apply the endpoint's equality filters plus since/until on its time column."""
+    _, order_field = SHAPES[queryset.model]
+    for param, lookup in filters.items():
+        value = request.GET.get(param)
+        if value is None:
+            continue
+        if lookup == 'passed':
+            if value.lower() not in ('true', 'false', '1', '0'):
+                raise BadRequest(f"passed must be true or false, got {value!r}")
+            value = value.lower() in ('true', '1')
+        elif lookup in INTEGER_LOOKUPS:
+            try:
+                value = int(value)
+            except ValueError:
+                raise BadRequest(f"{param} must be a number, got {value!r}")
+        queryset = queryset.filter(**{lookup: value})
+    if request.GET.get('since'):
+        queryset = queryset.filter(**{f'{order_field}__gte': _timestamp(request.GET['since'], 'since')})
+    if request.GET.get('until'):
+        queryset = queryset.filter(**{f'{order_field}__lt': _timestamp(request.GET['until'], 'until')})
+    return queryset
+
+
+def _wants_ndjson(request):
+    return request.GET.get('format') == 'ndjson' or NDJSON in request.headers.get('Accept', '')
+
+
+def _respond(request, queryset, filters):
+    fields, order_field = SHAPES[queryset.model]
+    queryset = keyset(_filtered(request, queryset, filters), order_field, request.GET.get('cursor'))
+    rows = queryset.values(*fields)
+
+    if _wants_ndjson(request):
+        lines = (json_line(row) for row in rows.iterator(chunk_size=STREAM_CHUNK))
+        return StreamingHttpResponse(lines, content_type=NDJSON)
+
+    try:
+        limit = min(MAX_PAGE_SIZE, max(1, int(request.GET.get('limit', PAGE_SIZE))))
+    except ValueError:
+        raise BadRequest("limit must be a number")
+    page = list(rows[:limit + 1])  # one extra row tells whether there is a next page
+    next_url = None
+    if len(page) > limit:
+        page = page[:limit]
+        params = request.GET.copy()
+        params['cursor'] = encode_cursor(page[-1], order_field)
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+    return JsonResponse({'results': page, 'next': next_url})
+
+
+@api_view
+def listings(request):
+    return _respond(request, Listing.objects.all(), LISTING_FILTERS)
+
+
+@api_view
+def results(request):
+    return _respond(request, TestResult.objects.all(), RESULT_FILTERS)
+
+
+@api_view
+def runs(request):
+    return _respond(request, Run.objects.all(), RUN_FILTERS)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -77,6 +78,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Parallel automation workers write concurrently; wait for the lock
+        # instead of failing with "database is locked".
+        'OPTIONS': {'timeout': 30},
     }
 }
 
@@ -84,6 +88,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 SCREENSHOTS_DIR = BASE_DIR / 'automation' / 'screenshots'
 
+# Bearer token required by the read-only /api/ endpoints; unset leaves them open (local use)
+AUTOMATION_API_TOKEN = os.environ.get('AUTOMATION_API_TOKEN')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators